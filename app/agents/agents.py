@@ -1,25 +1,112 @@
 # agents/agents.py
 
 from app.agents.agents_factory import create_agent
+from app.agents.pool import create_agent_pool
+from app.core.config import settings
+from app.models.schemas import (
+    FlightRecommendation,
+    HotelRecommendation,
+    ItineraryRecommendation,
+    RecommendationText,
+)
+from app.models.itineray_schemas import DayPlanChunk, DestinationBrief
 from app.utils.helpers import load_serpapi_tools
 
 # Flight Agent
-flight_agent = create_agent(
-    role="Handle flight search and recommendation based on received data.",
-    tools=[load_serpapi_tools().search_flights],
+flight_agent_pool = create_agent_pool(
+    "flight",
+    lambda: create_agent(
+        role="Handle flight search and recommendation based on received data.",
+        tools=[load_serpapi_tools().search_flights],
+        response_model=FlightRecommendation,
+    ),
+    size=settings.FLIGHT_AGENT_POOL_SIZE,
 )
 
 # Hotel Agent
-hotel_agent = create_agent(
-    role="Handle hotel search and recommendation based on received data.",
-    tools=[
-        load_serpapi_tools().search_google,
-        load_serpapi_tools().search_hotels,
-    ],
+hotel_agent_pool = create_agent_pool(
+    "hotel",
+    lambda: create_agent(
+        role="Handle hotel search and recommendation based on received data.",
+        tools=[
+            load_serpapi_tools().search_google,
+            load_serpapi_tools().search_hotels,
+        ],
+        response_model=HotelRecommendation,
+    ),
+    size=settings.HOTEL_AGENT_POOL_SIZE,
+)
+
+# Ranking agents for pre-fetched search results (no tools, no tool round trip)
+flight_ranking_agent_pool = create_agent_pool(
+    "flight_ranking",
+    lambda: create_agent(
+        role="Recommend the best flight from pre-fetched flight search results.",
+        tools=[],
+        response_model=FlightRecommendation,
+    ),
+    size=settings.FLIGHT_AGENT_POOL_SIZE,
+)
+
+hotel_ranking_agent_pool = create_agent_pool(
+    "hotel_ranking",
+    lambda: create_agent(
+        role="Recommend the best hotel from pre-fetched hotel search results.",
+        tools=[],
+        response_model=HotelRecommendation,
+    ),
+    size=settings.HOTEL_AGENT_POOL_SIZE,
+)
+
+# Summary agents writing only the recommendation text for an already selected option
+flight_summary_agent_pool = create_agent_pool(
+    "flight_summary",
+    lambda: create_agent(
+        role="Explain why an already selected flight is recommended.",
+        tools=[],
+        response_model=RecommendationText,
+    ),
+    size=settings.FLIGHT_AGENT_POOL_SIZE,
+)
+
+hotel_summary_agent_pool = create_agent_pool(
+    "hotel_summary",
+    lambda: create_agent(
+        role="Explain why an already selected hotel is recommended.",
+        tools=[],
+        response_model=RecommendationText,
+    ),
+    size=settings.HOTEL_AGENT_POOL_SIZE,
 )
 
 # Itinerary Agent
-itinerary_agent = create_agent(
-    role="Plan detailed daily itineraries with activities, restaurants, and logistics for travel destinations.",
-    tools=[load_serpapi_tools().search_google],
+itinerary_agent_pool = create_agent_pool(
+    "itinerary",
+    lambda: create_agent(
+        role="Plan detailed daily itineraries with activities, restaurants, and logistics for travel destinations.",
+        tools=[load_serpapi_tools().search_google],
+        response_model=ItineraryRecommendation,
+    ),
+    size=settings.ITINERARY_AGENT_POOL_SIZE,
+)
+
+# Chunked itinerary agents: a destination brief (with tools), then tool-free day chunks
+itinerary_brief_agent_pool = create_agent_pool(
+    "itinerary_brief",
+    lambda: create_agent(
+        role="Resolve travel destinations and summarize their attractions and local transport.",
+        tools=[load_serpapi_tools().search_google],
+        response_model=DestinationBrief,
+    ),
+    size=settings.ITINERARY_CHUNK_AGENT_POOL_SIZE,
+)
+
+itinerary_chunk_agent_pool = create_agent_pool(
+    "itinerary_chunk",
+    lambda: create_agent(
+        role="Plan daily itineraries for a range of days from a destination brief.",
+        tools=[],
+        response_model=DayPlanChunk,
+    ),
+    size=settings.ITINERARY_CHUNK_AGENT_POOL_SIZE,
 )
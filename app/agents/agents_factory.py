@@ -1,9 +1,43 @@
 # agents/agent_factory.py
 
-from agno.agent import Agent
-from app.utils.helpers import load_llm, load_serpapi_tools
+from typing import Optional, Type
+from pydantic import BaseModel
+from app.core.config import settings
+from app.utils.helpers import load_llm
+
+
+def structured_output_enabled(has_tools: bool) -> bool:
+    """
+    Whether agents run with a schema-constrained (native structured output) response.
+
+    Controlled by `AGENT_STRUCTURED_OUTPUT`: "off", "tool_free" (only agents without tools,
+    since Gemini cannot always combine function calling with a response schema) or "all".
+
+    Args:
+        has_tools (bool): Whether the agent is given tools.
+
+    Returns:
+        bool: True when the agent should use a response schema.
+    """
+    mode = settings.AGENT_STRUCTURED_OUTPUT
+    return mode == "all" or (mode == "tool_free" and not has_tools)
+
+
+def create_agent(role: str, tools: list, response_model: Optional[Type[BaseModel]] = None):
+    from agno.agent import Agent
+
+    if response_model is not None and structured_output_enabled(bool(tools)):
+        # The model returns schema-valid JSON, parsed by agno into `response_model`
+        return Agent(
+            model=load_llm(),
+            tools=tools,
+            role=role,
+            show_tool_calls=True,
+            markdown=False,
+            response_model=response_model,
+            structured_outputs=True,
+        )
 
-def create_agent(role: str, tools: list):
     return Agent(
         model=load_llm(),
         tools=tools,
@@ -0,0 +1,136 @@
+# agents/batch_planner.py
+
+import asyncio
+import json
+from typing import Dict, List, Tuple
+from app.agents.coordinator import TreklyTravelPlanner
+from app.agents.planner import execute_agent
+from app.core.exceptions import (
+    BaseAppException,
+    FlightAgentError,
+    HotelAgentError,
+    ItineraryPlannerAgentError,
+)
+from app.models.schemas import (
+    BatchTripPlanItem,
+    BatchTripPlanResponse,
+    TripPlanRecommendation,
+    TripPlanRequest,
+)
+from app.services.flight_search_service import get_flight_options
+from app.services.hotel_search_service import get_hotel_options
+from app.services.itinerary_generation_service import generate_itinerary
+from app.utils.logging import logging
+
+# Stage name -> (response field, agent function, request field, exception class)
+BATCH_STAGES = {
+    "Flight": ("flight", get_flight_options, "flights", FlightAgentError),
+    "Hotel": ("hotel", get_hotel_options, "hotels", HotelAgentError),
+    "Itinerary": ("itinerary", generate_itinerary, "itineraries", ItineraryPlannerAgentError),
+}
+
+
+class BatchTripPlanner:
+    """
+    Plans a batch of trips, running every unique flight / hotel / itinerary sub-request once.
+
+    Each trip request is resolved and split into its three sub-requests. Identical
+    sub-requests across the batch share a single execution, bounded by `max_concurrency`,
+    and their results fan back out to every item that needs them.
+    """
+
+    def __init__(self, max_concurrency: int = 8):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    async def _run_stage(self, name: str, func, request, exception_class):
+        async with self._semaphore:
+            return await execute_agent(name, func, request, exception_class)
+
+    def _submit(self, name: str, func, request, exception_class) -> asyncio.Task:
+        """Return the shared task for a sub-request, creating it on first sight."""
+        key = (name, json.dumps(request.model_dump(), sort_keys=True, default=str))
+
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(
+                self._run_stage(name, func, request, exception_class)
+            )
+
+        return self._tasks[key]
+
+    async def execute(self, requests: List[TripPlanRequest]) -> BatchTripPlanResponse:
+        """
+        Plan every trip in the batch.
+
+        Args:
+            requests (List[TripPlanRequest]): Trip plan requests.
+
+        Returns:
+            BatchTripPlanResponse: Per-item results, in request order, with sub-request counters.
+        """
+        logging.info("🚀 Trekly Batch Planner Started (%d trips)", len(requests))
+
+        planner = TreklyTravelPlanner()
+        item_tasks: List[Dict[str, asyncio.Task]] = []
+        item_errors: Dict[int, str] = {}
+
+        for index, request in enumerate(requests):
+            try:
+                resolved = planner.resolve_request(request.model_copy(deep=True))
+            except BaseAppException as e:
+                item_errors[index] = str(e.detail)
+                item_tasks.append({})
+                continue
+
+            item_tasks.append({
+                name: self._submit(name, func, getattr(resolved, field), exception_class)
+                for name, (_, func, field, exception_class) in BATCH_STAGES.items()
+            })
+
+        try:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        finally:
+            for task in self._tasks.values():
+                task.cancel()
+
+        items = []
+        for index, tasks in enumerate(item_tasks):
+            if index in item_errors:
+                items.append(BatchTripPlanItem(
+                    index=index, status="failed", errors={"Request": item_errors[index]}
+                ))
+                continue
+
+            errors = {
+                name: str(getattr(task.exception(), "detail", task.exception()))
+                for name, task in tasks.items()
+                if task.exception() is not None
+            }
+            if errors:
+                items.append(BatchTripPlanItem(index=index, status="failed", errors=errors))
+                continue
+
+            result = TripPlanRecommendation(**{
+                BATCH_STAGES[name][0]: task.result() for name, task in tasks.items()
+            })
+            items.append(BatchTripPlanItem(index=index, status="success", result=result))
+
+        unique_subrequests = {name: 0 for name in BATCH_STAGES}
+        for name, _ in self._tasks:
+            unique_subrequests[name] += 1
+
+        succeeded = sum(item.status == "success" for item in items)
+        logging.info(
+            "Trekly Batch Planner Complete: %d/%d succeeded, %d unique sub-requests",
+            succeeded,
+            len(items),
+            len(self._tasks),
+        )
+
+        return BatchTripPlanResponse(
+            items=items,
+            total=len(items),
+            succeeded=succeeded,
+            failed=len(items) - succeeded,
+            unique_subrequests=unique_subrequests,
+        )
@@ -1,6 +1,6 @@
 # agents/coordinator.py
 
-from agno.workflow import Workflow
+from app.core.config import settings
 from app.models.schemas import TripPlanRequest, TripPlanRecommendation
 from app.services.flight_search_service import get_flight_options
 from app.services.hotel_search_service import get_hotel_options
@@ -12,56 +12,111 @@ from app.core.exceptions import (
     ItineraryPlannerAgentError,
     MissingParameterError,
 )
-from app.agents.planner import fill_missing_fields, execute_agent
+from app.agents.planner import fill_missing_fields, StageScheduler
 
 
-class TreklyTravelPlanner(Workflow):
+class TreklyTravelPlanner:
     """
     TreklyTravelPlanner orchestrates the entire trip planning process
     by coordinating flight, hotel, and itinerary recommendation agents.
+
+    Stages are scheduled by `StageScheduler`; none of agno's `Workflow` machinery
+    (sessions, storage, `run`) is used, so importing the planner does not load agno.
     """
 
-    async def execute(self, request: TripPlanRequest) -> TripPlanRecommendation:
+    def resolve_request(self, request: TripPlanRequest) -> TripPlanRequest:
         """
-        Full Travel Workflow.
+        Resolve the Hotel and Itinerary field fill-ins up front.
+
+        Fill-ins only read from the request objects, never from agent results, so every
+        stage can start as soon as the request has been resolved.
 
         Args:
             request (TripPlanRequest): User's input containing flight, hotel, and itinerary fields.
 
         Returns:
-            TripPlanRecommendation: Final combined recommendation output from all three agents.
+            TripPlanRequest: The same request with missing fields filled in.
         """
-        logging.info("🚀 Trekly Travel Planner Workflow Started")
-
         if not request.flights:
             raise MissingParameterError("Flight details are required.")
 
-        # Flight
-        flight_result = await execute_agent(
-            "Flight", get_flight_options, request.flights, FlightAgentError
-        )
-
-        # Hotel
         logging.info("Auto-filling Hotel fields from Flight...")
         fill_missing_fields(request.hotels, request.flights)
-        hotel_result = await execute_agent(
-            "Hotel", get_hotel_options, request.hotels, HotelAgentError
-        )
 
-        # Itinerary
         logging.info("Auto-filling Itinerary fields from Hotel or Flight...")
         fill_missing_fields(request.itineraries, request.hotels, prefer_dates_from=request.flights)
-        itinerary_result = await execute_agent(
+
+        return request
+
+    def build_scheduler(self, request: TripPlanRequest) -> StageScheduler:
+        """
+        Build the stage scheduler for a resolved request.
+
+        Args:
+            request (TripPlanRequest): Request whose fill-ins have been resolved.
+
+        Returns:
+            StageScheduler: Scheduler with the Flight, Hotel and Itinerary stages registered.
+        """
+        scheduler = StageScheduler(policy=settings.PLANNER_FAILURE_POLICY)
+        scheduler.add_stage("Flight", get_flight_options, request.flights, FlightAgentError)
+        scheduler.add_stage("Hotel", get_hotel_options, request.hotels, HotelAgentError)
+        scheduler.add_stage(
             "Itinerary",
             generate_itinerary,
             request.itineraries,
             ItineraryPlannerAgentError,
         )
+        return scheduler
+
+    async def stream(self, request: TripPlanRequest):
+        """
+        Streaming Travel Workflow.
+
+        Args:
+            request (TripPlanRequest): User's input containing flight, hotel, and itinerary fields.
+
+        Yields:
+            Tuple[str, str, Any]: `(event, stage_name, payload)` stage events (see `StageScheduler.stream`).
+        """
+        logging.info("🚀 Trekly Travel Planner Streaming Workflow Started")
+
+        self.resolve_request(request)
+
+        async for event in self.build_scheduler(request).stream():
+            yield event
+
+        logging.info("Trekly Travel Planner Streaming Workflow Complete")
+
+    async def execute(self, request: TripPlanRequest) -> TripPlanRecommendation:
+        """
+        Full Travel Workflow.
+
+        Flight, Hotel and Itinerary stages are independent once the request is resolved,
+        so they run concurrently.
+
+        Args:
+            request (TripPlanRequest): User's input containing flight, hotel, and itinerary fields.
+
+        Returns:
+            TripPlanRecommendation: Final combined recommendation output from all three agents.
+        """
+        logging.info("🚀 Trekly Travel Planner Workflow Started")
+
+        self.resolve_request(request)
+
+        scheduler = self.build_scheduler(request)
+        results, errors = await scheduler.run()
+
+        # Partial-result policy still fails when no stage succeeded
+        if errors and not results:
+            raise next(iter(errors.values()))
 
         logging.info("Trekly Travel Planner Workflow Complete")
 
         return TripPlanRecommendation(
-            flight=flight_result,
-            hotel=hotel_result,
-            itinerary=itinerary_result,
+            flight=results.get("Flight"),
+            hotel=results.get("Hotel"),
+            itinerary=results.get("Itinerary"),
+            errors={name: str(getattr(error, "detail", error)) for name, error in errors.items()} or None,
         )
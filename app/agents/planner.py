@@ -1,6 +1,15 @@
 # agents/planner.py
 
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
 from app.utils.logging import logging
+from app.utils.metrics import stage_duration
+from app.utils.tracing import span
+
+# Stage failure policies
+FAIL_FAST = "fail_fast"
+PARTIAL = "partial"
 
 
 def fill_missing_fields(target, source, prefer_dates_from=None):
@@ -16,31 +25,27 @@ def fill_missing_fields(target, source, prefer_dates_from=None):
     # Destination
     if not target.destination and hasattr(source, "destination"):
         target.destination = source.destination
-        logging.debug(f"Auto-filled `destination` from {source.__class__.__name__}")
+        logging.debug("Auto-filled `destination` from %s", source.__class__.__name__)
 
     if not target.destination and hasattr(source, "arrival_id"):
         target.destination = source.arrival_id
-        logging.debug(f"Auto-filled `destination` from {source.__class__.__name__}")
+        logging.debug("Auto-filled `destination` from %s", source.__class__.__name__)
 
     # Dates - always prefer `prefer_dates_from` if given
     date_source = prefer_dates_from or source
 
     if not target.check_in_date and hasattr(date_source, "outbound_date"):
         target.check_in_date = date_source.outbound_date
-        logging.debug(
-            f"Auto-filled `check_in_date` from {date_source.__class__.__name__}"
-        )
+        logging.debug("Auto-filled `check_in_date` from %s", date_source.__class__.__name__)
 
     if not target.check_out_date and hasattr(date_source, "return_date"):
         target.check_out_date = date_source.return_date
-        logging.debug(
-            f"Auto-filled `check_out_date` from {date_source.__class__.__name__}"
-        )
+        logging.debug("Auto-filled `check_out_date` from %s", date_source.__class__.__name__)
 
     # Currency
     if hasattr(target, "currency") and not target.currency:
         target.currency = getattr(source, "currency", "USD") or "USD"
-        logging.debug(f"Auto-filled `currency` from {source.__class__.__name__}")
+        logging.debug("Auto-filled `currency` from %s", source.__class__.__name__)
 
 
 async def execute_agent(name: str, func, request, exception_class):
@@ -56,11 +61,147 @@ async def execute_agent(name: str, func, request, exception_class):
     Returns:
         Result from agent.
     """
-    try:
-        logging.info(f"{name} Agent Starting...")
-        result = await func(request)
-        logging.info(f"{name} Agent Complete")
-        return result
-    except Exception as e:
-        logging.error(f"{name} Agent Failed: {str(e)}")
-        raise exception_class(detail=f"{name} Agent Error: {str(e)}")
+    started = time.perf_counter()
+    with span("stage", stage=name):
+        try:
+            logging.info("%s Agent Starting...", name)
+            result = await func(request)
+            logging.info("%s Agent Complete", name)
+            stage_duration.observe(time.perf_counter() - started, stage=name, outcome="success")
+            return result
+        except asyncio.CancelledError:
+            stage_duration.observe(time.perf_counter() - started, stage=name, outcome="cancelled")
+            raise
+        except Exception as e:
+            stage_duration.observe(time.perf_counter() - started, stage=name, outcome="failure")
+            logging.error("%s Agent Failed: %s", name, e)
+            raise exception_class(detail=f"{name} Agent Error: {str(e)}")
+
+
+class StageScheduler:
+    """
+    Small DAG scheduler for workflow stages.
+
+    Every stage wraps an agent function executed through `execute_agent`. Stages without
+    pending dependencies run concurrently. On failure the `fail_fast` policy cancels the
+    sibling stages and re-raises, while the `partial` policy lets the others finish and
+    reports the failure alongside the successful results.
+    """
+
+    def __init__(self, policy: str = FAIL_FAST):
+        if policy not in (FAIL_FAST, PARTIAL):
+            raise ValueError(f"Unknown stage failure policy: {policy}")
+
+        self.policy = policy
+        self._stages: Dict[str, Tuple[Any, Any, Any, Tuple[str, ...]]] = {}
+
+    def add_stage(self, name: str, func, request, exception_class, depends_on: Iterable[str] = ()):
+        """
+        Register a stage.
+
+        Args:
+            name (str): Stage / agent name.
+            func (Callable): The async agent function to call.
+            request: Request payload passed to `func`.
+            exception_class: Exception raised by `execute_agent` on error.
+            depends_on (Iterable[str]): Names of stages that must succeed before this one starts.
+        """
+        depends_on = tuple(depends_on)
+        for dependency in depends_on:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage `{name}` depends on unknown stage `{dependency}`")
+
+        self._stages[name] = (func, request, exception_class, depends_on)
+
+    async def stream(self) -> AsyncIterator[Tuple[str, str, Any]]:
+        """
+        Run all registered stages, yielding events as they happen.
+
+        Events are `(event, stage_name, payload)` tuples where `event` is one of
+        `started` (payload None), `completed` (payload is the result), `failed`
+        (payload is the error) or `cancelled` (payload None, fail-fast siblings).
+
+        Yields:
+            Tuple[str, str, Any]: Stage events in the order they occur.
+        """
+        results: Dict[str, Any] = {}
+        failed: set = set()
+        running: Dict[asyncio.Task, str] = {}
+        waiting = dict(self._stages)
+
+        def start_ready_stages() -> List[Tuple[str, str, Any]]:
+            events = []
+            for name, (func, request, exception_class, depends_on) in list(waiting.items()):
+                if any(dependency in failed for dependency in depends_on):
+                    waiting.pop(name)
+                    failed.add(name)
+                    events.append(("failed", name, exception_class(
+                        detail=f"{name} Agent Skipped: a required stage failed."
+                    )))
+                elif all(dependency in results for dependency in depends_on):
+                    waiting.pop(name)
+                    task = asyncio.create_task(
+                        execute_agent(name, func, request, exception_class)
+                    )
+                    running[task] = name
+                    events.append(("started", name, None))
+            return events
+
+        try:
+            for event in start_ready_stages():
+                yield event
+
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    name = running.pop(task)
+                    error = task.exception()
+
+                    if error is None:
+                        results[name] = task.result()
+                        yield "completed", name, results[name]
+                        continue
+
+                    failed.add(name)
+                    yield "failed", name, error
+
+                    if self.policy == FAIL_FAST:
+                        for sibling, sibling_name in list(running.items()):
+                            sibling.cancel()
+                            yield "cancelled", sibling_name, None
+                        return
+
+                for event in start_ready_stages():
+                    yield event
+
+        finally:
+            # Cancel siblings still in flight (fail-fast or consumer went away)
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def run(self) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        """
+        Run all registered stages.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Exception]]: Results and errors keyed by stage name.
+
+        Raises:
+            Exception: The first stage error under the `fail_fast` policy.
+        """
+        results: Dict[str, Any] = {}
+        errors: Dict[str, Exception] = {}
+
+        async for event, name, payload in self.stream():
+            if event == "completed":
+                results[name] = payload
+            elif event == "failed":
+                errors[name] = payload
+
+        if errors and self.policy == FAIL_FAST:
+            raise next(iter(errors.values()))
+
+        return results, errors
@@ -0,0 +1,158 @@
+# agents/pool.py
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List
+from app.utils.logging import logging
+
+# Run-scoped agent attributes cleared when an agent is returned to its pool
+RUN_STATE_ATTRIBUTES = ("run_id", "run_input", "run_response", "run_messages", "session_id")
+
+
+# Marker put on the idle queue when a discarded agent frees its slot
+_FREED_SLOT = None
+
+
+def agent_state_size(agent) -> int:
+    """
+    Estimate how much run history an agent retains (messages plus stored runs).
+
+    Handles both agno memory models: `Memory` keeps runs per session id, the legacy
+    `AgentMemory` a flat list of runs next to the message history.
+    """
+    memory = getattr(agent, "memory", None)
+    if memory is None:
+        return 0
+
+    runs = getattr(memory, "runs", None) or []
+    if isinstance(runs, dict):
+        stored_runs = sum(len(session_runs or []) for session_runs in runs.values())
+    else:
+        stored_runs = len(runs)
+    return len(getattr(memory, "messages", None) or []) + stored_runs
+
+
+def reset_agent_state(agent) -> None:
+    """
+    Clear per-run state (memory, run response, session) so the next checkout starts fresh.
+    """
+    memory = getattr(agent, "memory", None)
+    if memory is not None and hasattr(memory, "clear"):
+        memory.clear()
+
+    for attribute in RUN_STATE_ATTRIBUTES:
+        if hasattr(agent, attribute):
+            setattr(agent, attribute, None)
+
+
+class AgentPool:
+    """
+    Bounded pool of agents for one role.
+
+    Agents are created lazily through `factory` (up to `size`), checked out exclusively
+    for a run and reset before being returned, so concurrent runs never share state and
+    run history does not accumulate over the life of the process.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int):
+        self.name = name
+        self.factory = factory
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        # `_FREED_SLOT` markers currently on the idle queue
+        self._freed_slots = 0
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_state_size = 0
+        self.last_state_size = 0
+
+    def _create(self):
+        self._created += 1
+        try:
+            return self.factory()
+        except Exception:
+            self._created -= 1
+            raise
+
+    async def acquire(self):
+        """Check out an idle agent, creating one if the pool is not full, else wait."""
+        started = time.perf_counter()
+
+        while True:
+            if self._idle.empty() and self._created < self.size:
+                agent = self._create()
+                break
+
+            agent = await self._idle.get()
+            if agent is not _FREED_SLOT:
+                break
+            # A discarded agent freed its slot; create a replacement (or take an idle one)
+            self._freed_slots -= 1
+
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return agent
+
+    def release(self, agent) -> None:
+        """Reset an agent's run state and return it to the pool."""
+        self.last_state_size = agent_state_size(agent)
+        self.max_state_size = max(self.max_state_size, self.last_state_size)
+
+        try:
+            reset_agent_state(agent)
+        except Exception as e:
+            # Drop agents that cannot be reset rather than leaking state into the next run,
+            # and wake a waiter so it creates a replacement in the freed slot
+            logging.warning("[AgentPool:%s] Discarding agent after failed reset: %s", self.name, e)
+            self._created -= 1
+            self._freed_slots += 1
+            self._idle.put_nowait(_FREED_SLOT)
+            return
+
+        self._idle.put_nowait(agent)
+
+    @asynccontextmanager
+    async def checkout(self):
+        """
+        Async context manager yielding an agent for exclusive use.
+        """
+        agent = await self.acquire()
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def warm(self, count: int = 1) -> None:
+        """Pre-create up to `count` idle agents."""
+        while self._created < min(count, self.size):
+            self._created += 1
+            self._idle.put_nowait(self.factory())
+
+    def stats(self) -> Dict[str, Any]:
+        idle = self._idle.qsize() - self._freed_slots
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": idle,
+            "in_use": self._created - idle,
+            "checkouts": self.checkouts,
+            "avg_wait_seconds": round(self.total_wait / self.checkouts, 6) if self.checkouts else 0.0,
+            "max_wait_seconds": round(self.max_wait, 6),
+            "last_state_size": self.last_state_size,
+            "max_state_size": self.max_state_size,
+        }
+
+
+agent_pools: List[AgentPool] = []
+
+
+def create_agent_pool(name: str, factory: Callable[[], Any], size: int) -> AgentPool:
+    """Create an `AgentPool` and register it for statistics."""
+    pool = AgentPool(name, factory, size)
+    agent_pools.append(pool)
+    return pool
@@ -1,19 +1,69 @@
 # v1/endpoints.py
 
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import TripPlanRequest, TripPlanRecommendation
-from app.core.exceptions import BaseAppException
+from typing import Dict, Literal, Optional
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from app.models.schemas import (
+    TripPlanRequest,
+    TripPlanRecommendation,
+    FlightRecommendation,
+    HotelRecommendation,
+    ItineraryRecommendation,
+    PlanTripEvent,
+    BatchTripPlanRequest,
+    BatchTripPlanResponse,
+    JobSubmitResponse,
+    JobStatusResponse,
+)
+from app.core.config import settings
+from app.core.exceptions import BaseAppException, SerpApiKeyError
 from app.agents.coordinator import TreklyTravelPlanner
+from app.agents.batch_planner import BatchTripPlanner
+from app.agents.pool import agent_pools
+from app.services.job_service import get_job_pool
+from app.utils.helpers import load_serpapi_tools
+from app.utils.projection import projection_stats
+from app.utils.retry import get_retry_budget
+from app.utils.singleflight import single_flight_groups
+from app.utils.tracing import get_trace_exporter
+from app.utils.trip_cache import get_trip_cache, trip_cache_key
 
 
 router = APIRouter()
 
+# Stage name -> (event / response field name, response model)
+STAGE_MODELS = {
+    "Flight": ("flight", FlightRecommendation),
+    "Hotel": ("hotel", HotelRecommendation),
+    "Itinerary": ("itinerary", ItineraryRecommendation),
+}
+
+
+def json_response(payload: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Return an already serialized (and validated) JSON payload as-is."""
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def format_event(event: PlanTripEvent, stream_format: str) -> str:
+    """Serialize a stream event as an NDJSON line or a Server-Sent Event."""
+    payload = event.model_dump_json(exclude_none=True)
+    if stream_format == "sse":
+        return f"event: {event.event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
 # Travel Planner Search and Recommendation Endpoint
 @router.post("/plan-trip", response_model=TripPlanRecommendation)
 async def plan_trip(requests: TripPlanRequest):
     """
     Endpoint to generate a full travel plan including flight, hotel, and itinerary.
 
+    Identical requests (after auto-filling missing fields) are served from the trip cache;
+    the `X-Cache` and `Age` headers report the cache status and entry age. `bypass_cache` (top
+    level or on `itineraries`) skips the cache read and refreshes the entry. Stage results are
+    already validated models, so the response is serialized directly instead of being
+    re-validated against `response_model` (which is kept for the OpenAPI schema).
+
     Args:
         requests (TripPlanRequest): User input including departure_id, arrival_id, destination, check-in, check-out dates and the likes.
 
@@ -23,8 +73,240 @@ async def plan_trip(requests: TripPlanRequest):
 
     try:
         planner = TreklyTravelPlanner()
+        planner.resolve_request(requests)
+
+        cache = get_trip_cache()
+        if cache is None:
+            result = await planner.execute(requests)
+            return json_response(result.model_dump_json())
+
+        key = trip_cache_key(requests)
+        cached = None if requests.bypass_trip_cache else await cache.aget(key)
+        if cached is not None:
+            payload, age = cached
+            return json_response(payload, headers={"X-Cache": "HIT", "Age": str(int(age))})
+
         result = await planner.execute(requests)
-        return result
+        payload = result.model_dump_json()
+
+        # Partial results are never cached
+        if not result.errors:
+            await cache.aset(key, payload)
+
+        return json_response(payload, headers={"X-Cache": "MISS", "Age": "0"})
 
     except BaseAppException as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# Streaming Travel Planner Endpoint
+@router.post("/plan-trip/stream")
+async def plan_trip_stream(
+    requests: TripPlanRequest,
+    stream_format: Literal["ndjson", "sse"] = Query("ndjson", alias="format"),
+):
+    """
+    Streaming variant of `/plan-trip` that emits each section as soon as its stage validates.
+
+    Emits `progress` events when stages start or are cancelled, one `flight`, `hotel` and
+    `itinerary` event carrying the corresponding recommendation model, `error` events for
+    failed stages and a final `done` event.
+
+    Args:
+        requests (TripPlanRequest): User input including departure_id, arrival_id, destination, check-in, check-out dates and the likes.
+        stream_format (str): "ndjson" (default) or "sse" (Server-Sent Events).
+
+    Returns:
+        StreamingResponse: The event stream.
+    """
+
+    try:
+        planner = TreklyTravelPlanner()
+        planner.resolve_request(requests)
+    except BaseAppException as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    cache = get_trip_cache()
+    key = trip_cache_key(requests) if cache is not None else None
+
+    async def events():
+        if cache is not None and not requests.bypass_trip_cache:
+            cached = await cache.aget(key)
+            if cached is not None:
+                trip = TripPlanRecommendation.model_validate_json(cached[0])
+                for stage, (name, _) in STAGE_MODELS.items():
+                    yield PlanTripEvent(event=name, stage=stage, status="cached", data=getattr(trip, name))
+                yield PlanTripEvent(event="done", status="complete")
+                return
+
+        results = {}
+        async for event, stage, payload in planner.stream(requests):
+            if event == "completed":
+                name, _ = STAGE_MODELS[stage]
+                results[name] = payload
+                yield PlanTripEvent(event=name, stage=stage, status="completed", data=results[name])
+
+            elif event == "failed":
+                yield PlanTripEvent(
+                    event="error", stage=stage, error=str(getattr(payload, "detail", payload))
+                )
+
+            else:
+                yield PlanTripEvent(event="progress", stage=stage, status=event)
+
+        complete = len(results) == len(STAGE_MODELS)
+        if complete and cache is not None:
+            await cache.aset(key, TripPlanRecommendation(**results).model_dump_json())
+
+        yield PlanTripEvent(event="done", status="complete" if complete else "partial")
+
+    return StreamingResponse(
+        (format_event(event, stream_format) async for event in events()),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Batch Travel Planner Endpoint
+@router.post("/plan-trips", response_model=BatchTripPlanResponse)
+async def plan_trips(requests: BatchTripPlanRequest):
+    """
+    Endpoint to plan a batch of trips, deduplicating identical flight, hotel and itinerary
+    sub-requests across the batch.
+
+    Args:
+        requests (BatchTripPlanRequest): The trip plan requests.
+
+    Returns:
+        BatchTripPlanResponse: Per-item success or failure, in request order.
+    """
+    if len(requests.requests) > settings.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size exceeds the limit of {settings.BATCH_MAX_SIZE} requests.",
+        )
+
+    planner = BatchTripPlanner(max_concurrency=settings.BATCH_MAX_CONCURRENCY)
+    result = await planner.execute(requests.requests)
+    return json_response(result.model_dump_json())
+
+
+# Asynchronous Travel Planner Job Endpoints
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_trip_job(requests: TripPlanRequest):
+    """
+    Endpoint to submit a trip plan as a background job.
+
+    Args:
+        requests (TripPlanRequest): User input including departure_id, arrival_id, destination, check-in, check-out dates and the likes.
+
+    Returns:
+        JobSubmitResponse: The job id to poll with `GET /jobs/{job_id}`.
+    """
+    pool = get_job_pool()
+    if pool is None or not pool.running:
+        raise HTTPException(status_code=503, detail="Job mode is not enabled.")
+
+    try:
+        job_id = await pool.submit(requests)
+    except BaseAppException as e:
+        raise HTTPException(status_code=503, detail=str(e.detail))
+
+    return JobSubmitResponse(job_id=job_id, status="queued")
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_trip_job(job_id: str):
+    """
+    Endpoint to poll the status and result of a trip plan job.
+
+    Args:
+        job_id (str): Id returned by `POST /jobs`.
+
+    Returns:
+        JobStatusResponse: Job status, with the trip plan once it has succeeded.
+    """
+    pool = get_job_pool()
+    job = await asyncio.to_thread(pool.store.get, job_id) if pool is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    return JobStatusResponse(
+        job_id=job["id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        attempts=job["attempts"],
+        result=TripPlanRecommendation.model_validate_json(job["result"]) if job["result"] else None,
+        error=job["error"],
+    )
+
+
+# Cache Statistics Endpoint
+@router.get("/cache/stats")
+async def cache_stats():
+    """
+    Endpoint exposing cache, payload projection, call coalescing, agent pool and retry budget counters for tuning.
+
+    Returns:
+        dict: Trip cache, SerpAPI response cache, projection, single-flight, agent pool and retry budget statistics.
+    """
+    trip_cache = get_trip_cache()
+    try:
+        serpapi_cache = load_serpapi_tools().cache
+    except SerpApiKeyError:
+        # Without a SerpAPI key there is no toolkit, hence no response cache
+        serpapi_cache = None
+
+    return {
+        "trip_cache": trip_cache.stats() if trip_cache is not None else None,
+        "serpapi_cache": serpapi_cache.stats() if serpapi_cache is not None else None,
+        "projection": projection_stats.stats(),
+        "single_flight": {group.name: group.stats() for group in single_flight_groups},
+        "agent_pools": {pool.name: pool.stats() for pool in agent_pools},
+        "retry_budget": get_retry_budget().stats(),
+    }
+
+
+# Trace Debug Endpoints
+@router.get("/debug/traces")
+async def list_traces(limit: int = Query(20, ge=1, le=200)):
+    """
+    Endpoint listing the most recently finished request traces.
+
+    Args:
+        limit (int): Maximum number of traces to return.
+
+    Returns:
+        dict: Trace summaries (id, name, duration, status and span count), newest first.
+    """
+    exporter = get_trace_exporter()
+    if not settings.TRACING_ENABLED or exporter is None:
+        raise HTTPException(status_code=404, detail="Tracing is disabled.")
+
+    return {"traces": exporter.recent(limit)}
+
+
+@router.get("/debug/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    Endpoint returning the spans of a finished request trace.
+
+    The trace id is returned in the `X-Trace-Id` header of every traced (`POST /v1`) response;
+    job runs are traced under their job id.
+
+    Args:
+        trace_id (str): Trace identifier.
+
+    Returns:
+        dict: The trace with its spans, ordered by start time.
+    """
+    exporter = get_trace_exporter()
+    if not settings.TRACING_ENABLED or exporter is None:
+        raise HTTPException(status_code=404, detail="Tracing is disabled.")
+
+    trace = exporter.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found.")
+
+    return trace
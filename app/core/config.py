@@ -1,15 +1,175 @@
 # core/config.py
 
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     """Application configuration settings."""
     PROJECT_NAME: str = "Trekly"
     API_VERSION: str = "/api/v1"
-    GEMINI_API_KEY: str
-    SERPAPI_API_KEY: str
+    # Optional so a missing key surfaces as a readiness / request error instead of a boot crash
+    GEMINI_API_KEY: Optional[str] = None
+    SERPAPI_API_KEY: Optional[str] = None
     MODEL_ID : str ="gemini-2.0-flash-lite"
 
+    # Agent execution
+    # "auto" uses the agent's native async run when available, "executor" always
+    # runs the synchronous agent in the bounded thread pool below.
+    AGENT_RUN_MODE: str = "auto"
+    AGENT_EXECUTOR_MAX_WORKERS: int = 16
+    # Native structured output (response schema from the pydantic models):
+    # "off", "tool_free" (agents without tools only) or "all"
+    AGENT_STRUCTURED_OUTPUT: str = "tool_free"
+    FLIGHT_AGENT_CONCURRENCY: int = 8
+    HOTEL_AGENT_CONCURRENCY: int = 8
+    ITINERARY_AGENT_CONCURRENCY: int = 4
+    # Brief and day-chunk calls of the "chunked" itinerary mode have their own limit
+    ITINERARY_CHUNK_AGENT_CONCURRENCY: int = 4
+
+    # Agent retries: exponential backoff with jitter, a cheap "reformat" recovery for
+    # malformed / incomplete answers, and a process-wide retry budget (token bucket)
+    RETRY_MAX_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 0.5
+    RETRY_MAX_DELAY: float = 8.0
+    RETRY_JITTER: bool = True
+    RETRY_REFORMAT_ENABLED: bool = True
+    RETRY_BUDGET_RATIO: float = 0.2
+    RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+    RETRY_BUDGET_MAX_BALANCE: float = 100.0
+
+    # Metrics (Prometheus text format on /metrics); instrumentation is a no-op when disabled
+    METRICS_ENABLED: bool = True
+
+    # Logging
+    # Records go through a bounded queue to a background thread (dropped when full); "text"
+    # or "json" lines. Large payloads (raw agent responses) are cut to LOG_PAYLOAD_MAX_CHARS
+    # (0 keeps them whole) and verbose per-attempt logs are kept for a sample of requests.
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    LOG_QUEUE_ENABLED: bool = True
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    LOG_PAYLOAD_MAX_CHARS: int = 2000
+    LOG_VERBOSE_SAMPLE_RATE: float = 1.0
+
+    # Request tracing: one trace per /v1 request with nested spans (stages, agent attempts,
+    # tool calls, parsing). Finished traces are kept in an in-memory ring buffer ("memory"),
+    # additionally appended as JSON lines to TRACE_FILE_PATH ("file"), or dropped ("none").
+    TRACING_ENABLED: bool = True
+    TRACE_EXPORT: str = "memory"
+    TRACE_BUFFER_SIZE: int = 200
+    TRACE_FILE_PATH: str = "trekly_traces.jsonl"
+
+    # Agent pools (agents per role, created lazily)
+    FLIGHT_AGENT_POOL_SIZE: int = 8
+    HOTEL_AGENT_POOL_SIZE: int = 8
+    ITINERARY_AGENT_POOL_SIZE: int = 4
+    ITINERARY_CHUNK_AGENT_POOL_SIZE: int = 4
+
+    # Startup
+    # Warm up clients, agent pools and upstream connections in the FastAPI lifespan
+    WARMUP_ON_STARTUP: bool = True
+    WARMUP_AGENTS_PER_POOL: int = 1
+    WARMUP_UPSTREAM_CONNECTIONS: bool = True
+
+    # Workflow
+    # "fail_fast" cancels sibling stages on the first failure, "partial" keeps them
+    # running and returns whatever stages succeeded.
+    PLANNER_FAILURE_POLICY: str = "fail_fast"
+
+    # Coalesce concurrent identical service calls into one execution
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Batch planning
+    BATCH_MAX_SIZE: int = 500
+    BATCH_MAX_CONCURRENCY: int = 8
+
+    # Asynchronous job mode
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX_SIZE: int = 1000
+    # Seconds between sweeps re-queuing jobs left in the store (e.g. beyond the queue size)
+    JOB_RECOVERY_INTERVAL: float = 30.0
+    # Running jobs are leased to one process and renewed while they run; a job whose
+    # lease expired (crashed worker) or that failed upstream (rate limit, 5xx, timeout) is
+    # re-run, up to JOB_MAX_ATTEMPTS times in total
+    JOB_LEASE_SECONDS: float = 120.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_STORE_SQLITE_PATH: str = "trekly_jobs.sqlite3"
+
+    # Whole-trip response cache ("memory", "sqlite" or "none"); TTL in seconds
+    TRIP_CACHE_BACKEND: str = "memory"
+    TRIP_CACHE_TTL: int = 900
+    TRIP_CACHE_MAX_ENTRIES: int = 512
+    TRIP_CACHE_SQLITE_PATH: str = "trekly_cache.sqlite3"
+
+    # Itinerary cache keyed on resolved city, number of days and season bucket
+    # ("none", "month" or "season"); TTL (staleness) in seconds
+    ITINERARY_CACHE_ENABLED: bool = True
+    ITINERARY_CACHE_TTL: int = 604800
+    ITINERARY_CACHE_MAX_ENTRIES: int = 1024
+    ITINERARY_CACHE_SEASON_BUCKET: str = "month"
+
+    # Itinerary generation: "single" (one agent response) or "chunked" (shared destination
+    # brief, then day ranges generated concurrently; only failed days are regenerated).
+    # "chunked" lowers the latency of long trips and the cost of a bad day, but one trip
+    # makes 1 + ceil(days / ITINERARY_CHUNK_DAYS) model calls instead of one, which cuts
+    # throughput under load; it is opt-in and runs under its own concurrency limit and pools
+    ITINERARY_GENERATION_MODE: str = "single"
+    ITINERARY_CHUNK_MIN_DAYS: int = 5
+    ITINERARY_CHUNK_DAYS: int = 3
+    ITINERARY_CHUNK_MAX_REGENERATIONS: int = 2
+
+    # Service modes
+    # "agent" lets the agent call the SerpAPI tool itself, "prefetched" calls SerpAPI
+    # directly and only asks the LLM to rank the results, "fast" ranks in code.
+    FLIGHT_SERVICE_MODE: str = "agent"
+    HOTEL_SERVICE_MODE: str = "agent"
+
+    # Deterministic flight ranking weights used by the "fast" mode
+    FLIGHT_SCORE_WEIGHTS: Dict[str, float] = {
+        "comfort": 0.2,
+        "layovers": 0.25,
+        "duration": 0.2,
+        "timing": 0.15,
+        "price": 0.2,
+    }
+
+    # Vectorized hotel ranking used by the "fast" mode and the "prefetched" shortlist
+    HOTEL_SCORE_WEIGHTS: Dict[str, float] = {
+        "rating": 0.5,
+        "amenities": 0.3,
+        "price": 0.2,
+    }
+    HOTEL_DESIRED_AMENITIES: List[str] = ["wifi", "breakfast", "restaurant"]
+    # Number of pre-ranked hotels passed to the LLM in "prefetched" mode (0 disables)
+    HOTEL_SHORTLIST_SIZE: int = 5
+
+    # SerpAPI response cache (TTLs in seconds)
+    SERPAPI_CACHE_ENABLED: bool = True
+    SERPAPI_CACHE_MAX_ENTRIES: int = 1024
+    SERPAPI_CACHE_TTL_FLIGHTS: int = 300
+    SERPAPI_CACHE_TTL_HOTELS: int = 1800
+    SERPAPI_CACHE_TTL_GOOGLE: int = 86400
+
+    # SerpAPI payload projection
+    # Prune flight / hotel payloads to the fields the prompts use and keep the top-K
+    # options after a pre-filter ("best", "price", "duration" / "best", "rating", "price").
+    SERPAPI_PROJECTION_ENABLED: bool = True
+    FLIGHT_RESULTS_TOP_K: int = 8
+    FLIGHT_RESULTS_PREFILTER: str = "best"
+    HOTEL_RESULTS_TOP_K: int = 10
+    HOTEL_RESULTS_PREFILTER: str = "rating"
+
+    # SerpAPI transport
+    # "client" uses the `serpapi` package, "http" the pooled httpx transport.
+    SERPAPI_TRANSPORT: str = "client"
+    SERPAPI_BASE_URL: str = "https://serpapi.com"
+    SERPAPI_CONNECT_TIMEOUT: float = 5.0
+    SERPAPI_READ_TIMEOUT: float = 30.0
+    SERPAPI_MAX_CONNECTIONS: int = 50
+    SERPAPI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    SERPAPI_KEEPALIVE_EXPIRY: float = 60.0
+
     class Config:
         """Configuration for Pydantic settings."""
         env_file = ".env"
@@ -38,10 +38,25 @@ class MissingParameterError(BaseAppException):
     def __init__(self, detail: str = "Required parameter is missing"):
         super().__init__(detail=detail, status_code=status.HTTP_400_BAD_REQUEST)
 
+class ResponseValidationError(MissingParameterError):
+    def __init__(self, detail: str = "Agent response failed validation", field_errors: list = None):
+        self.field_errors = field_errors or []
+        if self.field_errors:
+            detail = f"{detail}: {'; '.join(self.field_errors)}"
+        super().__init__(detail=detail)
+
 class EmptyResponseError(BaseAppException):
     def __init__(self, detail: str = "Missing response from agent"):
         super().__init__(detail=detail, status_code=status.HTTP_400_BAD_REQUEST)
 
+class ToolNotCalledError(BaseAppException):
+    def __init__(self, detail: str = "SerpApi tool was not used. Agent must call the tool."):
+        super().__init__(detail=detail, status_code=status.HTTP_502_BAD_GATEWAY)
+
+class MalformedResponseError(BaseAppException):
+    def __init__(self, detail: str = "Agent response is not valid JSON"):
+        super().__init__(detail=detail, status_code=status.HTTP_502_BAD_GATEWAY)
+
 # Agent-Specific Errors
 class FlightAgentError(BaseAppException):
     def __init__(self, detail: str = "Flight agent couldn't retrieve the data"):
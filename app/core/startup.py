@@ -0,0 +1,45 @@
+# core/startup.py
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StartupReport:
+    """
+    Records import and warm-up timings and whether the application is ready for traffic.
+    """
+
+    def __init__(self):
+        self.import_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: List[str] = []
+        self.ready = False
+        self._started = time.perf_counter()
+
+    def record_import(self, started: float) -> None:
+        """Record the import time measured from `started` (a `time.perf_counter()` value)."""
+        self.import_seconds = round(time.perf_counter() - started, 4)
+
+    def record_step(self, name: str, started: float) -> None:
+        self.steps[name] = round(time.perf_counter() - started, 4)
+
+    def record_error(self, name: str, error: Exception) -> None:
+        self.errors.append(f"{name}: {getattr(error, 'detail', error)}")
+
+    def mark_ready(self, warmup_started: float) -> None:
+        self.warmup_seconds = round(time.perf_counter() - warmup_started, 4)
+        self.ready = not self.errors
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "import_seconds": self.import_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "uptime_seconds": round(time.perf_counter() - self._started, 1),
+            "steps": self.steps,
+            "errors": self.errors,
+        }
+
+
+startup_report = StartupReport()
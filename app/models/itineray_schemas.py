@@ -21,3 +21,17 @@ class DayPlan(BaseModel):
     day: str
     activities: List[Activity]
     restaurant: Restaurant
+
+# Chunked generation
+# Destination Brief
+class DestinationBrief(BaseModel):
+    """Model for the shared destination brief used by every day chunk."""
+    destination: str
+    transport_tips: str
+    expectation: str
+    attractions: List[str]
+
+# Day Chunk
+class DayPlanChunk(BaseModel):
+    """Model for a range of daily plans generated together."""
+    daily_plan: List[DayPlan]
@@ -1,7 +1,7 @@
 # models/schem.py
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 from app.models.itineray_schemas import DayPlan
 
 # Request Model
@@ -12,6 +12,10 @@ class FlightSearchRequest(BaseModel):
     outbound_date: str
     return_date: Optional[str] = None
     currency: Optional[str] = "USD"
+    # Service mode override; "fast" ranks flights in code instead of with the agent
+    mode: Optional[Literal["agent", "prefetched", "fast"]] = None
+    # In "fast" mode, write the recommendation text with the LLM (True) or a template (False)
+    llm_text: bool = True
 
 class HotelSearchRequest(BaseModel):
     """Model for hotel search request."""
@@ -19,18 +23,32 @@ class HotelSearchRequest(BaseModel):
     check_in_date: Optional[str] = None
     check_out_date: Optional[str] = None
     currency: Optional[str] = "USD"
+    # Service mode override; "fast" ranks hotels in code instead of with the agent
+    mode: Optional[Literal["agent", "prefetched", "fast"]] = None
+    # In "fast" mode, write the recommendation text with the LLM (True) or a template (False)
+    llm_text: bool = True
 
 class ItineraryPlanRequest(BaseModel):
     """Model for itineray travel plan request."""
     destination: Optional[str] = None
     check_in_date: Optional[str] = None
     check_out_date: Optional[str] = None
+    # Skip the itinerary cache for this request; on /plan-trip this also skips the trip cache
+    # read, so a cached trip cannot serve a stale itinerary
+    bypass_cache: bool = False
 
 class TripPlanRequest(BaseModel):
     """Model for trip plan request."""
     flights: FlightSearchRequest
     hotels: HotelSearchRequest
     itineraries: ItineraryPlanRequest
+    # Skip the trip cache read for this request; the fresh result still refreshes the entry
+    bypass_cache: bool = False
+
+    @property
+    def bypass_trip_cache(self) -> bool:
+        """Whether the trip cache read is skipped (top-level or itinerary `bypass_cache`)."""
+        return self.bypass_cache or self.itineraries.bypass_cache
 
 # Response Model
 class FlightDetails(BaseModel):
@@ -40,6 +58,8 @@ class FlightDetails(BaseModel):
     travel_class: str
     price: str
     duration: str
+    departure: Optional[str] = None
+    arrival: Optional[str] = None
     departure_time: str
     arrival_time: str
 
@@ -74,11 +94,62 @@ class HotelRecommendation(BaseModel):
     hotel_details: HotelDetails
     source_link: Optional[str] = None
 
+class RecommendationText(BaseModel):
+    recommendation: str
+    value_explanation: str
+
 class ItineraryRecommendation(BaseModel):
     itinerary_details: ItineraryDetails
 
 class TripPlanRecommendation(BaseModel):
     """Model for trip plan response."""
-    flight: FlightRecommendation
-    hotel: HotelRecommendation
-    itinerary: ItineraryRecommendation
+    flight: Optional[FlightRecommendation] = None
+    hotel: Optional[HotelRecommendation] = None
+    itinerary: Optional[ItineraryRecommendation] = None
+    errors: Optional[Dict[str, str]] = None
+
+
+# Batch
+class BatchTripPlanRequest(BaseModel):
+    """Model for batch trip plan request."""
+    requests: List[TripPlanRequest]
+
+class BatchTripPlanItem(BaseModel):
+    """Model for a single batch trip plan result."""
+    index: int
+    status: Literal["success", "failed"]
+    result: Optional[TripPlanRecommendation] = None
+    errors: Optional[Dict[str, str]] = None
+
+class BatchTripPlanResponse(BaseModel):
+    """Model for batch trip plan response."""
+    items: List[BatchTripPlanItem]
+    total: int
+    succeeded: int
+    failed: int
+    unique_subrequests: Dict[str, int]
+
+# Jobs
+class JobSubmitResponse(BaseModel):
+    """Model for job submission response."""
+    job_id: str
+    status: str
+
+class JobStatusResponse(BaseModel):
+    """Model for job status response."""
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    created_at: float
+    updated_at: float
+    attempts: int
+    result: Optional[TripPlanRecommendation] = None
+    error: Optional[str] = None
+
+# Streaming
+class PlanTripEvent(BaseModel):
+    """Model for a streamed trip plan event."""
+    event: Literal["progress", "flight", "hotel", "itinerary", "error", "done"]
+    stage: Optional[str] = None
+    status: Optional[str] = None
+    data: Optional[Union[FlightRecommendation, HotelRecommendation, ItineraryRecommendation]] = None
+    error: Optional[str] = None
@@ -1,8 +1,40 @@
 # prompts/flight_prompt.py
 
+import json
 from app.models.schemas import FlightSearchRequest
-
-def build_flight_prompt(request: FlightSearchRequest) -> str:
+from app.prompts.response_format import response_format
+
+# Example-based response format, dropped when the agent runs with a native response schema
+FLIGHT_RESPONSE_FORMAT = """
+Your response must strictly follow this JSON format:
+{
+    "flight_details": {
+        "airline": "Air France",
+        "airline_logo": "https://example.com/logo.png",
+        "travel_class": "Economy",
+        "price": "USD 425",
+        "duration": "7h 45m",
+        "departure": "JFK International Airport",
+        "arrival": "Charles de Gaulle Airport",
+        "departure_time": "10:30 AM",
+        "arrival_time": "12:15 AM"
+    },
+    "recommendation": "Air France offers a balanced option with a comfortable economy class and direct routing.",
+    "value_explanation": "This flight offers a good mix of comfort, timing, and competitive pricing — making it ideal for most travelers.",
+    "source_link": "https://www.example.com/booking"
+}
+""".strip()
+
+FLIGHT_TEXT_RESPONSE_FORMAT = """
+Your response must strictly follow this JSON format:
+{
+    "recommendation": "Air France offers a balanced option with a comfortable economy class and direct routing.",
+    "value_explanation": "This flight offers a good mix of comfort, timing, and competitive pricing — making it ideal for most travelers."
+}
+""".strip()
+
+
+def build_flight_prompt(request: FlightSearchRequest, include_example: bool = True) -> str:
     """
     Build a prompt for the flight recommendation agent using structured input fields
 
@@ -10,10 +42,12 @@ def build_flight_prompt(request: FlightSearchRequest) -> str:
         request (FlightSearchRequest): Object containing flight search input including:
             - departure_id (can be airport code), - arrival_id (can be airport code)
             - outbound_date, - return_date (optional), - currency (optional)
+        include_example (bool): Include the example JSON format (False when using a native response schema).
 
     Returns:
         str: A structured prompt string instructing the LLM agent to search and recommend flights using SerpAPI tools.
     """
+    format_section = response_format(FLIGHT_RESPONSE_FORMAT, include_example)
 
     prompt = f"""
         You are a part of Trekly — a travel assistant that uses the `google_flights` engine powered by SerpAPI,
@@ -34,7 +68,8 @@ def build_flight_prompt(request: FlightSearchRequest) -> str:
         Perform a real-time flight search using the `google_flights` engine from SerpAPI using the above parameters.
 
         Step 2 — Data Extraction:
-        From the API response, extract flight options from both `best_flights` and `other_flights`. From each flight, gather:
+        From the API response, extract flight options from both `best_flights` and `other_flights`
+        (or from the `flights` list when the response is already pre-digested). From each flight, gather:
         - `airline`
         - `airline_logo`
         - `departure`: First `departure_airport.name`
@@ -60,23 +95,7 @@ def build_flight_prompt(request: FlightSearchRequest) -> str:
         Avoid overly early or late flights unless they offer outstanding benefits.
 
         ---
-        Your response must strictly follow this JSON format:
-        {{
-            "flight_details": {{
-                "airline": "Air France",
-                "airline_logo": "https://example.com/logo.png",
-                "travel_class": "Economy",
-                "price": "USD 425",
-                "duration": "7h 45m",
-                "departure": "JFK International Airport",
-                "arrival": "Charles de Gaulle Airport",
-                "departure_time": "10:30 AM",
-                "arrival_time": "12:15 AM"
-            }},
-            "recommendation": "Air France offers a balanced option with a comfortable economy class and direct routing.",
-            "value_explanation": "This flight offers a good mix of comfort, timing, and competitive pricing — making it ideal for most travelers.",
-            "source_link": "https://www.example.com/booking"
-        }}
+        {format_section}
 
         ---
         Final Notes:
@@ -86,3 +105,120 @@ def build_flight_prompt(request: FlightSearchRequest) -> str:
     """
 
     return prompt.strip()
+
+
+def build_flight_ranking_prompt(
+    request: FlightSearchRequest, flight_data: dict, include_example: bool = True
+) -> str:
+    """
+    Build a prompt for the flight recommendation agent over pre-fetched Google Flights results.
+
+    The search has already been performed, so the agent only ranks the options and writes
+    the recommendation — no tool call round trip is needed.
+
+    Args:
+        request (FlightSearchRequest): Flight search input the results were fetched for.
+        flight_data (dict): Google Flights results (raw or projected).
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A structured prompt string instructing the LLM agent to recommend one of the given flights.
+    """
+    format_section = response_format(FLIGHT_RESPONSE_FORMAT, include_example)
+
+    prompt = f"""
+        You are a part of Trekly — a travel assistant recommending flights.
+
+        The flight search for the following user input has already been performed:
+
+        - From: `{request.departure_id}`
+        - To: `{request.arrival_id}`
+        - Outbound Date: `{request.outbound_date}`
+        {"- Return Date: `" + request.return_date + "`" if request.return_date else ""}
+        - Currency: `{request.currency or "USD"}`
+
+        Flight search results (JSON):
+        {json.dumps(flight_data, separators=(",", ":"), default=str)}
+
+        ---
+        Instructions:
+
+        Do not call any tool. Using only the results above, evaluate at least 3 options and select the best flight.
+        Prioritize based on:
+        - Travel comfort (class, layovers)
+        - Convenience (departure/arrival timing)
+        - Overall duration
+        - Price (only when it significantly improves value)
+
+        Avoid overly early or late flights unless they offer outstanding benefits.
+
+        ---
+        {format_section}
+
+        ---
+        Final Notes:
+        - Do not fabricate any information; copy flight details from the results.
+        - If required fields are missing, discard that flight.
+        - Return only a single JSON object in the specified format with no introductory or closing text.
+    """
+
+    return prompt.strip()
+
+
+def build_flight_summary_prompt(
+    request: FlightSearchRequest, flight_details: dict, include_example: bool = True
+) -> str:
+    """
+    Build a short prompt asking the LLM only for the recommendation text of an already selected flight.
+
+    Args:
+        request (FlightSearchRequest): Flight search input.
+        flight_details (dict): The selected flight.
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A prompt string instructing the LLM agent to explain the selected flight.
+    """
+    format_section = response_format(FLIGHT_TEXT_RESPONSE_FORMAT, include_example)
+
+    prompt = f"""
+        You are a part of Trekly — a travel assistant recommending flights.
+
+        The best flight from `{request.departure_id}` to `{request.arrival_id}` on `{request.outbound_date}`
+        has already been selected:
+        {json.dumps(flight_details, separators=(",", ":"), default=str)}
+
+        Do not call any tool. Write a one-sentence recommendation and a one-sentence value explanation
+        for this flight, based only on the data above.
+
+        {format_section}
+
+        Return only a single JSON object with no introductory or closing text.
+    """
+
+    return prompt.strip()
+
+
+def build_flight_template_text(flight: dict) -> dict:
+    """
+    Build templated recommendation text for a selected flight, without calling the LLM.
+
+    Args:
+        flight (dict): The selected, scored flight option.
+
+    Returns:
+        dict: `recommendation` and `value_explanation` strings.
+    """
+    layovers = flight.get("layovers") or 0
+    routing = "a direct flight" if not layovers else f"{layovers} layover{'s' if layovers > 1 else ''}"
+
+    return {
+        "recommendation": (
+            f"{flight['airline']} offers {routing} in {flight.get('travel_class') or 'Economy'} class, "
+            f"departing {flight['departure_time']} and arriving {flight['arrival_time']}."
+        ),
+        "value_explanation": (
+            f"Ranked best on comfort, layovers, duration ({flight['duration']}), timing and price "
+            f"({flight['price']}) among the available options."
+        ),
+    }
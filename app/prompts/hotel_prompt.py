@@ -1,20 +1,49 @@
 # prompts/hotel_prompt.py
 
+import json
 from app.models.schemas import HotelSearchRequest
+from app.prompts.response_format import response_format
 
+# Example-based response format, dropped when the agent runs with a native response schema
+HOTEL_RESPONSE_FORMAT = """
+Return the response **strictly in the following JSON format**:
+{
+"recommendation": string,
+"value_explanation": string,
+"hotel_details": {
+    "name": string,
+    "image_url": string,
+    "price_per_night": string,
+    "rating": float,
+    "amenities": [string]
+},
+"source_link": string
+}
+""".strip()
 
-def build_hotel_prompt(request: HotelSearchRequest) -> str:
+HOTEL_TEXT_RESPONSE_FORMAT = """
+Return ONLY a JSON object in the following format (no triple backticks):
+{
+"recommendation": string,
+"value_explanation": string
+}
+""".strip()
+
+
+def build_hotel_prompt(request: HotelSearchRequest, include_example: bool = True) -> str:
     """
     Build a prompt for the hotel recommendation agent using airport code + SerpAPI lookup.
 
     Args:
         request (HotelSearchRequest): Object containing hotel search input such as:
                     (arrival_id, check_in_date, and check_out_date)
+        include_example (bool): Include the example JSON format (False when using a native response schema).
 
     Returns:
         str: A formatted prompt string that instructs the LLM agent to use SerpAPI's
              Google Hotel engine
     """
+    format_section = response_format(HOTEL_RESPONSE_FORMAT, include_example)
 
     prompt = f"""
     You are part of Trekly, a travel assistant that helps users find the best hotels using SerpAPI's `google_hotels` engine.
@@ -35,19 +64,7 @@ def build_hotel_prompt(request: HotelSearchRequest) -> str:
     - Good value for price (optional to mention price)
 
     Step 3:
-    Return the response **strictly in the following JSON format**:
-    {{
-    "recommendation": string,
-    "value_explanation": string,
-    "hotel_details": {{
-        "name": string,
-        "image_url": string,
-        "price_per_night": string,
-        "rating": float,
-        "amenities": [string]
-    }},
-    "source_link": string
-    }}
+    {format_section}
 
     Recommendation Criteria:
     - Rating: Highlight what the rating suggests about service and cleanliness.
@@ -58,3 +75,104 @@ def build_hotel_prompt(request: HotelSearchRequest) -> str:
     """
 
     return prompt.strip()
+
+
+def build_hotel_ranking_prompt(
+    request: HotelSearchRequest, hotel_data: dict, include_example: bool = True
+) -> str:
+    """
+    Build a prompt for the hotel recommendation agent over pre-fetched Google Hotels results.
+
+    Args:
+        request (HotelSearchRequest): Hotel search input the results were fetched for.
+        hotel_data (dict): Google Hotels results (raw or projected).
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A formatted prompt string that instructs the LLM agent to recommend one of the given hotels.
+    """
+    format_section = response_format(HOTEL_RESPONSE_FORMAT, include_example)
+
+    prompt = f"""
+    You are part of Trekly, a travel assistant that helps users find the best hotels.
+
+    The hotel search for the following inputs has already been performed:
+    - destination: {request.destination}
+    - check_in_date: {request.check_in_date}
+    - check_out_date: {request.check_out_date}
+    - currency: {request.currency or "USD"}
+
+    Hotel search results (JSON):
+    {json.dumps(hotel_data, separators=(",", ":"), default=str)}
+
+    Do not call any tool. Using only the results above, recommend a **top-rated hotel** based on:
+    - High rating (4.0+ preferred)
+    - Useful amenities (e.g., Wi-Fi, breakfast, restaurant)
+    - Good value for price (optional to mention price)
+
+    {format_section}
+
+    Recommendation Criteria:
+    - Rating: Highlight what the rating suggests about service and cleanliness.
+    - Comfort & Amenities: Focus on how well the hotel meets typical travel needs (e.g., Wi-Fi, breakfast, workspace, atmosphere).
+    - Price: Mention only if it enhances the value of an already good experience.
+
+    Return ONLY a JSON object with the following keys (no triple backticks):
+    """
+
+    return prompt.strip()
+
+
+def build_hotel_summary_prompt(
+    request: HotelSearchRequest, hotel_details: dict, include_example: bool = True
+) -> str:
+    """
+    Build a short prompt asking the LLM only for the recommendation text of an already selected hotel.
+
+    Args:
+        request (HotelSearchRequest): Hotel search input.
+        hotel_details (dict): The selected hotel.
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A prompt string instructing the LLM agent to explain the selected hotel.
+    """
+    format_section = response_format(HOTEL_TEXT_RESPONSE_FORMAT, include_example)
+
+    prompt = f"""
+    You are part of Trekly, a travel assistant that helps users find the best hotels.
+
+    The best hotel in {request.destination} from {request.check_in_date} to {request.check_out_date}
+    has already been selected:
+    {json.dumps(hotel_details, separators=(",", ":"), default=str)}
+
+    Do not call any tool. Write a one-sentence recommendation and a one-sentence value explanation
+    for this hotel, based only on the data above.
+
+    {format_section}
+    """
+
+    return prompt.strip()
+
+
+def build_hotel_template_text(hotel: dict) -> dict:
+    """
+    Build templated recommendation text for a selected hotel, without calling the LLM.
+
+    Args:
+        hotel (dict): The selected hotel details.
+
+    Returns:
+        dict: `recommendation` and `value_explanation` strings.
+    """
+    rating = f"rated {hotel['rating']}" if hotel.get("rating") is not None else "well reviewed"
+    amenities = ", ".join((hotel.get("amenities") or [])[:3])
+    price = f" at {hotel['price_per_night']} per night" if hotel.get("price_per_night") else ""
+
+    return {
+        "recommendation": f"{hotel['name']} is {rating}{price}.",
+        "value_explanation": (
+            f"Ranked best on rating, amenities{' (' + amenities + ')' if amenities else ''} "
+            "and price among the available hotels."
+        ),
+    }
@@ -1,19 +1,55 @@
 # prompts/itinerary_prompt.py
 
+from typing import List
+from app.models.itineray_schemas import DestinationBrief
 from app.models.schemas import ItineraryPlanRequest
+from app.prompts.response_format import response_format
 
+# Example-based response format, dropped when the agent runs with a native response schema
+ITINERARY_RESPONSE_FORMAT = """
+Your response should strictly follow this JSON format:
+{
+"itinerary_details": {
+        "destination": "Paris, France",
+        "check_in_date": "2025-07-01",
+        "check_out_date": "2025-07-05",
+        "num_days": "4",
+        "daily_plan": [
+        {
+            "day": "Day 1",
+            "activities": [
+            { "time": "09:00 AM", "activity": "Visit the Eiffel Tower" },
+            { "time": "12:00 PM", "activity": "Lunch at a local café" },
+            { "time": "03:00 PM", "activity": "Walk along the Seine River" }
+            ],
+            "restaurant": {
+            "name": "Le Relais de l'Entrecôte",
+            "cuisine": "French",
+            "tip": "Try the steak-frites with their secret sauce."
+            }
+        }
+        // Add more days...
+        ],
+        "transport_tips": "Use Uber or the Paris Metro for quick local travel.",
+        "expectation": "A well-rounded experience of Parisian culture, cuisine, and iconic attractions."
+}
+}
+""".strip()
 
-def build_itinerary_prompt(request: ItineraryPlanRequest) -> str:
+
+def build_itinerary_prompt(request: ItineraryPlanRequest, include_example: bool = True) -> str:
     """
     Build a prompt for the itinerary generation agent using destination, check-in and check-out dates,
     with support from the `search_google` tool for location enrichment and itinerary generation.
 
     Args:
         request (TravelPlanRequest): Object containing itinerary input: (destination (airport code or location), check_in_date, check_out_date)
+        include_example (bool): Include the example JSON format (False when using a native response schema).
 
     Returns:
         str: A structured prompt string instructing the LLM agent to generate a multi-day travel itinerary.
     """
+    format_section = response_format(ITINERARY_RESPONSE_FORMAT, include_example)
 
     prompt = f"""
         You are a part of Trekly — a travel assistant that uses the `search_google` tool for destination lookup and planning support.
@@ -41,34 +77,130 @@ def build_itinerary_prompt(request: ItineraryPlanRequest) -> str:
         Use your tool access to confirm cultural spots, experiences, and must-visit attractions.
         ---
 
-        Your response should strictly follow this JSON format:
-        {{
-        "itinerary_details": {{
-                "destination": "Paris, France",
-                "check_in_date": "2025-07-01",
-                "check_out_date": "2025-07-05",
-                "num_days": "4",
-                "daily_plan": [
-                {{
-                    "day": "Day 1",
-                    "activities": [
-                    {{ "time": "09:00 AM", "activity": "Visit the Eiffel Tower" }},
-                    {{ "time": "12:00 PM", "activity": "Lunch at a local café" }},
-                    {{ "time": "03:00 PM", "activity": "Walk along the Seine River" }}
-                    ],
-                    "restaurant": {{
-                    "name": "Le Relais de l'Entrecôte",
-                    "cuisine": "French",
-                    "tip": "Try the steak-frites with their secret sauce."
-                    }}
-                }}
-                // Add more days...
-                ],
-                "transport_tips": "Use Uber or the Paris Metro for quick local travel.",
-                "expectation": "A well-rounded experience of Parisian culture, cuisine, and iconic attractions."
-        }}
-        }}
+        {format_section}
+
+    """
+
+    return prompt.strip()
+
+
+BRIEF_RESPONSE_FORMAT = """
+Your response should strictly follow this JSON format:
+{
+    "destination": "Paris, France",
+    "transport_tips": "Use Uber or the Paris Metro for quick local travel.",
+    "expectation": "A well-rounded experience of Parisian culture, cuisine, and iconic attractions.",
+    "attractions": ["Eiffel Tower", "Louvre Museum", "Montmartre", "Seine River cruise"]
+}
+""".strip()
+
+DAYS_RESPONSE_FORMAT = """
+Your response should strictly follow this JSON format:
+{
+    "daily_plan": [
+        {
+            "day": "Day 1",
+            "activities": [
+                { "time": "09:00 AM", "activity": "Visit the Eiffel Tower" },
+                { "time": "12:00 PM", "activity": "Lunch at a local café" },
+                { "time": "03:00 PM", "activity": "Walk along the Seine River" }
+            ],
+            "restaurant": {
+                "name": "Le Relais de l'Entrecôte",
+                "cuisine": "French",
+                "tip": "Try the steak-frites with their secret sauce."
+            }
+        }
+    ]
+}
+""".strip()
+
+
+def build_itinerary_brief_prompt(
+    request: ItineraryPlanRequest, num_days: int, include_example: bool = True
+) -> str:
+    """
+    Build a prompt for the shared destination brief used by chunked itinerary generation.
+
+    Args:
+        request (ItineraryPlanRequest): Itinerary input (destination, check_in_date, check_out_date).
+        num_days (int): Trip length in days.
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A prompt string instructing the LLM agent to resolve the destination and list its attractions.
+    """
+    format_section = response_format(BRIEF_RESPONSE_FORMAT, include_example)
+
+    prompt = f"""
+        You are a part of Trekly — a travel assistant that uses the `search_google` tool for destination lookup and planning support.
+
+        A {num_days}-day trip is being planned for the following user input:
+
+        - Destination: `{request.destination}` (Note: this may be an airport code — resolve it using `search_google`)
+        - Check-in Date: `{request.check_in_date}`
+        - Check-out Date: `{request.check_out_date}`
+
+        ---
+        Instructions:
+
+        Step 1 — Destination Resolution: Use `search_google` to resolve the destination to a full city and country name.
+
+        Step 2 — Destination Brief:
+        - List at least {num_days * 3} distinct tourist-friendly, popular and local-highlight attractions,
+          each as a short name (e.g., "Louvre Museum").
+        - Write local transport tips and a one-sentence expectation for the whole trip.
+        ---
+
+        {format_section}
+    """
+
+    return prompt.strip()
+
+
+def build_itinerary_days_prompt(
+    request: ItineraryPlanRequest,
+    brief: DestinationBrief,
+    day_numbers: List[int],
+    attractions: List[str],
+    excluded: List[str],
+    include_example: bool = True,
+) -> str:
+    """
+    Build a prompt for one chunk (range of days) of a chunked itinerary.
+
+    Args:
+        request (ItineraryPlanRequest): Itinerary input.
+        brief (DestinationBrief): Shared destination brief.
+        day_numbers (List[int]): Days to plan (1-based).
+        attractions (List[str]): Attractions assigned to this chunk.
+        excluded (List[str]): Attractions already used on other days.
+        include_example (bool): Include the example JSON format (False when using a native response schema).
+
+    Returns:
+        str: A prompt string instructing the LLM agent to plan only the given days.
+    """
+    format_section = response_format(DAYS_RESPONSE_FORMAT, include_example)
+    day_labels = ", ".join(f"Day {number}" for number in day_numbers)
+
+    prompt = f"""
+        You are a part of Trekly — a travel assistant planning a trip to {brief.destination}
+        from `{request.check_in_date}` to `{request.check_out_date}`.
+
+        Plan only the following days, in order: {day_labels}.
+
+        ---
+        Instructions:
+
+        Do not call any tool.
+        - Each day's plan must include 2-4 key activities spaced out through the day.
+        - Include one restaurant recommendation per day with cuisine type and a tip.
+        - Build the days around these attractions: {", ".join(attractions) or "any local highlights"}.
+        - Do not include these attractions, they are covered on other days: {", ".join(excluded) or "none"}.
+        - Use exactly the day labels above in the `day` field.
+        ---
 
+        {format_section}
     """
 
     return prompt.strip()
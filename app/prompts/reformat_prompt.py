@@ -0,0 +1,32 @@
+# prompts/reformat_prompt.py
+
+
+def build_reformat_prompt(original_prompt: str, previous_answer: str, error: str) -> str:
+    """
+    Build a prompt asking the agent to reformat its previous answer without redoing the work.
+
+    Args:
+        original_prompt (str): The prompt of the failed attempt (carries the required JSON format).
+        previous_answer (str): The raw answer that could not be used.
+        error (str): Why the answer was rejected.
+
+    Returns:
+        str: A prompt string instructing the LLM agent to return the same data as valid JSON.
+    """
+
+    prompt = f"""
+        Your previous answer to the task below could not be used: {error}
+
+        Do not call any tool and do not search again. Reuse the data from your previous answer,
+        fill in any missing required field from that data only, and return it as a single valid
+        JSON object in exactly the format requested by the task, with no introductory or closing text.
+
+        Previous answer:
+        {previous_answer}
+
+        ---
+        Original task:
+        {original_prompt}
+    """
+
+    return prompt.strip()
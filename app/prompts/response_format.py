@@ -0,0 +1,18 @@
+# prompts/response_format.py
+
+STRUCTURED_RESPONSE_FORMAT = "Your response must follow the provided response schema."
+
+
+def response_format(example: str, include_example: bool = True) -> str:
+    """
+    Return the response format section of a prompt.
+
+    Args:
+        example (str): Example-based JSON format instructions.
+        include_example (bool): False when the agent runs with a native response schema,
+            which already constrains the output, so the (long) example is dropped.
+
+    Returns:
+        str: The format section to embed in the prompt.
+    """
+    return example if include_example else STRUCTURED_RESPONSE_FORMAT
@@ -0,0 +1,190 @@
+# services/chunked_itinerary_service.py
+
+import asyncio
+from typing import Dict, List, Optional, Set
+from pydantic import ValidationError
+from app.agents.agents import itinerary_brief_agent_pool, itinerary_chunk_agent_pool
+from app.agents.agents_factory import structured_output_enabled
+from app.core.config import settings
+from app.core.exceptions import ItineraryPlannerAgentError
+from app.models.itineray_schemas import DayPlan, DestinationBrief
+from app.models.schemas import ItineraryDetails, ItineraryPlanRequest, ItineraryRecommendation
+from app.prompts.itinerary_prompt import build_itinerary_brief_prompt, build_itinerary_days_prompt
+from app.utils.logging import logging
+from app.utils.request import run_agent_with_retries
+from app.utils.validator import get_type_adapter
+
+
+def split_days(day_numbers: List[int], chunk_days: int) -> List[List[int]]:
+    """Split day numbers into consecutive chunks of at most `chunk_days` days."""
+    chunk_days = max(chunk_days, 1)
+    return [day_numbers[i:i + chunk_days] for i in range(0, len(day_numbers), chunk_days)]
+
+
+def assign_attractions(attractions: List[str], chunks: int) -> List[List[str]]:
+    """Distribute attractions round-robin so every chunk features different ones."""
+    assigned: List[List[str]] = [[] for _ in range(chunks)]
+    for index, attraction in enumerate(attractions):
+        assigned[index % chunks].append(attraction)
+    return assigned
+
+
+def mentioned_attractions(day: DayPlan, attractions: List[str]) -> Set[str]:
+    """Attractions from the brief that a day's activities mention."""
+    text = " ".join(activity.activity for activity in day.activities).lower()
+    return {attraction for attraction in attractions if attraction.lower() in text}
+
+
+def _validate_chunk(data: dict) -> bool:
+    """Accept any chunk with a day list; days are validated one by one afterwards."""
+    return isinstance(data.get("daily_plan"), list)
+
+
+def _accept_days(chunk: dict, day_numbers: List[int]) -> Dict[int, DayPlan]:
+    """
+    Validate each day of a chunk independently.
+
+    Days are matched by position; invalid or missing days are left out so that only they
+    are regenerated.
+    """
+    adapter = get_type_adapter(DayPlan)
+    accepted = {}
+
+    for number, raw_day in zip(day_numbers, chunk.get("daily_plan") or []):
+        try:
+            day = adapter.validate_python(raw_day)
+        except ValidationError as e:
+            logging.warning("[Itinerary Planner Agent] Day %d failed validation: %d errors", number, e.error_count())
+            continue
+
+        if not day.activities:
+            logging.warning("[Itinerary Planner Agent] Day %d has no activities", number)
+            continue
+
+        accepted[number] = day.model_copy(update={"day": f"Day {number}"})
+
+    return accepted
+
+
+async def _generate_chunk(
+    request: ItineraryPlanRequest,
+    brief: DestinationBrief,
+    day_numbers: List[int],
+    attractions: List[str],
+    excluded: List[str],
+) -> Dict[int, DayPlan]:
+    chunk = await run_agent_with_retries(
+        agent=itinerary_chunk_agent_pool,
+        prompt=build_itinerary_days_prompt(
+            request,
+            brief,
+            day_numbers,
+            attractions,
+            excluded,
+            include_example=not structured_output_enabled(has_tools=False),
+        ),
+        validator_fn=_validate_chunk,
+        agent_name="Itinerary Planner Agent",
+        agent_type="itinerary_chunk",
+        require_tools=False,
+    )
+    return _accept_days(chunk, day_numbers)
+
+
+async def generate_chunked_itinerary(
+    request: ItineraryPlanRequest, num_days: int
+) -> ItineraryRecommendation:
+    """
+    Generate an itinerary as a shared destination brief plus concurrently generated day ranges.
+
+    The brief (resolved destination, attractions, transport tips) is produced once with the
+    `search_google` tool. Day ranges of `ITINERARY_CHUNK_DAYS` days are then planned
+    concurrently by tool-free agents, each featuring its own share of the attractions. Days
+    that fail validation, or that repeat an attraction already planned on another day, are
+    regenerated (up to `ITINERARY_CHUNK_MAX_REGENERATIONS` times) without touching the rest.
+
+    Args:
+        request (ItineraryPlanRequest): Validated itinerary request.
+        num_days (int): Trip length in days.
+
+    Returns:
+        ItineraryRecommendation: The merged itinerary.
+
+    Raises:
+        ItineraryPlannerAgentError: If the brief or some days cannot be generated.
+    """
+    try:
+        brief = await run_agent_with_retries(
+            agent=itinerary_brief_agent_pool,
+            prompt=build_itinerary_brief_prompt(
+                request, num_days, include_example=not structured_output_enabled(has_tools=True)
+            ),
+            validator_fn=None,
+            response_model=DestinationBrief,
+            agent_name="Itinerary Planner Agent",
+            agent_type="itinerary_chunk",
+        )
+    except Exception as e:
+        raise ItineraryPlannerAgentError(detail=str(e))
+
+    plans: Dict[int, DayPlan] = {}
+    used: Dict[int, Set[str]] = {}
+    pending = list(range(1, num_days + 1))
+    rounds = settings.ITINERARY_CHUNK_MAX_REGENERATIONS + 1
+    last_error: Optional[BaseException] = None
+
+    for round_number in range(1, rounds + 1):
+        chunks = split_days(pending, settings.ITINERARY_CHUNK_DAYS)
+        taken = set().union(*used.values())
+        available = [attraction for attraction in brief.attractions if attraction not in taken]
+        assigned = assign_attractions(available, len(chunks))
+
+        logging.info(
+            "[Itinerary Planner Agent] Round %d: generating %d days in %d chunks",
+            round_number,
+            len(pending),
+            len(chunks),
+        )
+        tasks = []
+        for index, days in enumerate(chunks):
+            # Attractions already planned or assigned to the other chunks of this round
+            excluded = taken.union(*(share for other, share in enumerate(assigned) if other != index))
+            tasks.append(_generate_chunk(request, brief, days, assigned[index], sorted(excluded)))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                last_error = result
+                continue
+
+            for number, day in sorted(result.items()):
+                mentioned = mentioned_attractions(day, brief.attractions)
+                repeated = mentioned & set().union(*used.values())
+                # Repeated attractions are only worth a regeneration while rounds remain
+                if repeated and round_number < rounds:
+                    logging.info("[Itinerary Planner Agent] Day %d repeats %s", number, sorted(repeated))
+                    continue
+                plans[number] = day
+                used[number] = mentioned
+
+        pending = [number for number in pending if number not in plans]
+        if not pending:
+            break
+
+    if pending:
+        raise ItineraryPlannerAgentError(
+            detail=f"Could not generate days {pending} of the itinerary: {last_error or 'invalid day plans'}"
+        )
+
+    return ItineraryRecommendation(
+        itinerary_details=ItineraryDetails(
+            destination=brief.destination,
+            check_in_date=request.check_in_date,
+            check_out_date=request.check_out_date,
+            num_days=num_days,
+            daily_plan=[plans[number] for number in range(1, num_days + 1)],
+            transport_tips=brief.transport_tips,
+            expectation=brief.expectation,
+        )
+    )
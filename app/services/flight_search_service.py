@@ -1,24 +1,54 @@
 # agent/flight_search_service.py
 
-from app.agents.agents import flight_agent
-from app.prompts.flight_prompt import build_flight_prompt
-from app.utils.validator import validate_flight_data
-from app.models.schemas import FlightSearchRequest
+from app.agents.agents import flight_agent_pool, flight_ranking_agent_pool, flight_summary_agent_pool
+from app.agents.agents_factory import structured_output_enabled
+from app.core.config import settings
+from app.prompts.flight_prompt import (
+    build_flight_prompt,
+    build_flight_ranking_prompt,
+    build_flight_summary_prompt,
+    build_flight_template_text,
+)
+from app.utils.validator import validate_recommendation_text, validate_response_model
+from app.models.schemas import FlightRecommendation, FlightSearchRequest
 from app.core.exceptions import FlightAgentError, MissingParameterError
 from app.utils.request import run_agent_with_retries
+from app.utils.singleflight import single_flight
+from app.utils.helpers import load_serpapi_tools
+from app.utils.projection import project_flights
+from app.utils.scoring import has_required_flight_fields, score_flight_options
+
+# Fields returned in `flight_details`
+FLIGHT_DETAIL_FIELDS = [
+    "airline",
+    "airline_logo",
+    "travel_class",
+    "price",
+    "duration",
+    "departure",
+    "arrival",
+    "departure_time",
+    "arrival_time",
+]
 
 
 # Retruning flight recommended option
+@single_flight("get_flight_options")
 async def get_flight_options(request: FlightSearchRequest):
     """
         Run the flight search recommendation agent using the SerpAPI Google Flights engine.
 
+        In "prefetched" mode, the search is performed directly and the agent only ranks the
+        results, saving the tool-call round trip. In "fast" mode, flights are ranked in code and
+        the LLM only writes the recommendation text (or none at all when `llm_text` is False).
+        The mode comes from `request.mode`, falling back to `FLIGHT_SERVICE_MODE`.
+
         Args:
             request (FlightSearchRequest): Flight search input containing departure ID, arrival ID,
                                         outbound date, return date (optional), and currency (optional).
 
         Returns:
-            Dict: A JSON-compatible dictionary structured.
+            FlightRecommendation: The validated recommendation.
 
         Raises:
             MissingParameterError: If the prompt is not provided.
@@ -31,16 +61,116 @@ async def get_flight_options(request: FlightSearchRequest):
             detail="All required flight parameters must be provided to get a recommendation."
         )
 
+    mode = request.mode or settings.FLIGHT_SERVICE_MODE
+
+    if mode == "prefetched":
+        return await _get_prefetched_flight_options(request)
+
+    if mode == "fast":
+        return await _get_fast_flight_options(request)
+
     # Construct the LLM prompt from the passed data
-    prompt = build_flight_prompt(request)
+    prompt = build_flight_prompt(request, include_example=not structured_output_enabled(has_tools=True))
 
     # Attempt to get flight recommendation response
     try:
         return await run_agent_with_retries(
-            agent=flight_agent,
+            agent=flight_agent_pool,
             prompt=prompt,
-            validator_fn=validate_flight_data,
-            agent_name="FlightAgent"
+            validator_fn=None,
+            response_model=FlightRecommendation,
+            agent_name="FlightAgent",
+            agent_type="flight"
+        )
+    except Exception as e:
+        raise FlightAgentError(detail=str(e))
+
+
+async def _get_prefetched_flight_options(request: FlightSearchRequest):
+    """
+    Fetch Google Flights results directly and let the agent rank them.
+
+    Args:
+        request (FlightSearchRequest): Validated flight search input.
+
+    Returns:
+        FlightRecommendation: The validated recommendation.
+    """
+    try:
+        flight_data = await load_serpapi_tools().asearch_flights(
+            departure_id=request.departure_id,
+            arrival_id=request.arrival_id,
+            outbound_date=request.outbound_date,
+            return_date=request.return_date,
+            currency=request.currency or "USD",
+        )
+
+        return await run_agent_with_retries(
+            agent=flight_ranking_agent_pool,
+            prompt=build_flight_ranking_prompt(
+                request, flight_data, include_example=not structured_output_enabled(has_tools=False)
+            ),
+            validator_fn=None,
+            response_model=FlightRecommendation,
+            agent_name="FlightAgent",
+            agent_type="flight",
+            require_tools=False,
+        )
+    except Exception as e:
+        raise FlightAgentError(detail=str(e))
+
+
+async def _get_fast_flight_options(request: FlightSearchRequest):
+    """
+    Select the best flight with the deterministic ranking function.
+
+    Args:
+        request (FlightSearchRequest): Validated flight search input.
+
+    Returns:
+        FlightRecommendation: The validated recommendation.
+    """
+    try:
+        flight_data = await load_serpapi_tools().asearch_flights(
+            departure_id=request.departure_id,
+            arrival_id=request.arrival_id,
+            outbound_date=request.outbound_date,
+            return_date=request.return_date,
+            currency=request.currency or "USD",
+            project=False,
         )
+
+        projected = project_flights(flight_data)
+        options = [
+            option for option in projected.get("flights", []) if has_required_flight_fields(option)
+        ]
+        if not options:
+            raise FlightAgentError(detail="No complete flight options were found.")
+
+        best = score_flight_options(options, settings.FLIGHT_SCORE_WEIGHTS)[0]
+        flight_details = {field: best.get(field) for field in FLIGHT_DETAIL_FIELDS}
+
+        if request.llm_text:
+            text = await run_agent_with_retries(
+                agent=flight_summary_agent_pool,
+                prompt=build_flight_summary_prompt(
+                    request, flight_details, include_example=not structured_output_enabled(has_tools=False)
+                ),
+                validator_fn=validate_recommendation_text,
+                agent_name="FlightAgent",
+                agent_type="flight",
+                require_tools=False,
+            )
+        else:
+            text = build_flight_template_text(flight_details | {"layovers": best.get("layovers")})
+
+        return validate_response_model({
+            "flight_details": flight_details,
+            "recommendation": text["recommendation"],
+            "value_explanation": text["value_explanation"],
+            "source_link": projected.get("source_link"),
+        }, FlightRecommendation, "FlightAgent")
+    except FlightAgentError:
+        raise
     except Exception as e:
         raise FlightAgentError(detail=str(e))
@@ -1,22 +1,40 @@
 # agent/hotel_search_service.py
 
-from app.agents.agents import hotel_agent
-from app.prompts.hotel_prompt import build_hotel_prompt
-from app.utils.validator import validate_hotel_data
-from app.models.schemas import HotelSearchRequest
+from app.agents.agents import hotel_agent_pool, hotel_ranking_agent_pool, hotel_summary_agent_pool
+from app.agents.agents_factory import structured_output_enabled
+from app.core.config import settings
+from app.prompts.hotel_prompt import (
+    build_hotel_prompt,
+    build_hotel_ranking_prompt,
+    build_hotel_summary_prompt,
+    build_hotel_template_text,
+)
+from app.utils.validator import validate_recommendation_text, validate_response_model
+from app.models.schemas import HotelRecommendation, HotelSearchRequest
 from app.core.exceptions import HotelAgentError, MissingParameterError
 from app.utils.request import run_agent_with_retries
+from app.utils.singleflight import single_flight
+from app.utils.helpers import load_serpapi_tools
+from app.utils.hotel_scoring import has_required_hotel_fields, rank_hotels, to_hotel_details
+from app.utils.projection import project_hotels
 
 # Retruning hotel recommended option
+@single_flight("get_hotel_options")
 async def get_hotel_options(request: HotelSearchRequest ):
     """
     Run the Hotel recommendation agent using the SerpAPI Google Flights engine.
 
+    In "prefetched" mode, the search is performed directly and the agent only picks from a
+    pre-ranked shortlist, saving the tool-call round trip. In "fast" mode, the top hotel is
+    selected by the vectorized scoring engine and the LLM only writes the recommendation text
+    (or none at all when `llm_text` is False). The mode comes from `request.mode`, falling
+    back to `HOTEL_SERVICE_MODE`.
+
     Args:
         request (HotelSearchRequest): Hotel search input containing arrival ID, check in date, and check out date.
 
     Returns:
-        Dict: A JSON-compatible dictionary structured
+        HotelRecommendation: The validated recommendation.
 
     Raises:
         MissingParameterError: If the prompt is not provided.
@@ -28,16 +46,140 @@ async def get_hotel_options(request: HotelSearchRequest ):
             detail="All required hotel parameters must be provided to get a recommendation."
         )
 
+    mode = request.mode or settings.HOTEL_SERVICE_MODE
+
+    if mode == "prefetched":
+        return await _get_prefetched_hotel_options(request)
+
+    if mode == "fast":
+        return await _get_fast_hotel_options(request)
+
     # Construct the LLM prompt from the passed data
-    prompt = build_hotel_prompt(request)
+    prompt = build_hotel_prompt(request, include_example=not structured_output_enabled(has_tools=True))
 
     # Attempt to get hotel recommendation response
     try:
         return  await run_agent_with_retries(
-            agent=hotel_agent,
+            agent=hotel_agent_pool,
             prompt=prompt,
-            validator_fn=validate_hotel_data,
-            agent_name="HotelAgent"
+            validator_fn=None,
+            response_model=HotelRecommendation,
+            agent_name="HotelAgent",
+            agent_type="hotel"
+        )
+    except Exception as e:
+        raise HotelAgentError(detail=str(e))
+
+
+async def _fetch_ranked_hotels(request: HotelSearchRequest, top_k: int):
+    """
+    Fetch Google Hotels results and rank every complete property with the scoring engine.
+
+    Properties missing any of `REQUIRED_HOTEL_FIELDS` (e.g. no price or image) are dropped
+    first, so they can never be picked over a complete one.
+
+    Args:
+        request (HotelSearchRequest): Validated hotel search input.
+        top_k (int): Number of ranked properties to return.
+
+    Returns:
+        List[dict]: Projected properties with a `score`, best first.
+    """
+    hotel_data = await load_serpapi_tools().asearch_hotels(
+        arrival_id=request.destination,
+        check_in_date=request.check_in_date,
+        check_out_date=request.check_out_date,
+        currency=request.currency or "USD",
+        project=False,
+    )
+
+    return rank_hotels(
+        [prop for prop in project_hotels(hotel_data).get("properties", []) if has_required_hotel_fields(prop)],
+        weights=settings.HOTEL_SCORE_WEIGHTS,
+        desired_amenities=settings.HOTEL_DESIRED_AMENITIES,
+        top_k=top_k,
+    )
+
+
+async def _get_prefetched_hotel_options(request: HotelSearchRequest):
+    """
+    Fetch Google Hotels results directly and let the agent rank them.
+
+    When `HOTEL_SHORTLIST_SIZE` is set, only that many pre-ranked hotels are passed to the agent.
+
+    Args:
+        request (HotelSearchRequest): Validated hotel search input.
+
+    Returns:
+        HotelRecommendation: The validated recommendation.
+    """
+    try:
+        if settings.HOTEL_SHORTLIST_SIZE:
+            hotel_data = {
+                "properties": await _fetch_ranked_hotels(request, settings.HOTEL_SHORTLIST_SIZE)
+            }
+        else:
+            hotel_data = await load_serpapi_tools().asearch_hotels(
+                arrival_id=request.destination,
+                check_in_date=request.check_in_date,
+                check_out_date=request.check_out_date,
+                currency=request.currency or "USD",
+            )
+
+        return await run_agent_with_retries(
+            agent=hotel_ranking_agent_pool,
+            prompt=build_hotel_ranking_prompt(
+                request, hotel_data, include_example=not structured_output_enabled(has_tools=False)
+            ),
+            validator_fn=None,
+            response_model=HotelRecommendation,
+            agent_name="HotelAgent",
+            agent_type="hotel",
+            require_tools=False,
         )
     except Exception as e:
         raise HotelAgentError(detail=str(e))
+
+
+async def _get_fast_hotel_options(request: HotelSearchRequest):
+    """
+    Select the best hotel with the vectorized scoring engine.
+
+    Args:
+        request (HotelSearchRequest): Validated hotel search input.
+
+    Returns:
+        HotelRecommendation: The validated recommendation.
+    """
+    try:
+        ranked = await _fetch_ranked_hotels(request, top_k=1)
+        if not ranked:
+            raise HotelAgentError(detail="No complete hotel options were found.")
+
+        best = ranked[0]
+        hotel_details = to_hotel_details(best)
+
+        if request.llm_text:
+            text = await run_agent_with_retries(
+                agent=hotel_summary_agent_pool,
+                prompt=build_hotel_summary_prompt(
+                    request, hotel_details, include_example=not structured_output_enabled(has_tools=False)
+                ),
+                validator_fn=validate_recommendation_text,
+                agent_name="HotelAgent",
+                agent_type="hotel",
+                require_tools=False,
+            )
+        else:
+            text = build_hotel_template_text(hotel_details)
+
+        return validate_response_model({
+            "hotel_details": hotel_details,
+            "recommendation": text["recommendation"],
+            "value_explanation": text["value_explanation"],
+            "source_link": best.get("link"),
+        }, HotelRecommendation, "HotelAgent")
+    except HotelAgentError:
+        raise
+    except Exception as e:
+        raise HotelAgentError(detail=str(e))
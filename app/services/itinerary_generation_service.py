@@ -1,23 +1,39 @@
 # services/itinerary_generation_service.py
 
-from app.agents.agents import itinerary_agent
+from app.agents.agents import itinerary_agent_pool
+from app.agents.agents_factory import structured_output_enabled
+from app.core.config import settings
+from app.services.chunked_itinerary_service import generate_chunked_itinerary
 from app.prompts.itinerary_prompt import build_itinerary_prompt
-from app.utils.validator import validate_itinerary_data
-from app.models.schemas import ItineraryPlanRequest
+from app.models.schemas import ItineraryPlanRequest, ItineraryRecommendation
 from app.core.exceptions import ItineraryPlannerAgentError, MissingParameterError
 from app.utils.request import run_agent_with_retries
+from app.utils.singleflight import single_flight
+from app.utils.itinerary_cache import (
+    get_itinerary_cache,
+    itinerary_cache_key,
+    restamp_itinerary,
+    trip_num_days,
+)
+from app.utils.logging import logging
 
 
+@single_flight("generate_itinerary")
 async def generate_itinerary(request: ItineraryPlanRequest):
     """
         Run the itinerary generation agent using the SerpAPI Google Search engine.
 
+        Itineraries are cached per resolved city, trip length and season bucket; cache hits
+        are re-stamped with the request's dates. Set `bypass_cache` to force (and cache) a fresh run.
+        Trips of at least `ITINERARY_CHUNK_MIN_DAYS` days are generated in concurrent day chunks
+        when `ITINERARY_GENERATION_MODE` is "chunked".
+
         Args:
             request (ItineraryPlanRequest): Itinerary plan request containing user preferences,
                                             destinations, check in and check out dates.
 
         Returns:
-            Dict: A JSON-compatible dictionary structured.
+            ItineraryRecommendation: The validated itinerary.
 
         Raises:
             MissingParameterError: If the prompt is not provided.
@@ -30,16 +46,49 @@ async def generate_itinerary(request: ItineraryPlanRequest):
             detail="All required itinerary parameters must be provided to get a recommendation."
         )
 
+    cache = get_itinerary_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = await itinerary_cache_key(request)
+        cached = cache.get(cache_key) if cache_key and not request.bypass_cache else None
+        if cached is not None:
+            logging.info("[Itinerary Planner Agent] Cache hit for %s", cache_key)
+            return restamp_itinerary(cached, request.check_in_date, request.check_out_date)
+
+    num_days = trip_num_days(request)
+    if settings.ITINERARY_GENERATION_MODE == "chunked" and (num_days or 0) >= settings.ITINERARY_CHUNK_MIN_DAYS:
+        result = await generate_chunked_itinerary(request, num_days)
+    else:
+        result = await _generate_single_itinerary(request)
+
+    if cache_key is not None:
+        cache.set(cache_key, result)
+
+    return result
+
+
+async def _generate_single_itinerary(request: ItineraryPlanRequest) -> ItineraryRecommendation:
+    """
+    Generate the whole itinerary in a single agent response.
+
+    Args:
+        request (ItineraryPlanRequest): Validated itinerary request.
+
+    Returns:
+        ItineraryRecommendation: The validated itinerary.
+    """
     # Construct the LLM prompt from the passed data
-    prompt = build_itinerary_prompt(request)
+    prompt = build_itinerary_prompt(request, include_example=not structured_output_enabled(has_tools=True))
 
     # Attempt to get flight recommendation response
     try:
         return await run_agent_with_retries(
-            agent=itinerary_agent,
+            agent=itinerary_agent_pool,
             prompt=prompt,
-            validator_fn=validate_itinerary_data,
-            agent_name="Itinerary Planner Agent"
+            validator_fn=None,
+            response_model=ItineraryRecommendation,
+            agent_name="Itinerary Planner Agent",
+            agent_type="itinerary"
         )
     except Exception as e:
         raise ItineraryPlannerAgentError(detail=str(e))
@@ -0,0 +1,243 @@
+# services/job_service.py
+
+import asyncio
+import os
+import socket
+import uuid
+from functools import lru_cache
+from typing import List, Optional, Set
+from app.agents.coordinator import TreklyTravelPlanner
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.models.schemas import TripPlanRequest
+from app.utils.job_store import SQLiteJobStore
+from app.utils.logging import logging
+from app.utils.retry import FailureClass, classify_failure
+from app.utils.tracing import start_trace
+
+# Failure classes worth running a job again for
+TRANSIENT_FAILURES = {FailureClass.UPSTREAM_RATE_LIMIT, FailureClass.UPSTREAM_ERROR}
+
+
+def is_transient_failure(error: BaseException) -> bool:
+    """
+    Whether a job failed on a transient upstream error.
+
+    Services wrap provider errors in their own exceptions, so the whole cause/context chain
+    is classified.
+    """
+    seen = set()
+    while isinstance(error, Exception) and id(error) not in seen:
+        if classify_failure(error) in TRANSIENT_FAILURES:
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class JobWorkerPool:
+    """
+    Asyncio worker pool executing trip plan jobs persisted in a `SQLiteJobStore`.
+
+    Capacity is governed by the number of workers and the queue size rather than by
+    open HTTP connections. Unfinished jobs are re-queued when the pool starts and by a
+    periodic sweep; whatever does not fit in the queue stays in the store until a later sweep.
+    Each run claims its job under a lease first, so pools of several processes sharing the
+    store never run a job concurrently. A job failing on a transient upstream error goes
+    back to the store and is re-run by a later sweep, within the same attempts cap.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteJobStore,
+        size: int = 4,
+        max_queue_size: int = 1000,
+        recovery_interval: float = 30.0,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 3,
+    ):
+        self.store = store
+        self.size = size
+        self.recovery_interval = recovery_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._workers: List[asyncio.Task] = []
+        self._recovery: Optional[asyncio.Task] = None
+        # Ids queued or running in this process, so sweeps don't queue them twice
+        self._pending: Set[str] = set()
+        # Queue slots held by submissions still persisting their job
+        self._reserved = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def _free_slots(self) -> Optional[int]:
+        """Remaining queue capacity (None when the queue is unbounded)."""
+        if self._queue.maxsize <= 0:
+            return None
+        return self._queue.maxsize - self._queue.qsize() - self._reserved
+
+    def _enqueue(self, job_id: str) -> None:
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def requeue_unfinished(self) -> int:
+        """
+        Queue unfinished jobs from the store, as far as the queue has room.
+
+        Returns:
+            int: Number of jobs queued.
+        """
+        unfinished = await asyncio.to_thread(self.store.unfinished_jobs)
+
+        queued = 0
+        for job_id in unfinished:
+            free = self._free_slots()
+            if free is not None and free <= 0:
+                break
+            if job_id not in self._pending:
+                self._enqueue(job_id)
+                queued += 1
+
+        if queued:
+            logging.info("[JobWorkerPool] Re-queued %s unfinished jobs", queued)
+        return queued
+
+    async def _recover(self) -> None:
+        while True:
+            await asyncio.sleep(self.recovery_interval)
+            try:
+                await self.requeue_unfinished()
+            except Exception as e:
+                logging.error("[JobWorkerPool] Job recovery sweep failed: %s", e)
+
+    async def start(self) -> None:
+        """Re-queue unfinished jobs and start the workers and the recovery sweep."""
+        if self.running:
+            return
+
+        await self.requeue_unfinished()
+
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.size)
+        ]
+        self._recovery = asyncio.create_task(self._recover())
+
+    async def stop(self) -> None:
+        """Stop the workers; running jobs are handed back to the queue and resumed on next start."""
+        tasks = self._workers + ([self._recovery] if self._recovery is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._recovery = None
+        self._pending.clear()
+
+    async def submit(self, request: TripPlanRequest) -> str:
+        """
+        Persist and enqueue a trip plan job.
+
+        Args:
+            request (TripPlanRequest): The trip plan request.
+
+        Returns:
+            str: The job id.
+
+        Raises:
+            ServiceUnavailableError: If the job queue is full.
+        """
+        free = self._free_slots()
+        if free is not None and free <= 0:
+            raise ServiceUnavailableError(detail="Job queue is full, please retry later.")
+
+        # Hold the slot while the job is persisted, so concurrent submissions and recovery
+        # sweeps cannot fill the queue in between
+        self._reserved += 1
+        try:
+            job_id = await asyncio.to_thread(self.store.create, request.model_dump_json())
+        finally:
+            self._reserved -= 1
+
+        self._enqueue(job_id)
+        return job_id
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error("[JobWorkerPool] Worker %s failed on job %s: %s", index, job_id, e)
+            finally:
+                self._pending.discard(job_id)
+                self._queue.task_done()
+
+    async def _renew_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await asyncio.to_thread(self.store.renew, job_id, self.owner, self.lease_seconds)
+            except Exception as e:
+                logging.error("[JobWorkerPool] Renewing the lease of job %s failed: %s", job_id, e)
+                continue
+            if not renewed:
+                logging.warning("[JobWorkerPool] Lost the lease of job %s", job_id)
+                return
+
+    async def _run_job(self, job_id: str) -> None:
+        job = await asyncio.to_thread(
+            self.store.claim, job_id, self.owner, self.lease_seconds, self.max_attempts
+        )
+        if job is None:
+            # Finished, claimed by another process or out of attempts
+            return
+
+        logging.info("[JobWorkerPool] Running job %s (attempt %s)", job_id, job["attempts"])
+        renewal = asyncio.create_task(self._renew_lease(job_id))
+
+        try:
+            request = TripPlanRequest.model_validate_json(job["request"])
+            # Jobs run outside of the submitting request; their trace id is the job id
+            with start_trace("job", trace_id=job_id):
+                result = await TreklyTravelPlanner().execute(request)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.store.release, job_id, self.owner)
+            raise
+        except Exception as e:
+            error = str(getattr(e, "detail", e))
+            if job["attempts"] < self.max_attempts and is_transient_failure(e):
+                logging.warning("[JobWorkerPool] Job %s failed transiently, re-queued: %s", job_id, error)
+                await asyncio.to_thread(self.store.requeue, job_id, self.owner, error)
+            else:
+                await asyncio.to_thread(self.store.mark_failed, job_id, self.owner, error)
+            return
+        finally:
+            renewal.cancel()
+
+        await asyncio.to_thread(self.store.mark_succeeded, job_id, self.owner, result.model_dump_json())
+
+
+@lru_cache(maxsize=1)
+def get_job_pool() -> Optional[JobWorkerPool]:
+    """
+    Build the job worker pool.
+
+    Returns:
+        Optional[JobWorkerPool]: The pool, or None when `JOBS_ENABLED` is False.
+    """
+    if not settings.JOBS_ENABLED:
+        return None
+
+    return JobWorkerPool(
+        store=SQLiteJobStore(settings.JOB_STORE_SQLITE_PATH),
+        size=settings.JOB_WORKERS,
+        max_queue_size=settings.JOB_QUEUE_MAX_SIZE,
+        recovery_interval=settings.JOB_RECOVERY_INTERVAL,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
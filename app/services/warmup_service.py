@@ -0,0 +1,66 @@
+# services/warmup_service.py
+
+import time
+from app.agents.pool import agent_pools
+from app.core.config import settings
+from app.core.startup import startup_report
+from app.utils.helpers import load_llm, load_serpapi_tools
+from app.utils.logging import logging
+
+
+async def warm_up() -> None:
+    """
+    Warm up the LLM client, SerpAPI tools, agent pools and upstream connections.
+
+    Each step is timed in the startup report; a failing step is recorded and leaves the
+    application not ready instead of crashing the worker.
+    """
+    warmup_started = time.perf_counter()
+
+    steps = [
+        ("llm", load_llm),
+        ("serpapi_tools", load_serpapi_tools),
+    ]
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+            startup_report.record_step(name, started)
+        except Exception as e:
+            logging.error("[Warm-up] %s failed: %s", name, getattr(e, "detail", e))
+            startup_report.record_error(name, e)
+
+    if not startup_report.errors:
+        started = time.perf_counter()
+        try:
+            for pool in agent_pools:
+                pool.warm(settings.WARMUP_AGENTS_PER_POOL)
+            startup_report.record_step("agent_pools", started)
+        except Exception as e:
+            logging.error("[Warm-up] agent pools failed: %s", e)
+            startup_report.record_error("agent_pools", e)
+
+    transport = getattr(load_serpapi_tools(), "transport", None) if not startup_report.errors else None
+    if transport is not None and settings.WARMUP_UPSTREAM_CONNECTIONS:
+        started = time.perf_counter()
+        try:
+            await transport.awarm()
+            startup_report.record_step("upstream_connections", started)
+        except Exception as e:
+            # Connections will simply be opened on first use
+            logging.warning("[Warm-up] Could not pre-open upstream connections: %s", e)
+
+    startup_report.mark_ready(warmup_started)
+    logging.info("[Warm-up] Complete: %s", startup_report.as_dict())
+
+
+async def shut_down() -> None:
+    """
+    Close pooled upstream connections, if the SerpAPI tools were ever created.
+    """
+    if not load_serpapi_tools.cache_info().currsize:
+        return
+
+    transport = getattr(load_serpapi_tools(), "transport", None)
+    if transport is not None:
+        await transport.aclose()
@@ -1,16 +1,222 @@
 # utils/api_loader.py
 
-from serpapi.google_search import GoogleSearch
+import asyncio
+import json
+import time
 from app.core.exceptions import SerpApiServiceError
+from app.utils.cache import TTLCache, make_cache_key
 from app.utils.logging import logging
-from typing import Optional
+from app.utils.metrics import metrics, serpapi_duration, serpapi_requests, serpapi_response_size
+from app.utils.projection import project_flights, project_hotels
+from app.utils.tracing import span
+from typing import Dict, Optional, Tuple
+
+# Default cache TTLs (seconds) per SerpAPI engine
+DEFAULT_CACHE_TTLS = {
+    "google_flights": 300,
+    "google_hotels": 1800,
+    "google": 86400,
+}
+
+def _google_search(query: dict) -> dict:
+    """Run a search with the `serpapi` client, imported on first use."""
+    from serpapi.google_search import GoogleSearch
+
+    return GoogleSearch(query).get_dict()
+
 
 class SerpApiTools:
     """
         A wrapper class for SerpAPI services providing flight, hotel, and general search capabilities.
+
+        Responses are optionally cached per normalized parameter set (excluding `api_key`),
+        with a TTL chosen per engine. Caching is transparent to the agents calling the tools.
+
+        When a pooled `transport` (see `SerpApiHttpTransport`) is given, requests go through
+        its long-lived HTTP clients instead of the `serpapi` package. Every search also has
+        an async entry point (`asearch_*`) for callers running inside the event loop.
+
+        With `project_results` enabled, flight and hotel responses are pruned to the fields
+        the agents actually use (top-K options after a pre-filter) before being returned.
     """
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[TTLCache] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        transport=None,
+        project_results: bool = False,
+        flight_top_k: Optional[int] = None,
+        flight_prefilter: str = "best",
+        hotel_top_k: Optional[int] = None,
+        hotel_prefilter: str = "rating",
+    ):
         self.api_key = api_key
+        self.cache = cache
+        self.cache_ttls = {**DEFAULT_CACHE_TTLS, **(cache_ttls or {})}
+        self.transport = transport
+        self.project_results = project_results
+        self.flight_top_k = flight_top_k
+        self.flight_prefilter = flight_prefilter
+        self.hotel_top_k = hotel_top_k
+        self.hotel_prefilter = hotel_prefilter
+
+    def _project_flights(self, fetched: Tuple[dict, Optional[int]], project: Optional[bool] = None) -> dict:
+        result, size = fetched
+        if not (self.project_results if project is None else project):
+            return result
+        return project_flights(result, top_k=self.flight_top_k, prefilter=self.flight_prefilter, raw_size=size)
+
+    def _project_hotels(self, fetched: Tuple[dict, Optional[int]], project: Optional[bool] = None) -> dict:
+        result, size = fetched
+        if not (self.project_results if project is None else project):
+            return result
+        return project_hotels(result, top_k=self.hotel_top_k, prefilter=self.hotel_prefilter, raw_size=size)
+
+    def _cache_lookup(self, params: dict):
+        """Return `(cache_key, cached_result)` for the given parameters."""
+        if self.cache is None:
+            return None, None
+
+        key = make_cache_key(params, exclude=("api_key",))
+        cached = self.cache.get(key)
+        if cached is not None:
+            logging.debug("[SerpApiTools] Cache hit for %s", params.get("engine"))
+
+        return key, cached
+
+    def _cache_store(self, key, params: dict, result: dict) -> None:
+        """Store a result in the cache, never caching upstream error payloads."""
+        if key is not None and not result.get("error"):
+            self.cache.set(key, result, ttl=self.cache_ttls.get(params.get("engine", "google")))
+
+    @staticmethod
+    def _record_upstream(
+        params: dict, started: float, result: Optional[dict], size: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Record latency, outcome and payload size of an upstream search (`result` is None on errors).
+
+        `size` is the body size reported by the transport; only without one is the result
+        serialized to measure it.
+
+        Returns:
+            Optional[int]: The payload size, or None when metrics are disabled.
+        """
+        if not metrics.enabled:
+            return None
+
+        engine = params.get("engine")
+        outcome = "error" if result is None or result.get("error") else "success"
+        serpapi_requests.inc(engine=engine, source="upstream", outcome=outcome)
+        serpapi_duration.observe(time.perf_counter() - started, engine=engine, source="upstream")
+        if result is None:
+            return None
+
+        if size is None:
+            size = len(json.dumps(result, default=str))
+        serpapi_response_size.observe(size, engine=engine)
+        return size
+
+    def _search(self, params: dict) -> Tuple[dict, Optional[int]]:
+        """
+        Execute a SerpAPI search, serving identical requests from the cache when enabled.
+
+        Args:
+            params (dict): SerpAPI query parameters, without `api_key`.
+
+        Returns:
+            Tuple[dict, Optional[int]]: Search results in SerpAPI's response format and the
+            upstream payload size in bytes (None for cache hits or when metrics are disabled)
+        """
+        with span("tool.serpapi", engine=params.get("engine")) as current:
+            key, cached = self._cache_lookup(params)
+            if cached is not None:
+                current.set(source="cache")
+                serpapi_requests.inc(engine=params.get("engine"), source="cache", outcome="success")
+                return cached, None
+
+            current.set(source="upstream")
+            query = {**params, "api_key": self.api_key}
+            started = time.perf_counter()
+            size = None
+            try:
+                if self.transport is not None:
+                    result, size = self.transport.fetch(query)
+                else:
+                    result = _google_search(query)
+            except Exception:
+                self._record_upstream(params, started, None)
+                raise
+
+            if result.get("error"):
+                current.set(upstream_error=result["error"])
+            size = self._record_upstream(params, started, result, size)
+            self._cache_store(key, params, result)
+            return result, size
+
+    async def _asearch(self, params: dict) -> Tuple[dict, Optional[int]]:
+        """
+        Async variant of `_search`.
+
+        Uses the pooled async client when a transport is configured, otherwise runs the
+        blocking `serpapi` client in a worker thread.
+        """
+        with span("tool.serpapi", engine=params.get("engine")) as current:
+            key, cached = self._cache_lookup(params)
+            if cached is not None:
+                current.set(source="cache")
+                serpapi_requests.inc(engine=params.get("engine"), source="cache", outcome="success")
+                return cached, None
+
+            current.set(source="upstream")
+            query = {**params, "api_key": self.api_key}
+            started = time.perf_counter()
+            size = None
+            try:
+                if self.transport is not None:
+                    result, size = await self.transport.afetch(query)
+                else:
+                    result = await asyncio.to_thread(_google_search, query)
+            except Exception:
+                self._record_upstream(params, started, None)
+                raise
+
+            if result.get("error"):
+                current.set(upstream_error=result["error"])
+            size = self._record_upstream(params, started, result, size)
+            self._cache_store(key, params, result)
+            return result, size
+
+    @staticmethod
+    def _flight_params(departure_id, arrival_id, outbound_date, return_date, currency) -> dict:
+        params = {
+            "engine": "google_flights",
+            "departure_id": departure_id,
+            "arrival_id": arrival_id,
+            "outbound_date": outbound_date,
+            "currency": currency,
+        }
+        if return_date:
+            params["return_date"] = return_date
+        return params
+
+    @staticmethod
+    def _hotel_params(arrival_id, check_in_date, check_out_date, currency) -> dict:
+        return {
+            "engine": "google_hotels",
+            "q": arrival_id,
+            "check_in_date": check_in_date,
+            "check_out_date": check_out_date,
+            "currency": currency,
+        }
+
+    @staticmethod
+    def _google_params(query) -> dict:
+        return {
+            "engine": "google",
+            "q": query,
+        }
 
     def search_flights(
         self,
@@ -37,21 +243,11 @@ class SerpApiTools:
             SerpApiServiceError: If the search fails or API returns an error
         """
         try:
-            params = {
-                "engine": "google_flights",
-                "departure_id": departure_id,
-                "arrival_id": arrival_id,
-                "outbound_date": outbound_date,
-                "currency": currency,
-                "api_key": self.api_key,
-            }
-            if return_date:
-                params["return_date"] = return_date
-
-            search = GoogleSearch(params)
-            return search.get_dict()
+            return self._project_flights(self._search(
+                self._flight_params(departure_id, arrival_id, outbound_date, return_date, currency)
+            ))
         except Exception as e:
-            logging.error(f"[SerpApiTools] Google Flights search failed: {e}")
+            logging.error("[SerpApiTools] Google Flights search failed: %s", e)
             raise SerpApiServiceError()
 
     def search_hotels(
@@ -77,19 +273,11 @@ class SerpApiTools:
             SerpApiServiceError: If the search fails or API returns an error
         """
         try:
-            params = {
-                "engine": "google_hotels",
-                "q": arrival_id,
-                "check_in_date": check_in_date,
-                "check_out_date": check_out_date,
-                "currency": currency,
-                "api_key": self.api_key,
-            }
-
-            search = GoogleSearch(params)
-            return search.get_dict()
+            return self._project_hotels(self._search(
+                self._hotel_params(arrival_id, check_in_date, check_out_date, currency)
+            ))
         except Exception as e:
-            logging.error(f"[SerpApiTools] Google Hotels search failed: {e}")
+            logging.error("[SerpApiTools] Google Hotels search failed: %s", e)
             raise SerpApiServiceError()
 
 
@@ -108,14 +296,50 @@ class SerpApiTools:
 
         """
         try:
-            params = {
-                "engine": "google",
-                "q": query,
-                "api_key": self.api_key,
-            }
-
-            search = GoogleSearch(params)
-            return search.get_dict()
+            return self._search(self._google_params(query))[0]
+        except Exception as e:
+            logging.error("[SerpApiTools] General Google Search failed: %s", e)
+            raise SerpApiServiceError()
+
+    async def asearch_flights(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        outbound_date: str,
+        return_date: Optional[str] = None,
+        currency: str = "USD",
+        project: Optional[bool] = None,
+    ):
+        """Async variant of `search_flights`; `project` overrides `project_results`."""
+        try:
+            return self._project_flights(await self._asearch(
+                self._flight_params(departure_id, arrival_id, outbound_date, return_date, currency)
+            ), project)
+        except Exception as e:
+            logging.error("[SerpApiTools] Google Flights search failed: %s", e)
+            raise SerpApiServiceError()
+
+    async def asearch_hotels(
+        self,
+        arrival_id: str,
+        check_in_date: str,
+        check_out_date: str,
+        currency: str = "USD",
+        project: Optional[bool] = None,
+    ):
+        """Async variant of `search_hotels`; `project` overrides `project_results`."""
+        try:
+            return self._project_hotels(await self._asearch(
+                self._hotel_params(arrival_id, check_in_date, check_out_date, currency)
+            ), project)
+        except Exception as e:
+            logging.error("[SerpApiTools] Google Hotels search failed: %s", e)
+            raise SerpApiServiceError()
+
+    async def asearch_google(self, query: str):
+        """Async variant of `search_google`."""
+        try:
+            return (await self._asearch(self._google_params(query)))[0]
         except Exception as e:
-            logging.error(f"[SerpApiTools] General Google Search failed: {e}")
+            logging.error("[SerpApiTools] General Google Search failed: %s", e)
             raise SerpApiServiceError()
@@ -0,0 +1,127 @@
+# utils/cache.py
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_cache_key(params: Dict[str, Any], exclude: Tuple[str, ...] = ()) -> str:
+    """
+    Build a stable cache key from a parameter dict.
+
+    Keys are sorted, `None` values dropped and string values trimmed so that
+    equivalent calls share the same key.
+
+    Args:
+        params (Dict[str, Any]): Parameters to normalize.
+        exclude (Tuple[str, ...]): Parameter names left out of the key (e.g. secrets).
+
+    Returns:
+        str: Canonical JSON representation of the parameters.
+    """
+    normalized = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in params.items()
+        if key not in exclude and value is not None
+    }
+    return json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Hit, miss and eviction counters are kept for tuning.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` when absent or expired.
+        """
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Return `(value, age_in_seconds)` for `key`, or None when absent or expired.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, now - stored_at
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entries when full.
+        """
+        if self.max_entries <= 0:
+            return
+
+        now = time.monotonic()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (now, expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict[str, Any]: Size, hits, misses, evictions, expirations and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
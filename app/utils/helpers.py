@@ -1,8 +1,8 @@
 # utils/helpers.py
 
 from functools import lru_cache
-from agno.models.google import Gemini
 from app.utils.api_loader import SerpApiTools
+from app.utils.cache import TTLCache
 from app.core.config import settings
 from app.core.exceptions import (
     SerpApiKeyError,
@@ -29,6 +29,9 @@ def load_llm():
         raise GeminiApiKeyError()
 
     try:
+        # Imported lazily so the Gemini SDK is only loaded when the model is first needed
+        from agno.models.google import Gemini
+
         gemini = Gemini(
             api_key= settings.GEMINI_API_KEY,
             id=settings.MODEL_ID,
@@ -57,7 +60,38 @@ def load_serpapi_tools():
         raise SerpApiKeyError()
 
     try:
-        return SerpApiTools(api_key=settings.SERPAPI_API_KEY)
+        cache = None
+        if settings.SERPAPI_CACHE_ENABLED:
+            cache = TTLCache(max_entries=settings.SERPAPI_CACHE_MAX_ENTRIES)
+
+        transport = None
+        if settings.SERPAPI_TRANSPORT == "http":
+            from app.utils.http_transport import SerpApiHttpTransport
+
+            transport = SerpApiHttpTransport(
+                base_url=settings.SERPAPI_BASE_URL,
+                connect_timeout=settings.SERPAPI_CONNECT_TIMEOUT,
+                read_timeout=settings.SERPAPI_READ_TIMEOUT,
+                max_connections=settings.SERPAPI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SERPAPI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.SERPAPI_KEEPALIVE_EXPIRY,
+            )
+
+        return SerpApiTools(
+            api_key=settings.SERPAPI_API_KEY,
+            cache=cache,
+            cache_ttls={
+                "google_flights": settings.SERPAPI_CACHE_TTL_FLIGHTS,
+                "google_hotels": settings.SERPAPI_CACHE_TTL_HOTELS,
+                "google": settings.SERPAPI_CACHE_TTL_GOOGLE,
+            },
+            transport=transport,
+            project_results=settings.SERPAPI_PROJECTION_ENABLED,
+            flight_top_k=settings.FLIGHT_RESULTS_TOP_K,
+            flight_prefilter=settings.FLIGHT_RESULTS_PREFILTER,
+            hotel_top_k=settings.HOTEL_RESULTS_TOP_K,
+            hotel_prefilter=settings.HOTEL_RESULTS_PREFILTER,
+        )
     except Exception as e:
         logging.error(f"Error loading SerpApi tools: {e}")
         raise SerpApiServiceError()
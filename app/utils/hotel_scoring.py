@@ -0,0 +1,173 @@
+# utils/hotel_scoring.py
+
+import re
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from app.utils.validator import REQUIRED_HOTEL_FIELDS
+
+# Amenity vocabulary: bit name -> keywords matched (case-insensitive, as whole words, plural
+# allowed) in SerpAPI amenity strings, so "bar" does not match "barrier-free" nor "spa" "spacious"
+AMENITY_KEYWORDS = {
+    "wifi": ("wi-fi", "wifi", "internet"),
+    "breakfast": ("breakfast",),
+    "restaurant": ("restaurant",),
+    "bar": ("bar",),
+    "pool": ("pool",),
+    "fitness": ("fitness", "gym"),
+    "spa": ("spa",),
+    "parking": ("parking",),
+    "air_conditioning": ("air conditioning", "air-conditioned"),
+    "airport_shuttle": ("airport shuttle",),
+    "workspace": ("business centre", "business center", "workspace"),
+    "room_service": ("room service",),
+    "accessible": ("accessible",),
+    "pet_friendly": ("pet-friendly", "pets allowed"),
+    "kitchen": ("kitchen",),
+    "laundry": ("laundry",),
+}
+
+AMENITY_BITS = {name: 1 << index for index, name in enumerate(AMENITY_KEYWORDS)}
+
+AMENITY_PATTERNS = {
+    name: re.compile(r"\b(?:" + "|".join(map(re.escape, keywords)) + r")s?\b", re.IGNORECASE)
+    for name, keywords in AMENITY_KEYWORDS.items()
+}
+
+# Defaults mirror the criteria in `build_hotel_prompt`
+DEFAULT_DESIRED_AMENITIES = ("wifi", "breakfast", "restaurant")
+DEFAULT_HOTEL_WEIGHTS = {
+    "rating": 0.5,
+    "amenities": 0.3,
+    "price": 0.2,
+}
+
+MAX_RATING = 5.0
+
+HOTEL_DETAIL_FIELDS = ["name", "image_url", "rating", "amenities", "price_per_night"]
+
+
+def amenity_mask(amenities: Optional[Iterable[str]]) -> int:
+    """
+    Encode a list of free-text amenities as a bitmask over `AMENITY_KEYWORDS`.
+    """
+    mask = 0
+    for amenity in amenities or []:
+        for name, pattern in AMENITY_PATTERNS.items():
+            if pattern.search(amenity):
+                mask |= AMENITY_BITS[name]
+    return mask
+
+
+class HotelCandidates:
+    """
+    Columnar view of projected hotel properties used for vectorized scoring.
+
+    Attributes:
+        properties (List[dict]): The projected properties, in column order.
+        rating (np.ndarray): Overall rating (NaN when missing).
+        price (np.ndarray): Nightly price as a number (NaN when missing).
+        amenities (np.ndarray): Amenity bitmask per property.
+    """
+
+    def __init__(self, properties: List[dict]):
+        self.properties = properties
+        self.rating = np.array(
+            [p.get("rating") if p.get("rating") is not None else np.nan for p in properties],
+            dtype=np.float64,
+        )
+        self.price = np.array(
+            [p.get("price_value") if p.get("price_value") is not None else np.nan for p in properties],
+            dtype=np.float64,
+        )
+        self.amenities = np.array(
+            [amenity_mask(p.get("amenities")) for p in properties], dtype=np.uint32
+        )
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+
+def score_hotels(
+    candidates: HotelCandidates,
+    weights: Optional[Dict[str, float]] = None,
+    desired_amenities: Iterable[str] = DEFAULT_DESIRED_AMENITIES,
+) -> np.ndarray:
+    """
+    Score every candidate in one vectorized pass.
+
+    Args:
+        candidates (HotelCandidates): Columnar hotel data.
+        weights (Optional[Dict[str, float]]): Weights for "rating", "amenities" and "price".
+        desired_amenities (Iterable[str]): Amenity names (keys of `AMENITY_KEYWORDS`) that count.
+
+    Returns:
+        np.ndarray: Score in [0, 1] per candidate.
+    """
+    weights = {**DEFAULT_HOTEL_WEIGHTS, **(weights or {})}
+    total_weight = sum(weights.values()) or 1.0
+
+    if not len(candidates):
+        return np.zeros(0, dtype=np.float64)
+
+    rating_score = np.nan_to_num(candidates.rating / MAX_RATING, nan=0.0)
+
+    price_score = np.zeros(len(candidates), dtype=np.float64)
+    known_price = ~np.isnan(candidates.price)
+    if known_price.any():
+        low, high = np.nanmin(candidates.price), np.nanmax(candidates.price)
+        spread = high - low
+        price_score[known_price] = (
+            1.0 - (candidates.price[known_price] - low) / spread if spread > 0 else 1.0
+        )
+
+    desired_bits = [AMENITY_BITS[name] for name in desired_amenities if name in AMENITY_BITS]
+    amenity_score = np.zeros(len(candidates), dtype=np.float64)
+    for bit in desired_bits:
+        amenity_score += (candidates.amenities & bit) != 0
+    if desired_bits:
+        amenity_score /= len(desired_bits)
+
+    return (
+        weights.get("rating", 0.0) * rating_score
+        + weights.get("amenities", 0.0) * amenity_score
+        + weights.get("price", 0.0) * price_score
+    ) / total_weight
+
+
+def rank_hotels(
+    properties: List[dict],
+    weights: Optional[Dict[str, float]] = None,
+    desired_amenities: Iterable[str] = DEFAULT_DESIRED_AMENITIES,
+    top_k: Optional[int] = 1,
+) -> List[dict]:
+    """
+    Rank projected hotel properties, best first.
+
+    Args:
+        properties (List[dict]): Properties produced by `project_hotel_property`.
+        weights (Optional[Dict[str, float]]): Scoring weights.
+        desired_amenities (Iterable[str]): Amenities that contribute to the amenity score.
+        top_k (Optional[int]): Number of properties to return (None returns all).
+
+    Returns:
+        List[dict]: Copies of the top properties with a `score` field.
+    """
+    candidates = HotelCandidates(properties)
+    scores = score_hotels(candidates, weights, desired_amenities)
+
+    # Stable sort on the negated score keeps upstream order on ties
+    order = np.argsort(-scores, kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+
+    return [{**properties[i], "score": round(float(scores[i]), 4)} for i in order]
+
+
+def has_required_hotel_fields(prop: dict) -> bool:
+    """Return True when a property carries every field `check_hotel_recommendation` requires."""
+    return all(prop.get(field) for field in REQUIRED_HOTEL_FIELDS)
+
+
+def to_hotel_details(prop: dict) -> dict:
+    """Build a `HotelDetails`-shaped dict from a projected property."""
+    return {field: prop.get(field) for field in HOTEL_DETAIL_FIELDS}
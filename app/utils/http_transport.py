@@ -0,0 +1,133 @@
+# utils/http_transport.py
+
+import asyncio
+import threading
+from typing import Optional, Tuple
+import httpx
+from app.core.exceptions import SerpApiServiceError
+from app.utils.logging import logging, truncate
+
+
+class SerpApiHttpTransport:
+    """
+    Pooled HTTP transport for SerpAPI using long-lived `httpx` clients.
+
+    A single sync client and a single async client are shared across all tool calls,
+    so connections (and their TLS sessions) are kept alive and reused instead of being
+    re-established on every search.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://serpapi.com",
+        search_path: str = "/search",
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.search_path = search_path
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared synchronous client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        base_url=self.base_url, timeout=self.timeout, limits=self.limits
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Shared asynchronous client, created on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, limits=self.limits
+            )
+        return self._async_client
+
+    @staticmethod
+    def _handle_response(response: httpx.Response) -> Tuple[dict, int]:
+        """Return the JSON body and its size in bytes, or raise `SerpApiServiceError` on HTTP errors."""
+        if response.status_code >= 400:
+            logging.error(
+                "[SerpApiHttpTransport] SerpAPI returned HTTP %d: %s",
+                response.status_code,
+                truncate(response.text, 200),
+            )
+            raise SerpApiServiceError(
+                detail=f"SerpApi service returned HTTP {response.status_code}"
+            )
+
+        return response.json(), len(response.content)
+
+    def fetch(self, params: dict) -> Tuple[dict, int]:
+        """
+        Perform a blocking search request.
+
+        Args:
+            params (dict): SerpAPI query parameters, including `api_key`.
+
+        Returns:
+            Tuple[dict, int]: Search results in SerpAPI's response format and the body size in bytes
+        """
+        response = self.client.get(self.search_path, params={**params, "output": "json"})
+        return self._handle_response(response)
+
+    async def afetch(self, params: dict) -> Tuple[dict, int]:
+        """
+        Perform a non-blocking search request.
+
+        Args:
+            params (dict): SerpAPI query parameters, including `api_key`.
+
+        Returns:
+            Tuple[dict, int]: Search results in SerpAPI's response format and the body size in bytes
+        """
+        response = await self.async_client.get(
+            self.search_path, params={**params, "output": "json"}
+        )
+        return self._handle_response(response)
+
+    def get(self, params: dict) -> dict:
+        """Blocking search request returning only the results (see `fetch`)."""
+        return self.fetch(params)[0]
+
+    async def aget(self, params: dict) -> dict:
+        """Non-blocking search request returning only the results (see `afetch`)."""
+        return (await self.afetch(params))[0]
+
+    async def awarm(self) -> None:
+        """
+        Pre-open pooled connections (DNS, TCP and TLS) to the base URL.
+
+        The response status is irrelevant; only the established keep-alive connection matters.
+        """
+        await self.async_client.head("/")
+        await asyncio.to_thread(self.client.head, "/")
+
+    def close(self) -> None:
+        """Close the synchronous client."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both clients."""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,137 @@
+# utils/itinerary_cache.py
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+from app.core.config import settings
+from app.models.schemas import ItineraryRecommendation
+from app.utils.cache import TTLCache
+from app.utils.helpers import load_serpapi_tools
+from app.utils.logging import logging
+
+IATA_CODE = re.compile(r"^[A-Za-z]{3}$")
+
+# Meteorological seasons (northern hemisphere) by month
+SEASONS = {
+    12: "winter", 1: "winter", 2: "winter",
+    3: "spring", 4: "spring", 5: "spring",
+    6: "summer", 7: "summer", 8: "summer",
+    9: "autumn", 10: "autumn", 11: "autumn",
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace(",", " ").split())
+
+
+async def resolve_destination_city(destination: str) -> str:
+    """
+    Resolve a destination (airport code or place name) to a normalized city name.
+
+    Airport codes are resolved with a (cached) `search_google` lookup; when no answer is
+    found the normalized code itself is used.
+
+    Args:
+        destination (str): Destination as given in the request.
+
+    Returns:
+        str: Normalized destination used in the itinerary cache key.
+    """
+    destination = destination.strip()
+    if not IATA_CODE.match(destination):
+        return _normalize(destination)
+
+    try:
+        data = await load_serpapi_tools().asearch_google(f"{destination.upper()} airport city")
+        answer = (data.get("answer_box") or {})
+        city = answer.get("answer") or answer.get("result") or (data.get("knowledge_graph") or {}).get("title")
+        if city:
+            return _normalize(city)
+    except Exception as e:
+        logging.warning("[ItineraryCache] Could not resolve `%s`: %s", destination, e)
+
+    return _normalize(destination)
+
+
+def season_bucket(check_in: date) -> Optional[str]:
+    """Return the season bucket for a check-in date according to `ITINERARY_CACHE_SEASON_BUCKET`."""
+    if settings.ITINERARY_CACHE_SEASON_BUCKET == "month":
+        return f"m{check_in.month:02d}"
+    if settings.ITINERARY_CACHE_SEASON_BUCKET == "season":
+        return SEASONS[check_in.month]
+    return None
+
+
+def trip_num_days(request) -> Optional[int]:
+    """
+    Number of days between the request's check-in and check-out dates.
+
+    Args:
+        request (ItineraryPlanRequest): Itinerary plan request with dates.
+
+    Returns:
+        Optional[int]: The trip length, or None when the dates cannot be parsed or are not ordered.
+    """
+    try:
+        num_days = (date.fromisoformat(request.check_out_date) - date.fromisoformat(request.check_in_date)).days
+    except (TypeError, ValueError):
+        return None
+
+    return num_days if num_days > 0 else None
+
+
+async def itinerary_cache_key(request) -> Optional[Tuple[str, int, Optional[str]]]:
+    """
+    Build the itinerary cache key: resolved city, number of days and optional season bucket.
+
+    Args:
+        request (ItineraryPlanRequest): Itinerary plan request with destination and dates.
+
+    Returns:
+        Optional[Tuple[str, int, Optional[str]]]: The key, or None when the dates cannot be parsed.
+    """
+    num_days = trip_num_days(request)
+    if num_days is None:
+        return None
+
+    city = await resolve_destination_city(request.destination)
+    return city, num_days, season_bucket(date.fromisoformat(request.check_in_date))
+
+
+def restamp_itinerary(result: ItineraryRecommendation, check_in_date: str, check_out_date: str) -> ItineraryRecommendation:
+    """
+    Stamp the caller's dates onto a cached itinerary result.
+
+    Only the top-level models are copied; the (immutable in practice) daily plan is shared
+    with the cached entry instead of being deep-copied on every hit.
+
+    Args:
+        result (ItineraryRecommendation): Cached itinerary recommendation.
+        check_in_date (str): Check-in date of the current request.
+        check_out_date (str): Check-out date of the current request.
+
+    Returns:
+        ItineraryRecommendation: The re-stamped itinerary recommendation.
+    """
+    details = result.itinerary_details.model_copy(
+        update={"check_in_date": check_in_date, "check_out_date": check_out_date}
+    )
+    return result.model_copy(update={"itinerary_details": details})
+
+
+@lru_cache(maxsize=1)
+def get_itinerary_cache() -> Optional[TTLCache]:
+    """
+    Build the itinerary cache.
+
+    Returns:
+        Optional[TTLCache]: The cache, or None when `ITINERARY_CACHE_ENABLED` is False.
+    """
+    if not settings.ITINERARY_CACHE_ENABLED:
+        return None
+
+    return TTLCache(
+        max_entries=settings.ITINERARY_CACHE_MAX_ENTRIES,
+        default_ttl=settings.ITINERARY_CACHE_TTL,
+    )
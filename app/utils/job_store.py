@@ -0,0 +1,167 @@
+# utils/job_store.py
+
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class SQLiteJobStore:
+    """
+    Persistent job store backed by SQLite.
+
+    Workers `claim` a job atomically and hold it under a lease they keep renewing, so
+    several processes can share the database without running a job twice. Jobs survive
+    a worker restart: anything still `queued`, or `running` under an expired lease, is
+    picked up again by `unfinished_jobs`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_expires_at REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, in WAL mode so readers don't block the workers."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, request: str) -> str:
+        """
+        Persist a new queued job.
+
+        Args:
+            request (str): Serialized request payload.
+
+        Returns:
+            str: The job id.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, request, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, request, now, now),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job row as a dict, or None when unknown."""
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def claim(
+        self, job_id: str, owner: str, lease_seconds: float, max_attempts: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim a queued job, or a running one whose lease has expired.
+
+        A claimable job that already used `max_attempts` attempts is marked failed instead.
+
+        Args:
+            job_id (str): The job id.
+            owner (str): Identifier of the claiming worker pool.
+            lease_seconds (float): Lease duration; the owner must `renew` it before it expires.
+            max_attempts (int): Maximum number of runs of a job.
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None when it cannot be claimed.
+        """
+        now = time.time()
+        claimable = "(status = ? OR (status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)))"
+
+        with self._connection() as conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_expires_at = ?, attempts = attempts + 1, "
+                f"updated_at = ? WHERE id = ? AND attempts < ? AND {claimable}",
+                (RUNNING, owner, now + lease_seconds, now, job_id, max_attempts, QUEUED, RUNNING, now),
+            ).rowcount
+            if not claimed:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, owner = NULL, lease_expires_at = NULL, "
+                    f"updated_at = ? WHERE id = ? AND attempts >= ? AND {claimable}",
+                    (FAILED, f"Job gave up after {max_attempts} attempts", now, job_id, max_attempts,
+                     QUEUED, RUNNING, now),
+                )
+
+        return self.get(job_id) if claimed else None
+
+    def renew(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extend the lease of a running job; False when `owner` no longer holds it."""
+        now = time.time()
+        with self._connection() as conn:
+            return bool(conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (now + lease_seconds, now, job_id, owner, RUNNING),
+            ).rowcount)
+
+    def release(self, job_id: str, owner: str) -> None:
+        """Hand an interrupted job back to the queue without counting the attempt."""
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (QUEUED, time.time(), job_id, owner, RUNNING),
+            )
+
+    def _finish(self, job_id: str, owner: str, **fields) -> None:
+        """Record the outcome of a run, unless the lease was lost to another owner."""
+        fields.update(owner=None, lease_expires_at=None, updated_at=time.time())
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+
+        with self._connection() as conn:
+            conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND owner = ?",
+                (*fields.values(), job_id, owner),
+            )
+
+    def mark_succeeded(self, job_id: str, owner: str, result: str) -> None:
+        self._finish(job_id, owner, status=SUCCEEDED, result=result, error=None)
+
+    def mark_failed(self, job_id: str, owner: str, error: str) -> None:
+        self._finish(job_id, owner, status=FAILED, error=error)
+
+    def requeue(self, job_id: str, owner: str, error: str) -> None:
+        """Hand a transiently failed job back to the queue; the attempt still counts towards the cap."""
+        self._finish(job_id, owner, status=QUEUED, error=error)
+
+    def unfinished_jobs(self) -> List[str]:
+        """Return ids of queued jobs and of running jobs whose lease expired, oldest first."""
+        rows = self._connection().execute(
+            "SELECT id FROM jobs WHERE status = ? OR (status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)) "
+            "ORDER BY created_at",
+            (QUEUED, RUNNING, time.time()),
+        ).fetchall()
+        return [row["id"] for row in rows]
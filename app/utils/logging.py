@@ -1,13 +1,115 @@
 # utils/logging.py
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import zlib
 from typing import Optional
+from app.core.config import settings
+from app.utils.tracing import TraceContextFilter, current_trace_id
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line (time, level, logger, trace id, message)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "trace_id": getattr(record, "trace_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full.
+
+    Only the `%`-interpolation of the message happens on the calling thread; formatting and
+    I/O run on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Truncated:
+    """
+    Log argument that renders a payload truncated to `limit` characters.
+
+    The payload is only converted to text when the record is actually emitted.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: Optional[int] = None):
+        self.value = value
+        self.limit = settings.LOG_PAYLOAD_MAX_CHARS if limit is None else limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if self.limit <= 0 or len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+
+
+def truncate(value, limit: Optional[int] = None) -> Truncated:
+    """
+    Wrap a large payload (e.g. a raw agent response) for logging.
+
+    Args:
+        value: The payload.
+        limit (Optional[int]): Maximum characters to log (defaults to `LOG_PAYLOAD_MAX_CHARS`, 0 disables).
+
+    Returns:
+        Truncated: A lazily rendered, truncated log argument.
+    """
+    return Truncated(value, limit)
+
+
+def sample_verbose() -> bool:
+    """
+    Decide whether verbose per-attempt logs are emitted, at `LOG_VERBOSE_SAMPLE_RATE`.
+
+    Within a traced request the decision is derived from the trace id, so a sampled request
+    keeps all of its verbose logs.
+
+    Returns:
+        bool: True when the verbose logs should be emitted.
+    """
+    rate = settings.LOG_VERBOSE_SAMPLE_RATE
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+
+    trace_id = current_trace_id()
+    if trace_id is None:
+        return random.random() < rate
+    return zlib.crc32(trace_id.encode()) % 10_000 < rate * 10_000
 
 
 def configure_logger(
     name: str = "Trekly",
     level: int = logging.INFO,
-    format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format: str = "%(asctime)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s",
     handlers: Optional[list] = None,
+    json_format: bool = False,
+    use_queue: bool = False,
+    queue_size: int = 10_000,
 ) -> logging.Logger:
     """
     Configure and return a customized logger instance.
@@ -16,7 +118,12 @@ def configure_logger(
         name (str): Name to identify the logger (default: "Trekly")
         level (int): Logging level (default: logging.INFO)
         format (str): Log message format string
-        handlers (Optional[list]): Additional logging handlers if needed
+        handlers (Optional[list]): Additional logging handlers if needed. Every handler gets a
+            filter adding the request's `trace_id` to its records.
+        json_format (bool): Format records as JSON lines instead of `format`.
+        use_queue (bool): Put records on a bounded queue drained by a background listener
+            thread, so handlers never block the caller.
+        queue_size (int): Queue capacity; records beyond it are dropped.
 
     Returns:
         logging.Logger: Configured logger instance
@@ -25,10 +132,33 @@ def configure_logger(
     if handlers is None:
         handlers = [logging.StreamHandler()]
 
-    logging.basicConfig(level=level, format=format, handlers=handlers)
+    formatter = JsonFormatter() if json_format else logging.Formatter(format)
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(formatter)
+        handler.addFilter(TraceContextFilter())
+
+    if use_queue:
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        # The trace id lives in the caller's context, so it is captured before enqueueing
+        queue_handler.addFilter(TraceContextFilter())
+        listener = logging.handlers.QueueListener(
+            queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        handlers = [queue_handler]
+
+    logging.basicConfig(level=level, handlers=handlers)
 
     return logging.getLogger(name)
 
 
 # Configure default logger instance
-logger = configure_logger()
+logger = configure_logger(
+    level=logging.getLevelName(settings.LOG_LEVEL.upper()),
+    json_format=settings.LOG_FORMAT == "json",
+    use_queue=settings.LOG_QUEUE_ENABLED,
+    queue_size=settings.LOG_QUEUE_MAX_SIZE,
+)
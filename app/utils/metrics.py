@@ -0,0 +1,218 @@
+# utils/metrics.py
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.core.config import settings
+
+# Latency buckets (seconds): SerpAPI calls are sub-second to seconds, LLM runs seconds to minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], le: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str]):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter with labels."""
+
+    type_name = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with labels."""
+
+    type_name = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._values.items())
+
+        lines = self.header()
+        for key, series in items:
+            labels = _format_labels(self.labelnames, key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, key, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            bucket_labels = _format_labels(self.labelnames, key, le="+Inf")
+            lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry rendered in the Prometheus text exposition format.
+
+    When disabled, `inc` / `observe` return immediately, so instrumentation costs a single
+    attribute check per call.
+    """
+
+    def __init__(self, enabled: bool = True, namespace: str = "trekly"):
+        self.enabled = enabled
+        self.namespace = namespace
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(self, f"{self.namespace}_{name}", documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Iterable[float]] = None,
+    ) -> Histogram:
+        metric = Histogram(
+            self, f"{self.namespace}_{name}", documentation, labelnames, buckets=buckets or DEFAULT_BUCKETS
+        )
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+# Workflow stages
+stage_duration = metrics.histogram(
+    "stage_duration_seconds", "Duration of workflow stages (execute_agent).", ("stage", "outcome")
+)
+
+# Agent runs
+agent_attempts = metrics.counter(
+    "agent_attempts_total", "Agent run attempts by outcome and failure class.", ("agent", "kind", "outcome")
+)
+agent_attempt_duration = metrics.histogram(
+    "agent_attempt_duration_seconds", "Duration of single agent run attempts.", ("agent", "kind")
+)
+llm_tokens = metrics.counter(
+    "llm_tokens_total", "Model tokens reported by agent runs.", ("agent", "type")
+)
+llm_model_time = metrics.histogram(
+    "llm_model_time_seconds", "Model time reported by agent runs.", ("agent",)
+)
+
+# SerpAPI
+serpapi_requests = metrics.counter(
+    "serpapi_requests_total", "SerpAPI searches by engine, source and outcome.", ("engine", "source", "outcome")
+)
+serpapi_duration = metrics.histogram(
+    "serpapi_request_duration_seconds", "Latency of SerpAPI searches.", ("engine", "source")
+)
+serpapi_response_size = metrics.histogram(
+    "serpapi_response_bytes", "Serialized size of upstream SerpAPI responses.", ("engine",), buckets=SIZE_BUCKETS
+)
+
+
+def _run_metric(run_metrics, name: str) -> float:
+    """Total of an agno run metric, whether stored as a dict of per-call lists or as attributes."""
+    value = run_metrics.get(name) if isinstance(run_metrics, dict) else getattr(run_metrics, name, None)
+    if isinstance(value, (list, tuple)):
+        return float(sum(item for item in value if isinstance(item, (int, float))))
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def record_run_usage(agent_name: str, result) -> None:
+    """
+    Record token usage and model time from an agno run response.
+
+    Args:
+        agent_name (str): Agent name used as the `agent` label.
+        result: The run response (its `metrics` attribute is read when present).
+    """
+    if not metrics.enabled:
+        return
+
+    run_metrics = getattr(result, "metrics", None)
+    if not run_metrics:
+        return
+
+    for token_type in ("input_tokens", "output_tokens"):
+        tokens = _run_metric(run_metrics, token_type)
+        if tokens:
+            llm_tokens.inc(tokens, agent=agent_name, type=token_type.replace("_tokens", ""))
+
+    model_time = _run_metric(run_metrics, "time") or _run_metric(run_metrics, "duration")
+    if model_time:
+        llm_model_time.observe(model_time, agent=agent_name)
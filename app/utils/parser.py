@@ -1,40 +1,257 @@
 import json
-import re
-import time
+from typing import Any, List, Optional, Tuple
+from pydantic import BaseModel
 from app.utils.logging import logging
-from app.core.exceptions import EmptyResponseError, MissingParameterError
+from app.core.exceptions import (
+    EmptyResponseError,
+    MalformedResponseError,
+    MissingParameterError,
+)
+from app.utils.tracing import span
+from app.utils.validator import validate_response_model
 
-def parse_and_validate_response(raw_result, validator_fn, agent_name):
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _DECODE_ERRORS: Tuple[type, ...] = (orjson.JSONDecodeError, json.JSONDecodeError)
+except ImportError:  # orjson is optional; the stdlib decoder is the fallback
+    _loads = json.loads
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+CLOSERS = {"{": "}", "[": "]"}
+ESCAPED_CONTROL_CHARS = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+# Repair names reported by `extract_json`
+LEADING_TEXT = "leading_text"
+TRAILING_TEXT = "trailing_text"
+COMMENTS = "comments"
+TRAILING_COMMAS = "trailing_commas"
+CONTROL_CHARS = "control_chars"
+TRUNCATED = "truncated"
+DROPPED_MEMBER = "dropped_member"
+
+# Longest excerpt of a dropped truncated member kept in the repair notes
+DROPPED_PREVIEW_CHARS = 80
+
+
+def _close(text: str, stack: List[str]) -> str:
+    """Close a truncated JSON document: drop a dangling separator and close open containers."""
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    elif text.endswith(":"):
+        text += "null"
+    return text + "".join(CLOSERS[opener] for opener in reversed(stack))
+
+
+def _next_opener(text: str, start: int) -> int:
+    """Return the index of the next `{` or `[` at or after `start`, or -1."""
+    positions = [position for position in (text.find("{", start), text.find("[", start)) if position >= 0]
+    return min(positions) if positions else -1
+
+
+def extract_json(raw_result: str) -> Tuple[Any, List[str]]:
     """
-    Parses and validates the raw response from the agent.
+    Extract the outermost JSON value from LLM output, repairing common defects in a single pass.
+
+    Text around the value (prose, code fences) is skipped, `//` and `/* */` comments and
+    trailing commas are removed, raw control characters inside strings are escaped and a
+    truncated tail is closed. When the first candidate does not decode (e.g. braces inside
+    leading prose), extraction retries from the next `{` or `[` after it.
 
     Args:
         raw_result (str): Raw response from the agent.
-        validator_fn (callable): Function that validates the final parsed output.
+
+    Returns:
+        Tuple[Any, List[str]]: The parsed JSON and the repairs that were applied. A member
+            dropped from a truncated tail is reported as `dropped_member=<text>`.
+
+    Raises:
+        MalformedResponseError: If no JSON value can be recovered.
+    """
+    stripped = raw_result.strip()
+
+    # Fast path: the response already is a bare JSON object
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            return _loads(stripped), []
+        except _DECODE_ERRORS:
+            pass
+
+    start = _next_opener(raw_result, 0)
+    if start < 0:
+        raise MalformedResponseError("Failed to parse JSON: no JSON object found in the response")
+
+    first_error = None
+    while start >= 0:
+        end, extracted, error = _extract_at(raw_result, start)
+        if extracted is not None:
+            return extracted
+        first_error = first_error or error
+        start = _next_opener(raw_result, end)
+
+    raise MalformedResponseError(f"Failed to parse JSON: {first_error}")
+
+
+def _extract_at(raw_result: str, start: int) -> Tuple[int, Optional[Tuple[Any, List[str]]], str]:
+    """
+    Extract the JSON value opening at `start`.
+
+    Returns:
+        Tuple[int, Optional[Tuple[Any, List[str]]], str]: The index scanning stopped at, the
+            parsed JSON and repairs (None on failure) and the decode error message.
+    """
+    repairs = set()
+    if raw_result[:start].strip():
+        repairs.add(LEADING_TEXT)
+
+    out: List[str] = []
+    stack: List[str] = []
+    # (output length, stack depth) at each comma, to cut back to if closing the tail fails
+    commas: List[Tuple[int, int]] = []
+    in_string = escaped = False
+    i, length = start, len(raw_result)
+
+    while i < length:
+        ch = raw_result[i]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            elif ch in ESCAPED_CONTROL_CHARS:
+                repairs.add(CONTROL_CHARS)
+                ch = ESCAPED_CONTROL_CHARS[ch]
+            out.append(ch)
+            i += 1
+            continue
+
+        if ch == "/" and raw_result.startswith("//", i):
+            repairs.add(COMMENTS)
+            newline = raw_result.find("\n", i)
+            i = length if newline < 0 else newline
+            continue
+
+        if ch == "/" and raw_result.startswith("/*", i):
+            repairs.add(COMMENTS)
+            end = raw_result.find("*/", i + 2)
+            i = length if end < 0 else end + 2
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in CLOSERS:
+            stack.append(ch)
+        elif ch in "}]":
+            # Drop a trailing comma before the closing bracket
+            position = len(out) - 1
+            while position >= 0 and out[position].isspace():
+                position -= 1
+            if position >= 0 and out[position] == ",":
+                repairs.add(TRAILING_COMMAS)
+                del out[position]
+            if stack:
+                stack.pop()
+            if not stack:
+                out.append(ch)
+                i += 1
+                break
+        elif ch == ",":
+            commas.append((len(out), len(stack)))
+
+        out.append(ch)
+        i += 1
+
+    if raw_result[i:].strip():
+        repairs.add(TRAILING_TEXT)
+
+    text = "".join(out)
+    if not stack:
+        try:
+            return i, (_loads(text), sorted(repairs)), ""
+        except _DECODE_ERRORS as e:
+            return i, None, str(e)
+
+    repairs.add(TRUNCATED)
+    try:
+        return i, (_loads(_close(text + ('"' if in_string else ""), stack)), sorted(repairs)), ""
+    except _DECODE_ERRORS:
+        pass
+
+    # Fall back to cutting the tail at the last complete member, reporting what was dropped
+    for position, depth in reversed(commas[-3:]):
+        try:
+            parsed = _loads(_close(text[:position], stack[:depth]))
+        except _DECODE_ERRORS:
+            continue
+        dropped = text[position + 1:].strip()
+        if len(dropped) > DROPPED_PREVIEW_CHARS:
+            dropped = dropped[:DROPPED_PREVIEW_CHARS] + "..."
+        return i, (parsed, sorted(repairs | {f"{DROPPED_MEMBER}={dropped}"})), ""
+
+    return i, None, "truncated response could not be repaired"
+
+
+def parse_and_validate_response(raw_result, validator_fn, agent_name, response_model=None):
+    """
+    Parses and validates the raw response from the agent.
+
+    Args:
+        raw_result (Union[str, BaseModel]): Raw response from the agent, or the model parsed by
+            agno when the agent runs with a native response schema.
+        validator_fn (callable): Function that validates the final parsed output (dict responses).
         agent_name (str): Name to use in logs.
+        response_model (Optional[Type[BaseModel]]): Model to validate into instead of `validator_fn`.
 
     Returns:
-        dict: Validated agent response.
+        Union[dict, BaseModel]: Validated agent response, typed when `response_model` is given.
 
     Raises:
-        Exception: If the response is invalid or cannot be parsed.
+        EmptyResponseError: If the response is empty.
+        MalformedResponseError: If the response cannot be parsed as JSON.
+        MissingParameterError: If the parsed response fails validation.
     """
-    if not raw_result:
+    with span("parse", agent=agent_name) as current:
+        return _parse_and_validate(raw_result, validator_fn, agent_name, response_model, current)
+
+
+def _parse_and_validate(raw_result, validator_fn, agent_name, response_model, current):
+    """`parse_and_validate_response` body; `current` is the enclosing parse span."""
+    # Native structured output: agno already parsed the response into a model
+    if isinstance(raw_result, BaseModel):
+        if response_model is not None:
+            return validate_response_model(raw_result, response_model, agent_name)
+        raw_result = raw_result.model_dump()
+        if validator_fn(raw_result):
+            return raw_result
+        raise MissingParameterError(detail=f"Incomplete data for {agent_name}.")
+
+    if not raw_result or not raw_result.strip():
         raise EmptyResponseError("Empty response received from the agent.")
 
-    cleaned = raw_result.strip()
+    if response_model is not None:
+        stripped = raw_result.strip()
+        # Fast path: validate bare JSON text straight into the model, without an intermediate dict
+        if stripped.startswith("{") and stripped.endswith("}"):
+            try:
+                return validate_response_model(stripped, response_model, agent_name)
+            except MalformedResponseError:
+                pass
 
-    if cleaned.startswith("```") and cleaned.endswith("```"):
-        cleaned = re.sub(r"^```(?:json)?", "", cleaned, flags=re.IGNORECASE).strip()
-        cleaned = re.sub(r"```$", "", cleaned).strip()
+    parsed, repairs = extract_json(raw_result)
+    if repairs:
+        current.set(repairs=",".join(repairs))
+        logging.warning("[%s] Repaired JSON response: %s", agent_name, ", ".join(repairs))
 
-    if not cleaned:
-        raise EmptyResponseError("Empty response received after cleaning.")
+    if not isinstance(parsed, dict):
+        raise MalformedResponseError(f"Expected a JSON object from {agent_name}.")
 
-    try:
-        parsed = json.loads(cleaned)
-    except json.JSONDecodeError as e:
-        raise Exception(f"Failed to parse JSON: {str(e)}")
+    if response_model is not None:
+        return validate_response_model(parsed, response_model, agent_name)
 
     if validator_fn(parsed):
         return parsed
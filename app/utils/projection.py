@@ -0,0 +1,217 @@
+# utils/projection.py
+
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from app.utils.logging import logging
+from app.utils.metrics import metrics
+
+# Rough characters-per-token ratio used to estimate token savings
+CHARS_PER_TOKEN = 4
+
+# Pre-filters applied before keeping the top-K options
+FLIGHT_PREFILTERS = {
+    "best": None,
+    "price": lambda option: (option.get("price_value") is None, option.get("price_value") or 0),
+    "duration": lambda option: (
+        option.get("duration_minutes") is None,
+        option.get("duration_minutes") or 0,
+    ),
+}
+
+HOTEL_PREFILTERS = {
+    "best": None,
+    "rating": lambda prop: -(prop.get("rating") or 0),
+    "price": lambda prop: (prop.get("price_value") is None, prop.get("price_value") or 0),
+}
+
+
+class ProjectionStats:
+    """
+    Thread-safe counters for bytes and estimated tokens saved by payload projection.
+
+    Only projections of freshly fetched upstream payloads are counted (see `project_flights`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(kind, {"calls": 0, "bytes_in": 0, "bytes_out": 0})
+            entry["calls"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return per-kind counters including bytes and estimated tokens saved.
+        """
+        with self._lock:
+            return {
+                kind: {
+                    **entry,
+                    "bytes_saved": entry["bytes_in"] - entry["bytes_out"],
+                    "tokens_saved": (entry["bytes_in"] - entry["bytes_out"]) // CHARS_PER_TOKEN,
+                }
+                for kind, entry in self._stats.items()
+            }
+
+
+projection_stats = ProjectionStats()
+
+
+def _payload_size(data: Any) -> int:
+    return len(json.dumps(data, separators=(",", ":"), default=str))
+
+
+def _record(kind: str, raw_size: Optional[int], projected: dict) -> None:
+    if raw_size is None or not metrics.enabled:
+        return
+
+    bytes_in, bytes_out = raw_size, _payload_size(projected)
+    projection_stats.record(kind, bytes_in, bytes_out)
+    logging.debug(
+        "[Projection] %s: %d -> %d bytes (~%d tokens saved)",
+        kind,
+        bytes_in,
+        bytes_out,
+        (bytes_in - bytes_out) // CHARS_PER_TOKEN,
+    )
+
+
+def format_duration(minutes: Optional[int]) -> Optional[str]:
+    """Format a duration in minutes as e.g. "7h 45m"."""
+    if minutes is None:
+        return None
+
+    hours, mins = divmod(int(minutes), 60)
+    return f"{hours}h {mins}m" if hours else f"{mins}m"
+
+
+def _select(options: List[dict], prefilters: dict, prefilter: str, top_k: Optional[int]) -> List[dict]:
+    key = prefilters.get(prefilter)
+    if key is not None:
+        options = sorted(options, key=key)
+    return options if top_k is None else options[:top_k]
+
+
+def project_flight_option(option: dict, currency: str = "USD") -> Optional[dict]:
+    """
+    Reduce a Google Flights option to the fields used by the flight prompt.
+
+    Args:
+        option (dict): One entry of `best_flights` / `other_flights`.
+        currency (str): Currency the prices are expressed in.
+
+    Returns:
+        Optional[dict]: The projected option, or None when it has no flight segments.
+    """
+    segments = option.get("flights") or []
+    if not segments:
+        return None
+
+    first, last = segments[0], segments[-1]
+    price = option.get("price")
+    duration = option.get("total_duration")
+
+    return {
+        "airline": first.get("airline"),
+        "airline_logo": option.get("airline_logo") or first.get("airline_logo"),
+        "travel_class": first.get("travel_class"),
+        "price": f"{currency} {price}" if price is not None else None,
+        "price_value": price,
+        "duration": format_duration(duration),
+        "duration_minutes": duration,
+        "departure": (first.get("departure_airport") or {}).get("name"),
+        "arrival": (last.get("arrival_airport") or {}).get("name"),
+        "departure_time": (first.get("departure_airport") or {}).get("time"),
+        "arrival_time": (last.get("arrival_airport") or {}).get("time"),
+        "layovers": len(option.get("layovers") or []),
+    }
+
+
+def project_flights(
+    data: dict, top_k: Optional[int] = None, prefilter: str = "best", raw_size: Optional[int] = None
+) -> dict:
+    """
+    Project a Google Flights response down to the fields the flight prompt extracts.
+
+    Args:
+        data (dict): Raw `google_flights` response.
+        top_k (Optional[int]): Number of options to keep after the pre-filter (None keeps all).
+        prefilter (str): Ordering applied before truncation: "best", "price" or "duration".
+        raw_size (Optional[int]): Size of the upstream payload in bytes, measured when it was
+            fetched. Savings are only recorded when given (and metrics are enabled).
+
+    Returns:
+        dict: `{"flights": [...], "source_link": ...}` (or the upstream error).
+    """
+    if data.get("error"):
+        return {"error": data["error"]}
+
+    currency = (data.get("search_parameters") or {}).get("currency", "USD")
+    options = [
+        projected
+        for option in (data.get("best_flights") or []) + (data.get("other_flights") or [])
+        if (projected := project_flight_option(option, currency)) is not None
+    ]
+
+    projected = {
+        "flights": _select(options, FLIGHT_PREFILTERS, prefilter, top_k),
+        "source_link": (data.get("search_metadata") or {}).get("google_flights_url"),
+    }
+    _record("google_flights", raw_size, projected)
+    return projected
+
+
+def project_hotel_property(prop: dict) -> dict:
+    """
+    Reduce a Google Hotels property to the fields of `HotelDetails`.
+
+    Args:
+        prop (dict): One entry of `properties`.
+
+    Returns:
+        dict: The projected property.
+    """
+    images = prop.get("images") or []
+    rate = prop.get("rate_per_night") or {}
+
+    return {
+        "name": prop.get("name"),
+        "image_url": (images[0].get("thumbnail") or images[0].get("original_image")) if images else None,
+        "rating": prop.get("overall_rating"),
+        "amenities": prop.get("amenities") or [],
+        "price_per_night": rate.get("lowest"),
+        "price_value": rate.get("extracted_lowest"),
+        "link": prop.get("link"),
+    }
+
+
+def project_hotels(
+    data: dict, top_k: Optional[int] = None, prefilter: str = "rating", raw_size: Optional[int] = None
+) -> dict:
+    """
+    Project a Google Hotels response down to the fields of `HotelDetails`.
+
+    Args:
+        data (dict): Raw `google_hotels` response.
+        top_k (Optional[int]): Number of properties to keep after the pre-filter (None keeps all).
+        prefilter (str): Ordering applied before truncation: "best", "rating" or "price".
+        raw_size (Optional[int]): Size of the upstream payload in bytes (see `project_flights`).
+
+    Returns:
+        dict: `{"properties": [...]}` (or the upstream error).
+    """
+    if data.get("error"):
+        return {"error": data["error"]}
+
+    properties = [
+        project_hotel_property(prop) for prop in data.get("properties") or [] if prop.get("name")
+    ]
+
+    projected = {"properties": _select(properties, HOTEL_PREFILTERS, prefilter, top_k)}
+    _record("google_hotels", raw_size, projected)
+    return projected
@@ -1,50 +1,238 @@
 # utils/request.py
 
-import json
-import re
+import asyncio
+import contextvars
+import copy
 import time
-from app.utils.logging import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Optional, Type
+from pydantic import BaseModel
+from app.agents.pool import AgentPool
+from app.core.config import settings
+from app.core.exceptions import ToolNotCalledError
+from app.prompts.reformat_prompt import build_reformat_prompt
+from app.utils.logging import logging, sample_verbose, truncate
+from app.utils.metrics import agent_attempt_duration, agent_attempts, record_run_usage
 from app.utils.parser import parse_and_validate_response
+from app.utils.retry import RetryPolicy, classify_failure, get_retry_budget, get_retry_policy
+from app.utils.tracing import span
 
-async def run_agent_with_retries(agent, prompt: str, validator_fn, agent_name: str, max_retries: int = 3, retry_delay: int = 2):
+# Per agent-type concurrency limits
+AGENT_CONCURRENCY_LIMITS = {
+    "flight": lambda: settings.FLIGHT_AGENT_CONCURRENCY,
+    "hotel": lambda: settings.HOTEL_AGENT_CONCURRENCY,
+    "itinerary": lambda: settings.ITINERARY_AGENT_CONCURRENCY,
+    "itinerary_chunk": lambda: settings.ITINERARY_CHUNK_AGENT_CONCURRENCY,
+}
+
+_agent_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+@lru_cache(maxsize=1)
+def get_agent_executor() -> ThreadPoolExecutor:
+    """
+    Shared, bounded thread pool used to run synchronous agent calls off the event loop.
+
+    Returns:
+        ThreadPoolExecutor: Executor sized by `AGENT_EXECUTOR_MAX_WORKERS`.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.AGENT_EXECUTOR_MAX_WORKERS,
+        thread_name_prefix="trekly-agent",
+    )
+
+
+def get_agent_semaphore(agent_type: Optional[str]) -> Optional[asyncio.Semaphore]:
+    """
+    Return the concurrency limiter for an agent type, creating it on first use.
+
+    Args:
+        agent_type (Optional[str]): One of "flight", "hotel" or "itinerary".
+
+    Returns:
+        Optional[asyncio.Semaphore]: The limiter, or None when the type is unknown.
+    """
+    if agent_type not in AGENT_CONCURRENCY_LIMITS:
+        return None
+
+    if agent_type not in _agent_semaphores:
+        _agent_semaphores[agent_type] = asyncio.Semaphore(AGENT_CONCURRENCY_LIMITS[agent_type]())
+
+    return _agent_semaphores[agent_type]
+
+
+async def run_agent(agent, prompt: str):
+    """
+    Run an agent without blocking the event loop.
+
+    Uses the agent's native `arun` when available (and `AGENT_RUN_MODE` is "auto"),
+    otherwise runs the synchronous `run` inside the shared bounded executor. The executor
+    call runs in a copy of the current context, so tool spans join the request's trace.
+
+    Args:
+        agent: Instantiated agent object.
+        prompt (str): Prompt message passed to the agent.
+
+    Returns:
+        The agent run response.
+    """
+    if settings.AGENT_RUN_MODE == "auto" and hasattr(agent, "arun"):
+        return await agent.arun(message=prompt)
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_agent_executor(), partial(context.run, agent.run, message=prompt)
+    )
+
+
+def _record_attempt(agent_name: str, kind: str, started: float, outcome: str) -> None:
+    """Record one agent run attempt (`kind` is "full" or "reformat") and its outcome."""
+    agent_attempts.inc(agent=agent_name, kind=kind, outcome=outcome)
+    agent_attempt_duration.observe(time.perf_counter() - started, agent=agent_name, kind=kind)
+
+
+async def _run_limited(agent, prompt: str, semaphore: Optional[asyncio.Semaphore]):
+    """Run an agent under the optional per-type concurrency limit."""
+    if semaphore is None:
+        return await run_agent(agent, prompt)
+
+    async with semaphore:
+        return await run_agent(agent, prompt)
+
+
+async def run_agent_with_retries(
+    agent,
+    prompt: str,
+    validator_fn,
+    agent_name: str,
+    max_retries: Optional[int] = None,
+    retry_delay: Optional[float] = None,
+    agent_type: Optional[str] = None,
+    require_tools: bool = True,
+    retry_policy: Optional[RetryPolicy] = None,
+    response_model: Optional[Type[BaseModel]] = None,
+):
     """
     Generic runner for invoking LLM agents with retries and response validation for flight and hotel recommendation.
 
+    Failures are classified (see `classify_failure`). Malformed JSON and validation gaps are
+    first recovered with a reformat prompt that reuses the previous answer without re-running
+    tools; other failures are retried with exponential backoff and jitter, as long as the
+    process-wide retry budget allows it.
+
     Args:
-        agent: Instantiated agent object (e.g., flight_agent or hotel_agent).
+        agent: Instantiated agent object, or an `AgentPool` to check one out from for the whole run.
         prompt (str): Prompt message passed to the agent.
         validator_fn (callable): Function that validates the final parsed output.
         agent_name (str): Name to use in logs.
-        max_retries (int): Number of retry attempts.
-        retry_delay (int): Delay between retries in seconds.
+        max_retries (Optional[int]): Number of attempts (defaults to the policy's `max_attempts`).
+        retry_delay (Optional[float]): Base backoff delay in seconds (defaults to the policy's `base_delay`).
+        agent_type (Optional[str]): Agent type used to apply the per-type concurrency limit.
+        require_tools (bool): Reject responses where the agent did not call a tool.
+        retry_policy (Optional[RetryPolicy]): Policy to use instead of the configured default.
+        response_model (Optional[Type[BaseModel]]): Validate into this model instead of using `validator_fn`.
 
     Returns:
-        dict: Validated agent response.
+        Union[dict, BaseModel]: Validated agent response, typed when `response_model` is given.
 
     Raises:
         Exception: If the agent fails after retries or doesn't return valid data.
     """
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            logging.info(f"[{agent_name}] Attempt {attempt} running agent...")
-            result = agent.run(message=prompt)
+    if isinstance(agent, AgentPool):
+        async with agent.checkout() as pooled_agent:
+            return await run_agent_with_retries(
+                agent=pooled_agent,
+                prompt=prompt,
+                validator_fn=validator_fn,
+                agent_name=agent_name,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                agent_type=agent_type,
+                require_tools=require_tools,
+                retry_policy=retry_policy,
+                response_model=response_model,
+            )
+
+    policy = retry_policy or get_retry_policy()
+    max_attempts = max_retries if max_retries is not None else policy.max_attempts
+    if retry_delay is not None:
+        policy = copy.copy(policy)
+        policy.base_delay = retry_delay
+
+    budget = get_retry_budget()
+    budget.record_request()
+    semaphore = get_agent_semaphore(agent_type)
+    last_error: Optional[Exception] = None
+
+    for attempt in range(1, max_attempts + 1):
+        raw_result = None
+        started = time.perf_counter()
+        with span("agent.attempt", agent=agent_name, attempt=attempt, kind="full") as current:
+            try:
+                verbose = sample_verbose()
+                if verbose:
+                    logging.info("[%s] Attempt %d running agent...", agent_name, attempt)
+
+                result = await _run_limited(agent, prompt, semaphore)
+                record_run_usage(agent_name, result)
+
+                if require_tools and not result.tools:
+                    raise ToolNotCalledError()
+
+                raw_result = result.content
+                if verbose:
+                    logging.info("[%s] Raw Result: \n%s", agent_name, truncate(raw_result))
+                logging.debug("[%s] Used tools: %s", agent_name, result.tools)
+
+                parsed_response = parse_and_validate_response(
+                    raw_result, validator_fn, agent_name, response_model
+                )
+
+                _record_attempt(agent_name, "full", started, "success")
+                return parsed_response
 
-            if not result.tools:
-                raise Exception("SerpApi tool was not used. Agent must call the tool.")
+            except Exception as e:
+                last_error = e
+                failure = classify_failure(e)
+                current.record_error(e, outcome=failure.value)
+                _record_attempt(agent_name, "full", started, failure.value)
+                logging.error("[%s] Error on attempt %d (%s): %s", agent_name, attempt, failure.value, e)
 
-            raw_result = result.content
-            logging.info(f"[{agent_name}] Raw Result: \n{raw_result}")
-            logging.debug(f"[{agent_name}] Used tools: {result.tools}")
+        if raw_result and policy.should_reformat(failure):
+            started = time.perf_counter()
+            with span("agent.attempt", agent=agent_name, attempt=attempt, kind="reformat") as current:
+                try:
+                    logging.info("[%s] Attempt %d asking agent to reformat its answer...", agent_name, attempt)
+                    reformat_prompt = build_reformat_prompt(
+                        prompt, str(raw_result), str(getattr(last_error, "detail", last_error))
+                    )
+                    result = await _run_limited(agent, reformat_prompt, semaphore)
+                    record_run_usage(agent_name, result)
+                    parsed_response = parse_and_validate_response(
+                        result.content, validator_fn, agent_name, response_model
+                    )
+                    _record_attempt(agent_name, "reformat", started, "success")
+                    return parsed_response
+                except Exception as e:
+                    # The retry decision and backoff below follow the latest failure
+                    last_error = e
+                    failure = classify_failure(e)
+                    current.record_error(e, outcome=failure.value)
+                    _record_attempt(agent_name, "reformat", started, failure.value)
+                    logging.error("[%s] Reformat on attempt %d failed: %s", agent_name, attempt, e)
 
-            parsed_response = parse_and_validate_response(raw_result, validator_fn, agent_name)
+        if attempt == max_attempts or not policy.should_retry(failure):
+            break
 
-            return parsed_response
+        if not budget.try_spend():
+            logging.warning("[%s] Retry budget exhausted; giving up after attempt %d.", agent_name, attempt)
+            break
 
-        except Exception as e:
-            logging.error(f"[{agent_name}] Error on attempt {attempt}: {str(e)}")
-            time.sleep(retry_delay)
+        await asyncio.sleep(policy.backoff(attempt, failure))
 
     raise Exception(
-        f"[{agent_name}] Failed to get valid recommendation after {max_retries} attempts."
+        f"[{agent_name}] Failed to get valid recommendation after {attempt} attempts: {last_error}"
     )
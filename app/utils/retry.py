@@ -0,0 +1,225 @@
+# utils/retry.py
+
+import random
+import re
+import threading
+import time
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional
+from app.core.config import settings
+from app.core.exceptions import (
+    BaseAppException,
+    EmptyResponseError,
+    MalformedResponseError,
+    MissingParameterError,
+    SerpApiServiceError,
+    ToolNotCalledError,
+)
+
+# Message heuristics, only applied to exceptions raised by the model provider or the HTTP layer
+UPSTREAM_STATUS_PATTERN = re.compile(r"\b(429|5\d\d)\b")
+RATE_LIMIT_MARKERS = ("RESOURCE_EXHAUSTED", "rate limit", "quota")
+UNAVAILABLE_MARKERS = ("UNAVAILABLE", "DEADLINE_EXCEEDED", "timed out", "timeout")
+
+# Provider / HTTP client exceptions, matched by module or class name so that the SDKs
+# don't have to be imported here (agno wraps every Gemini failure in `ModelProviderError`)
+UPSTREAM_ERROR_MODULES = ("google.", "httpx", "httpcore", "serpapi", "requests", "urllib3", "grpc")
+UPSTREAM_ERROR_TYPES = ("ModelProviderError",)
+
+
+class FailureClass(str, Enum):
+    """Classes of agent run failures, each with its own retry treatment."""
+    UPSTREAM_RATE_LIMIT = "upstream_rate_limit"
+    UPSTREAM_ERROR = "upstream_error"
+    TOOL_NOT_CALLED = "tool_not_called"
+    MALFORMED_JSON = "malformed_json"
+    VALIDATION_GAP = "validation_gap"
+    EMPTY_RESPONSE = "empty_response"
+    UNKNOWN = "unknown"
+
+
+def _upstream_status(error: Exception) -> Optional[int]:
+    # Our own exceptions carry the status returned to *our* client, not the upstream one
+    if isinstance(error, BaseAppException):
+        return None
+
+    for attribute in ("status_code", "code", "status"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _is_upstream_error(error: Exception) -> bool:
+    if isinstance(error, (SerpApiServiceError, TimeoutError, ConnectionError)):
+        return True
+
+    return any(
+        cls.__module__.startswith(UPSTREAM_ERROR_MODULES) or cls.__name__ in UPSTREAM_ERROR_TYPES
+        for cls in type(error).__mro__
+    )
+
+
+def classify_failure(error: Exception) -> FailureClass:
+    """
+    Classify an agent run failure.
+
+    Args:
+        error (Exception): The exception raised during the attempt.
+
+    Returns:
+        FailureClass: The failure class.
+    """
+    if isinstance(error, ToolNotCalledError):
+        return FailureClass.TOOL_NOT_CALLED
+    if isinstance(error, MalformedResponseError):
+        return FailureClass.MALFORMED_JSON
+    if isinstance(error, MissingParameterError):
+        return FailureClass.VALIDATION_GAP
+    if isinstance(error, EmptyResponseError):
+        return FailureClass.EMPTY_RESPONSE
+
+    status = _upstream_status(error)
+    # Other exceptions (e.g. a bug mentioning "timeout" or a port number) are never read
+    message = str(getattr(error, "detail", error)).lower() if _is_upstream_error(error) else ""
+    if status is None:
+        match = UPSTREAM_STATUS_PATTERN.search(message)
+        status = int(match.group(1)) if match else None
+
+    if status == 429 or any(marker.lower() in message for marker in RATE_LIMIT_MARKERS):
+        return FailureClass.UPSTREAM_RATE_LIMIT
+    if (status is not None and status >= 500) or any(marker.lower() in message for marker in UNAVAILABLE_MARKERS):
+        return FailureClass.UPSTREAM_ERROR
+
+    return FailureClass.UNKNOWN
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter, per failure class.
+
+    Malformed JSON and validation gaps are first recovered by asking the model to
+    reformat its last answer (no tool re-run); a full retry happens only if that fails.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        rate_limit_multiplier: float = 2.0,
+        retryable: Optional[FrozenSet[FailureClass]] = None,
+        reformat: Optional[FrozenSet[FailureClass]] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.rate_limit_multiplier = rate_limit_multiplier
+        self.retryable = retryable if retryable is not None else frozenset(FailureClass)
+        self.reformat = reformat if reformat is not None else frozenset(
+            {FailureClass.MALFORMED_JSON, FailureClass.VALIDATION_GAP}
+        )
+
+    def should_retry(self, failure: FailureClass) -> bool:
+        return failure in self.retryable
+
+    def should_reformat(self, failure: FailureClass) -> bool:
+        return failure in self.reformat
+
+    def backoff(self, attempt: int, failure: FailureClass) -> float:
+        """
+        Delay before the next attempt ("full jitter" when enabled).
+
+        Args:
+            attempt (int): The attempt that just failed (1-based).
+            failure (FailureClass): Why it failed.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if failure == FailureClass.UPSTREAM_RATE_LIMIT:
+            delay = min(self.max_delay, delay * self.rate_limit_multiplier)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class RetryBudget:
+    """
+    Process-wide retry budget (token bucket).
+
+    Each first attempt deposits `ratio` tokens and each retry spends one, so retries
+    stay below roughly `ratio` of the request rate. A small `min_per_second` allowance
+    keeps low-traffic processes able to retry. When the bucket is empty, retries are
+    skipped instead of amplifying load during an upstream brownout.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_balance: float = 100.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.spent = 0
+        self.rejected = 0
+
+    def _refill(self, now: float) -> None:
+        self._balance = min(
+            self.max_balance, self._balance + (now - self._refilled_at) * self.min_per_second
+        )
+        self._refilled_at = now
+
+    def record_request(self) -> None:
+        """Deposit tokens for a new (first-attempt) request."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry token; return False when the budget is exhausted."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                self.spent += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "balance": round(self._balance, 2),
+                "spent": self.spent,
+                "rejected": self.rejected,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_retry_policy() -> RetryPolicy:
+    """Default retry policy built from `Settings`."""
+    return RetryPolicy(
+        max_attempts=settings.RETRY_MAX_ATTEMPTS,
+        base_delay=settings.RETRY_BASE_DELAY,
+        max_delay=settings.RETRY_MAX_DELAY,
+        jitter=settings.RETRY_JITTER,
+        reformat=None if settings.RETRY_REFORMAT_ENABLED else frozenset(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_retry_budget() -> RetryBudget:
+    """Process-wide retry budget built from `Settings`."""
+    return RetryBudget(
+        ratio=settings.RETRY_BUDGET_RATIO,
+        min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND,
+        max_balance=settings.RETRY_BUDGET_MAX_BALANCE,
+    )
@@ -0,0 +1,106 @@
+# utils/scoring.py
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.utils.validator import REQUIRED_FLIGHT_FIELDS
+
+# Default flight ranking weights (normalized at scoring time)
+DEFAULT_FLIGHT_WEIGHTS = {
+    "comfort": 0.2,
+    "layovers": 0.25,
+    "duration": 0.2,
+    "timing": 0.15,
+    "price": 0.2,
+}
+
+TRAVEL_CLASS_COMFORT = {
+    "first": 1.0,
+    "business": 0.8,
+    "premium economy": 0.5,
+    "economy": 0.2,
+}
+
+# Departures / arrivals inside this window (hours) are considered convenient
+CONVENIENT_HOURS = (7, 21)
+INCONVENIENT_TIME_SCORE = 0.3
+
+
+def _parse_hour(value: Optional[str]) -> Optional[int]:
+    """Extract the hour from a SerpAPI time such as "2025-07-01 10:30" or "10:30 AM"."""
+    if not value:
+        return None
+
+    for fmt in ("%Y-%m-%d %H:%M", "%H:%M", "%I:%M %p"):
+        try:
+            return datetime.strptime(value.strip(), fmt).hour
+        except ValueError:
+            continue
+    return None
+
+
+def _timing_score(option: dict) -> float:
+    start, end = CONVENIENT_HOURS
+    hours = [_parse_hour(option.get("departure_time")), _parse_hour(option.get("arrival_time"))]
+    scores = [
+        1.0 if hour is None or start <= hour <= end else INCONVENIENT_TIME_SCORE
+        for hour in hours
+    ]
+    return sum(scores) / len(scores)
+
+
+def _inverse_normalized(value: Optional[float], low: float, high: float) -> float:
+    """Map `value` to [0, 1] where the lowest value scores 1."""
+    if value is None:
+        return 0.0
+    if high <= low:
+        return 1.0
+    return 1.0 - (value - low) / (high - low)
+
+
+def score_flight_options(options: List[dict], weights: Optional[Dict[str, float]] = None) -> List[dict]:
+    """
+    Score projected flight options deterministically and sort them best first.
+
+    Criteria mirror `build_flight_prompt`: comfort (travel class), layovers, overall duration,
+    departure/arrival timing and price.
+
+    Args:
+        options (List[dict]): Options produced by `project_flight_option`.
+        weights (Optional[Dict[str, float]]): Weight per criterion (see `DEFAULT_FLIGHT_WEIGHTS`).
+
+    Returns:
+        List[dict]: Copies of the options with a `score` field, sorted by descending score.
+    """
+    weights = {**DEFAULT_FLIGHT_WEIGHTS, **(weights or {})}
+    total_weight = sum(weights.values()) or 1.0
+
+    prices = [o["price_value"] for o in options if o.get("price_value") is not None]
+    durations = [o["duration_minutes"] for o in options if o.get("duration_minutes") is not None]
+    price_range = (min(prices), max(prices)) if prices else (0, 0)
+    duration_range = (min(durations), max(durations)) if durations else (0, 0)
+
+    scored = []
+    for option in options:
+        criteria = {
+            "comfort": TRAVEL_CLASS_COMFORT.get((option.get("travel_class") or "economy").lower(), 0.2),
+            "layovers": 1.0 / (1 + (option.get("layovers") or 0)),
+            "duration": _inverse_normalized(option.get("duration_minutes"), *duration_range),
+            "timing": _timing_score(option),
+            "price": _inverse_normalized(option.get("price_value"), *price_range),
+        }
+        score = sum(weights.get(name, 0.0) * value for name, value in criteria.items()) / total_weight
+        scored.append({**option, "score": round(score, 4)})
+
+    # Stable sort keeps upstream ("best flights" first) order on ties
+    return sorted(scored, key=lambda option: -option["score"])
+
+
+def has_required_flight_fields(option: dict) -> bool:
+    """
+    Return True when an option carries every field `check_flight_recommendation` requires,
+    plus the departure/arrival times `FlightDetails` needs.
+    """
+    return all(
+        option.get(field)
+        for field in (*REQUIRED_FLIGHT_FIELDS, "departure_time", "arrival_time")
+    )
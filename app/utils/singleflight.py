@@ -0,0 +1,106 @@
+# utils/singleflight.py
+
+import asyncio
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+from app.core.config import settings
+
+
+class _Call:
+    """An in-flight execution shared by every caller with the same key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one shared execution.
+
+    Every caller awaits the same task and receives its result or exception. A caller
+    being cancelled does not cancel the shared execution unless it was the last one
+    waiting for it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` unless an execution for `key` is already in flight.
+
+        Args:
+            key (Hashable): Normalized call key.
+            fn (Callable[..., Awaitable[Any]]): Coroutine function to execute.
+
+        Returns:
+            Any: The shared result.
+        """
+        self.calls += 1
+        call = self._calls.get(key)
+
+        if call is None:
+            call = _Call(asyncio.create_task(fn(*args, **kwargs)))
+            self._calls[key] = call
+            self.executions += 1
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Last waiter went away (cancelled); nobody needs the result anymore
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+        }
+
+
+single_flight_groups: List[SingleFlight] = []
+
+
+def single_flight(name: str):
+    """
+    Decorator coalescing concurrent calls of an async service taking a pydantic request.
+
+    Calls are keyed on the request's JSON dump; coalescing is skipped when
+    `SINGLE_FLIGHT_ENABLED` is False.
+
+    Args:
+        name (str): Group name reported in statistics.
+    """
+    group = SingleFlight(name)
+    single_flight_groups.append(group)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(request):
+            if not settings.SINGLE_FLIGHT_ENABLED:
+                return await func(request)
+            return await group.do(request.model_dump_json(), func, request)
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
@@ -0,0 +1,367 @@
+# utils/tracing.py
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+TRACE_HEADER = "X-Trace-Id"
+# Accepted incoming trace ids (e.g. from a gateway); anything else is ignored
+_TRACE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.\-]{8,64}$")
+_MAX_ATTRIBUTE_LENGTH = 200
+
+
+class Span:
+    """A timed operation inside a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "duration", "status", "error", "attributes")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.attributes = attributes
+
+    def set(self, **attributes) -> None:
+        """Add or overwrite span attributes."""
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException, **attributes) -> None:
+        """Mark the span as failed by an error that is handled (and not re-raised) inside it."""
+        self.status = "cancelled" if isinstance(error, asyncio.CancelledError) else "error"
+        self.error = _attribute(getattr(error, "detail", None) or str(error) or type(error).__name__)
+        self.attributes.update(attributes)
+
+    def as_dict(self) -> dict:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - self.trace.start) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": {key: _attribute(value) for key, value in self.attributes.items()},
+        }
+
+
+class _NoopSpan:
+    """Span returned outside of a trace; attribute updates are discarded."""
+
+    span_id = None
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def record_error(self, error: BaseException, **attributes) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """
+    Spans recorded for one request.
+
+    Spans may be opened from worker threads (tool calls inside synchronous agent runs), so
+    appends are guarded by a lock.
+    """
+
+    def __init__(self, trace_id: str, name: str, parent_trace_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.parent_trace_id = parent_trace_id
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return {
+            "trace_id": self.trace_id,
+            "parent_trace_id": self.parent_trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "status": self.status,
+            "spans": [span.as_dict() for span in spans],
+        }
+
+
+def _attribute(value: Any) -> Any:
+    """Keep span attributes JSON-friendly and short."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    return text if len(text) <= _MAX_ATTRIBUTE_LENGTH else text[:_MAX_ATTRIBUTE_LENGTH] + "..."
+
+
+class TraceExporter:
+    """
+    Keeps the most recent finished traces in an in-memory ring buffer and optionally appends
+    each one as a JSON line to a file.
+
+    File export never blocks the caller (usually the event loop): finished traces are put on
+    a bounded queue, dropped when it is full, and serialized and written by a writer thread.
+    """
+
+    def __init__(self, buffer_size: int = 200, file_path: Optional[str] = None, queue_size: int = 1000):
+        self.buffer_size = max(buffer_size, 0)
+        self.file_path = file_path
+        self.dropped = 0
+        self._traces: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+
+        if file_path:
+            self._pending = queue.Queue(maxsize=queue_size)
+            self._writer = threading.Thread(target=self._write, name="trekly-trace-export", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def export(self, trace: Trace) -> None:
+        record = trace.as_dict()
+
+        if self.buffer_size:
+            with self._lock:
+                self._traces[trace.trace_id] = record
+                self._traces.move_to_end(trace.trace_id)
+                while len(self._traces) > self.buffer_size:
+                    self._traces.popitem(last=False)
+
+        if self._pending is not None:
+            try:
+                self._pending.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def _write(self) -> None:
+        """Writer thread: append queued traces to the file, a batch at a time, until `close`."""
+        while True:
+            records = [self._pending.get()]
+            while len(records) < 100:
+                try:
+                    records.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [json.dumps(record, default=str) for record in records if record is not None]
+            if lines:
+                try:
+                    with open(self.file_path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                except OSError as e:
+                    logging.warning("[Tracing] Failed to export %s traces: %s", len(lines), e)
+
+            if None in records:
+                return
+
+    def close(self) -> None:
+        """Flush queued traces to the file and stop the writer thread."""
+        if self._writer is not None and self._writer.is_alive():
+            self._pending.put(None)
+            self._writer.join(timeout=5.0)
+
+    def get(self, trace_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._traces.get(trace_id)
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        """Summaries (without spans) of the most recent traces, newest first."""
+        with self._lock:
+            records = list(self._traces.values())[-limit:]
+        return [
+            {key: value for key, value in record.items() if key != "spans"} | {"spans": len(record["spans"])}
+            for record in reversed(records)
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_trace_exporter() -> Optional[TraceExporter]:
+    """
+    Build the trace exporter.
+
+    Returns:
+        Optional[TraceExporter]: The exporter, or None when `TRACE_EXPORT` is "none".
+    """
+    if settings.TRACE_EXPORT == "none":
+        return None
+
+    return TraceExporter(
+        buffer_size=settings.TRACE_BUFFER_SIZE,
+        file_path=settings.TRACE_FILE_PATH if settings.TRACE_EXPORT == "file" else None,
+    )
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trekly_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("trekly_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the running request, if any."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def new_trace_id(parent_trace_id: Optional[str] = None) -> str:
+    """
+    Generate a trace id, derived from `parent_trace_id` when given.
+
+    Child ids keep the parent as a prefix for correlation but are unique, so a client
+    reusing its incoming id never overwrites an earlier trace in the exporter.
+    """
+    trace_id = uuid.uuid4().hex
+    return f"{parent_trace_id}.{trace_id[:12]}" if parent_trace_id else trace_id
+
+
+@contextmanager
+def start_trace(
+    name: str, trace_id: Optional[str] = None, parent_trace_id: Optional[str] = None
+) -> Iterator[Optional[Trace]]:
+    """
+    Open a trace for the current context; spans opened below it are attached to it.
+
+    The finished trace is handed to the exporter. Yields None when `TRACING_ENABLED` is False.
+
+    Args:
+        name (str): Trace name (e.g. "POST /v1/plan-trip").
+        trace_id (Optional[str]): Trace id to use instead of a generated one.
+        parent_trace_id (Optional[str]): Id of the caller's trace (e.g. an incoming `X-Trace-Id`).
+    """
+    if not settings.TRACING_ENABLED:
+        yield None
+        return
+
+    trace = Trace(trace_id or new_trace_id(parent_trace_id), name, parent_trace_id)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    except BaseException:
+        trace.status = "error"
+        raise
+    finally:
+        trace.duration = time.perf_counter() - trace.start
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        exporter = get_trace_exporter()
+        if exporter is not None:
+            exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Any]:
+    """
+    Open a span nested under the current one.
+
+    Works in sync and async code alike; outside of a trace it only costs a context variable
+    lookup and yields a no-op span.
+
+    Args:
+        name (str): Span name (e.g. "stage", "agent.attempt", "tool.serpapi", "parse").
+        **attributes: Span attributes.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    current = Span(trace, name, parent.span_id if parent is not None else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_error(e)
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+        trace.add(current)
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Adds the current `trace_id` to log records ("-" outside of a trace).
+
+    A trace id set earlier (e.g. before the record was queued) is kept.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "trace_id", None) is None:
+            record.trace_id = current_trace_id() or "-"
+        return True
+
+
+class TraceMiddleware:
+    """
+    ASGI middleware opening one trace per planning request: `POST` requests under `/v1/`.
+
+    Job polling, cache statistics and the trace debug endpoints are all `GET` requests and
+    are not traced, so they cannot evict planning traces from the exporter's buffer.
+
+    A well-formed incoming `X-Trace-Id` header becomes the parent of a fresh child trace id
+    (see `new_trace_id`), which is returned in the response `X-Trace-Id` header. Being a plain ASGI middleware, the trace stays open
+    while streaming responses are sent.
+    """
+
+    def __init__(self, app, path_prefix: str = "/v1/", methods: Tuple[str, ...] = ("POST",)):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.methods = methods
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.TRACING_ENABLED
+            or scope["method"] not in self.methods
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for key, value in scope.get("headers") or []:
+            if key == b"x-trace-id":
+                incoming = value.decode("latin-1")
+                break
+
+        parent_trace_id = incoming if incoming and _TRACE_ID_PATTERN.match(incoming) else None
+        trace_id = new_trace_id(parent_trace_id)
+
+        async def send_with_trace_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                headers.append((TRACE_HEADER.lower().encode("latin-1"), trace_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with start_trace(f"{scope['method']} {scope['path']}", trace_id=trace_id, parent_trace_id=parent_trace_id):
+            await self.app(scope, receive, send_with_trace_id)
@@ -0,0 +1,223 @@
+# utils/trip_cache.py
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from pydantic import BaseModel
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.logging import logging
+
+
+# Request flags that change how a response is produced, not what it contains
+TRIP_CACHE_KEY_EXCLUDE = {"bypass_cache": True, "itineraries": {"bypass_cache"}}
+
+
+def trip_cache_key(request: BaseModel) -> str:
+    """
+    Build the trip cache key from a canonical dump of the (already auto-filled) request.
+
+    Flags in `TRIP_CACHE_KEY_EXCLUDE` are left out, so a `bypass_cache` run refreshes the
+    entry that regular requests read.
+
+    Args:
+        request (BaseModel): The resolved trip plan request.
+
+    Returns:
+        str: SHA-256 hex digest of the canonical request JSON.
+    """
+    canonical = json.dumps(request.model_dump(exclude=TRIP_CACHE_KEY_EXCLUDE), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TripCacheBackend:
+    """
+    Interface for whole-trip response caches.
+
+    Payloads are serialized JSON strings. `get` returns `(payload, age_in_seconds)`.
+    Async wrappers default to the synchronous methods; blocking backends override them.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        raise NotImplementedError
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def aget(self, key: str) -> Optional[Tuple[str, float]]:
+        return self.get(key)
+
+    async def aset(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        self.set(key, payload, ttl)
+
+    def _count(self, entry) -> None:
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.__class__.__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InMemoryTripCache(TripCacheBackend):
+    """
+    Per-process trip cache backed by `TTLCache`.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__()
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=ttl)
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        entry = self._cache.get_entry(key)
+        self._count(entry)
+        return entry
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, payload, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        cache_stats = self._cache.stats()
+        return {
+            **super().stats(),
+            "size": cache_stats["size"],
+            "max_entries": cache_stats["max_entries"],
+            "evictions": cache_stats["evictions"],
+        }
+
+
+class SQLiteTripCache(TripCacheBackend):
+    """
+    SQLite-backed trip cache shared by every worker process using the same file.
+
+    Entries expire after their TTL and the least recently used entries are evicted
+    once `max_entries` is exceeded.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trip_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS trip_cache_accessed_at ON trip_cache (accessed_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, in WAL mode for concurrent readers across workers."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        now = time.time()
+
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT payload, stored_at FROM trip_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE trip_cache SET accessed_at = ? WHERE key = ?", (now, key))
+
+        entry = None if row is None else (row[0], now - row[1])
+        self._count(entry)
+        return entry
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO trip_cache VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, expires_at, now),
+            )
+            conn.execute("DELETE FROM trip_cache WHERE expires_at <= ?", (now,))
+            evicted = conn.execute(
+                """
+                DELETE FROM trip_cache WHERE key IN (
+                    SELECT key FROM trip_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            ).rowcount
+            self.evictions += max(evicted, 0)
+
+    async def aget(self, key: str) -> Optional[Tuple[str, float]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, payload: str, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self.set, key, payload, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connection() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM trip_cache").fetchone()[0]
+        return {
+            **super().stats(),
+            "size": size,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_trip_cache() -> Optional[TripCacheBackend]:
+    """
+    Build the configured trip cache backend.
+
+    Returns:
+        Optional[TripCacheBackend]: The backend, or None when `TRIP_CACHE_BACKEND` is "none".
+    """
+    backend = settings.TRIP_CACHE_BACKEND
+
+    if backend == "memory":
+        return InMemoryTripCache(
+            max_entries=settings.TRIP_CACHE_MAX_ENTRIES, ttl=settings.TRIP_CACHE_TTL
+        )
+
+    if backend == "sqlite":
+        return SQLiteTripCache(
+            path=settings.TRIP_CACHE_SQLITE_PATH,
+            max_entries=settings.TRIP_CACHE_MAX_ENTRIES,
+            ttl=settings.TRIP_CACHE_TTL,
+        )
+
+    if backend != "none":
+        logging.warning("Unknown TRIP_CACHE_BACKEND `%s`; trip cache disabled.", backend)
+    return None
@@ -1,7 +1,12 @@
 # utils/validator.py
 
-from typing import List
-from app.core.exceptions import MissingParameterError
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Type, TypeVar, Union
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from app.core.exceptions import MalformedResponseError, ResponseValidationError
+from app.models.schemas import FlightRecommendation, HotelRecommendation, ItineraryRecommendation
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
 # Required fields
 REQUIRED_FLIGHT_FIELDS = [
@@ -15,57 +20,101 @@ REQUIRED_FLIGHT_FIELDS = [
 
 REQUIRED_HOTEL_FIELDS = ["name", "image_url", "rating", "amenities", "price_per_night"]
 
+REQUIRED_RECOMMENDATION_TEXT_FIELDS = ["recommendation", "value_explanation"]
+
 REQUIRED_ITINERARY_FIELDS =[
     "destination", "num_days", "transport_tips", "daily_plan", "check_in_date","check_out_date"
 ]
 
-def validate_required_fields(
-    data: dict, parent_key: str, required_fields: List[str]
-) -> bool:
-    """
-    Generic validator for checking required fields under a specific parent key.
 
-    Args:
-        data (dict): The data to validate.
-        parent_key (str): Key where target fields are nested.
-        required_fields (List[str]): List of required field names.
+@lru_cache(maxsize=None)
+def get_type_adapter(model: Type[ModelT]) -> TypeAdapter:
+    """Return the (compiled once, cached) `TypeAdapter` for a response model."""
+    return TypeAdapter(model)
 
-    Returns:
-        bool: True if all required fields are present and non-empty, False otherwise.
-    """
-    try:
-        section = data.get(parent_key, {})
-        return all(section.get(field) for field in required_fields)
-    except Exception as e:
-        raise MissingParameterError(detail=f"Validation error: {str(e)}")
 
+def _error_path(loc) -> str:
+    return ".".join(str(part) for part in loc) or "<root>"
 
-def validate_flight_data(data: dict) -> bool:
-    """Validate flight response."""
-    return validate_required_fields(data, "flight_details", REQUIRED_FLIGHT_FIELDS)
 
+def _missing_fields(section: BaseModel, parent_key: str, required_fields: List[str]) -> List[str]:
+    """Paths of required fields that are present in the model but empty."""
+    return [f"{parent_key}.{field}" for field in required_fields if not getattr(section, field, None)]
 
-def validate_hotel_data(data: dict) -> bool:
-    """Validate hotel response."""
-    return validate_required_fields(data, "hotel_details", REQUIRED_HOTEL_FIELDS)
 
-def validate_itinerary_data(data: dict) -> bool:
-    """Validate itinerary response."""
+def check_flight_recommendation(result: FlightRecommendation) -> List[str]:
+    """Completeness check for a flight recommendation."""
+    return _missing_fields(result.flight_details, "flight_details", REQUIRED_FLIGHT_FIELDS)
 
-    try:
-        # Ensure the main itinerary_details section is present
-        if not validate_required_fields(data, "itinerary_details", REQUIRED_ITINERARY_FIELDS):
-            return False
 
-        # Get the itinerary details section
-        itinerary = data.get("itinerary_details", {})
+def check_hotel_recommendation(result: HotelRecommendation) -> List[str]:
+    """Completeness check for a hotel recommendation."""
+    return _missing_fields(result.hotel_details, "hotel_details", REQUIRED_HOTEL_FIELDS)
+
+
+def check_itinerary_recommendation(result: ItineraryRecommendation) -> List[str]:
+    """Completeness check for an itinerary recommendation, including every day's plan."""
+    itinerary = result.itinerary_details
+    missing = _missing_fields(itinerary, "itinerary_details", REQUIRED_ITINERARY_FIELDS)
+
+    for index, day in enumerate(itinerary.daily_plan):
+        if not day.activities:
+            missing.append(f"itinerary_details.daily_plan.{index}.activities")
+
+    return missing
 
-        # Check if daily_plan is a list and not empty
-        for day in itinerary.get("daily_plan", []):
-            if not day.get("activities") or not day.get("restaurant"):
-                return False
 
-        return True
+# Response model -> completeness check run after schema validation
+RESPONSE_CHECKS: Dict[type, Callable[[Any], List[str]]] = {
+    FlightRecommendation: check_flight_recommendation,
+    HotelRecommendation: check_hotel_recommendation,
+    ItineraryRecommendation: check_itinerary_recommendation,
+}
 
-    except Exception as e:
-        raise MissingParameterError(detail=f"Validation error: {str(e)}")
+
+def validate_response_model(data: Union[str, bytes, dict, BaseModel], model: Type[ModelT], agent_name: str) -> ModelT:
+    """
+    Validate agent output straight into a response model, once.
+
+    JSON text is validated by the compiled validator without building an intermediate dict.
+
+    Args:
+        data (Union[str, bytes, dict, BaseModel]): Raw JSON text, parsed data or a parsed model.
+        model (Type[ModelT]): Response model, e.g. `FlightRecommendation`.
+        agent_name (str): Name to use in error messages.
+
+    Returns:
+        ModelT: The validated model.
+
+    Raises:
+        MalformedResponseError: If `data` is not valid JSON text.
+        ResponseValidationError: With field-level error paths (e.g. `flight_details.price`).
+    """
+    adapter = get_type_adapter(model)
+
+    try:
+        if isinstance(data, (str, bytes)):
+            result = adapter.validate_json(data)
+        else:
+            result = adapter.validate_python(data)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise MalformedResponseError(f"Failed to parse JSON: {e.errors()[0]['msg']}")
+        raise ResponseValidationError(
+            detail=f"Incomplete data for {agent_name}",
+            field_errors=[f"{_error_path(error['loc'])}: {error['msg']}" for error in e.errors()],
+        )
+
+    missing = RESPONSE_CHECKS.get(model, lambda _: [])(result)
+    if missing:
+        raise ResponseValidationError(
+            detail=f"Incomplete data for {agent_name}",
+            field_errors=[f"{path}: must not be empty" for path in missing],
+        )
+
+    return result
+
+
+def validate_recommendation_text(data: dict) -> bool:
+    """Validate a recommendation / value explanation text response."""
+    return all(data.get(field) for field in REQUIRED_RECOMMENDATION_TEXT_FIELDS)
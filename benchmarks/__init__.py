@@ -0,0 +1,21 @@
+# benchmarks/__init__.py
+
+import os
+
+# Settings used by the offline benchmarks. They are applied on import, before `app` reads its
+# settings; variables already set in the environment win, so e.g. caches can be turned back on.
+# Caches and call coalescing are off because every benchmark request is identical.
+BENCHMARK_ENVIRONMENT = {
+    "GEMINI_API_KEY": "benchmark",
+    "SERPAPI_API_KEY": "benchmark",
+    "WARMUP_ON_STARTUP": "false",
+    "JOBS_ENABLED": "false",
+    "TRIP_CACHE_BACKEND": "none",
+    "ITINERARY_CACHE_ENABLED": "false",
+    "SERPAPI_CACHE_ENABLED": "false",
+    "SINGLE_FLIGHT_ENABLED": "false",
+    "LOG_LEVEL": "ERROR",
+}
+
+for _name, _value in BENCHMARK_ENVIRONMENT.items():
+    os.environ.setdefault(_name, _value)
@@ -0,0 +1,105 @@
+# benchmarks/compare.py
+"""
+Compare two benchmark result files (e.g. from two commits).
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10 --fail-on-regression
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Metric -> whether a higher value is better
+E2E_METRICS = {
+    "throughput_rps": True,
+    "latency_ms.p50": False,
+    "latency_ms.p95": False,
+    "latency_ms.p99": False,
+    "cpu_ms_per_request": False,
+    "peak_traced_memory_bytes": False,
+    "errors": False,
+}
+MICRO_METRICS = {"median_us": False}
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _metric(entry: dict, path: str) -> Optional[float]:
+    value = entry
+    for key in path.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value if isinstance(value, (int, float)) else None
+
+
+def _change(before: float, after: float) -> Optional[float]:
+    if before == 0:
+        return None if after == 0 else float("inf")
+    return (after - before) / abs(before) * 100
+
+
+def compare(
+    baseline: dict, candidate: dict, threshold: float
+) -> Tuple[List[Tuple[str, str, float, float, Optional[float], bool]], int]:
+    """
+    Match entries of both result files and compute the relative change of each metric.
+
+    Args:
+        baseline (dict): Baseline results.
+        candidate (dict): Candidate results.
+        threshold (float): Relative change (%) in the wrong direction reported as a regression.
+
+    Returns:
+        Tuple: Rows of (entry, metric, before, after, change %, regression) and the regression count.
+    """
+    rows = []
+    sections = (
+        ("e2e", lambda entry: f"{entry['target']}@c{entry['concurrency']}", E2E_METRICS),
+        ("micro", lambda entry: entry["name"], MICRO_METRICS),
+    )
+
+    for section, key_of, metrics in sections:
+        before_entries: Dict[str, dict] = {key_of(entry): entry for entry in baseline.get(section, [])}
+        for entry in candidate.get(section, []):
+            key = key_of(entry)
+            if key not in before_entries:
+                continue
+            for metric, higher_is_better in metrics.items():
+                before, after = _metric(before_entries[key], metric), _metric(entry, metric)
+                if before is None or after is None:
+                    continue
+                change = _change(before, after)
+                worse = change is not None and (-change if higher_is_better else change) > threshold
+                rows.append((f"{section}:{key}", metric, before, after, change, worse))
+
+    return rows, sum(1 for row in rows if row[5])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two Trekly benchmark result files.")
+    parser.add_argument("baseline", help="Baseline results (JSON).")
+    parser.add_argument("candidate", help="Candidate results (JSON).")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions.")
+    args = parser.parse_args(argv)
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    print(
+        f"baseline  {baseline['meta'].get('git_commit')}  ({baseline['meta'].get('timestamp')})\n"
+        f"candidate {candidate['meta'].get('git_commit')}  ({candidate['meta'].get('timestamp')})\n"
+    )
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    for entry, metric, before, after, change, worse in rows:
+        change_text = "n/a" if change is None else f"{change:+.1f}%"
+        print(f"{entry:<40} {metric:<26} {before:>14.3f} -> {after:<14.3f} {change_text:>9}{'  REGRESSION' if worse else ''}")
+
+    print(f"\n{regressions} regression(s) beyond {args.threshold}%")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
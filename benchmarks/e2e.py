@@ -0,0 +1,158 @@
+# benchmarks/e2e.py
+
+import asyncio
+import math
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+import httpx
+from app.models.schemas import FlightSearchRequest, HotelSearchRequest, ItineraryPlanRequest, TripPlanRequest
+from app.services.flight_search_service import get_flight_options
+from app.services.hotel_search_service import get_hotel_options
+from app.services.itinerary_generation_service import generate_itinerary
+from benchmarks.stubs import load_fixture
+from main import app
+
+Target = Callable[[], Awaitable[bool]]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(max(math.ceil(fraction * len(sorted_values)) - 1, 0), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def build_targets(client: httpx.AsyncClient) -> Dict[str, Target]:
+    """
+    Benchmark targets: the `/v1/plan-trip` endpoint and the three services it runs.
+
+    Each target performs one call and returns whether it succeeded.
+    """
+    trip = load_fixture("trip_request.json")
+
+    async def plan_trip() -> bool:
+        response = await client.post("/v1/plan-trip", json=trip)
+        return response.status_code == 200
+
+    async def flight() -> bool:
+        await get_flight_options(FlightSearchRequest(**trip["flights"]))
+        return True
+
+    async def hotel() -> bool:
+        await get_hotel_options(HotelSearchRequest(**trip["hotels"]))
+        return True
+
+    async def itinerary() -> bool:
+        await generate_itinerary(ItineraryPlanRequest(**trip["itineraries"]))
+        return True
+
+    # Validate the fixture once, so a broken fixture fails fast instead of per request
+    TripPlanRequest(**trip)
+
+    return {"plan_trip": plan_trip, "flight": flight, "hotel": hotel, "itinerary": itinerary}
+
+
+async def _timed(target: Target, semaphore: asyncio.Semaphore, latencies: List[float]) -> bool:
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            succeeded = await target()
+        except Exception:
+            succeeded = False
+        latencies.append(time.perf_counter() - started)
+        return succeeded
+
+
+async def run_load(target: Target, requests: int, concurrency: int, track_memory: bool = True) -> dict:
+    """
+    Run `requests` calls of a target with at most `concurrency` in flight.
+
+    Args:
+        target (Target): The call to benchmark.
+        requests (int): Number of measured calls.
+        concurrency (int): Maximum concurrent calls.
+        track_memory (bool): Measure the peak traced memory (tracemalloc slows the run down).
+
+    Returns:
+        dict: Throughput, latency percentiles (ms), errors, CPU time and peak memory.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    # Warm-up round (agent creation, imports, pools) excluded from the measurement
+    await asyncio.gather(*(_timed(target, semaphore, []) for _ in range(concurrency)))
+
+    if track_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(_timed(target, semaphore, latencies) for _ in range(requests)))
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    peak_memory = None
+    if track_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": outcomes.count(False),
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(requests / wall, 3) if wall else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "cpu_seconds": round(cpu, 4),
+        "cpu_utilization": round(cpu / wall, 4) if wall else None,
+        "cpu_ms_per_request": round(cpu / requests * 1000, 3) if requests else None,
+        "peak_traced_memory_bytes": peak_memory,
+    }
+
+
+async def run_e2e(
+    targets: List[str], concurrency_levels: List[int], requests: int, track_memory: bool = True
+) -> List[dict]:
+    """
+    Benchmark each target at each concurrency level, in-process through the ASGI app.
+
+    Args:
+        targets (List[str]): Target names (see `build_targets`).
+        concurrency_levels (List[int]): Concurrency levels to run.
+        requests (int): Measured calls per target and level.
+        track_memory (bool): Measure the peak traced memory.
+
+    Returns:
+        List[dict]: One result per target and concurrency level.
+    """
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        available = build_targets(client)
+        unknown = sorted(set(targets) - set(available))
+        if unknown:
+            raise ValueError(f"Unknown benchmark targets: {', '.join(unknown)}")
+
+        for name in targets:
+            for concurrency in concurrency_levels:
+                result = await run_load(available[name], requests, concurrency, track_memory)
+                results.append({"target": name, **result})
+                print(
+                    f"[e2e] {name:<10} c={concurrency:<4} {result['throughput_rps']:>9} req/s  "
+                    f"p50={result['latency_ms']['p50']}ms p95={result['latency_ms']['p95']}ms "
+                    f"p99={result['latency_ms']['p99']}ms errors={result['errors']}",
+                    file=sys.stderr,
+                )
+
+    return results
@@ -0,0 +1,90 @@
+# benchmarks/micro.py
+
+import json
+import statistics
+import sys
+import timeit
+from typing import Callable, List, Tuple
+from app.models.schemas import FlightRecommendation, HotelRecommendation, ItineraryRecommendation
+from app.utils.parser import extract_json, parse_and_validate_response
+from app.utils.validator import (
+    check_itinerary_recommendation,
+    validate_recommendation_text,
+    validate_response_model,
+)
+from benchmarks.stubs import load_fixture
+
+AGENT_NAME = "Benchmark Agent"
+
+
+def _itinerary(num_days: int = 7) -> dict:
+    itinerary = load_fixture("llm_itinerary.json")
+    day_plan = load_fixture("llm_day_plan.json")
+    itinerary["itinerary_details"]["daily_plan"] = [
+        {**day_plan, "day": f"Day {number}"} for number in range(1, num_days + 1)
+    ]
+    return itinerary
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Microbenchmark cases for the response parser and the validators."""
+    flight = load_fixture("llm_flight.json")
+    hotel = load_fixture("llm_hotel.json")
+    text = load_fixture("llm_recommendation_text.json")
+    itinerary = _itinerary()
+
+    flight_json = json.dumps(flight)
+    itinerary_json = json.dumps(itinerary)
+    flight_fenced = f"Here is the best option:\n```json\n{json.dumps(flight, indent=2)}\n```\nEnjoy your trip!"
+    # Comment and trailing commas, as produced by models imitating the prompt examples
+    flight_repairable = flight_json.replace('"recommendation"', '// best option\n"recommendation"', 1)
+    flight_repairable = flight_repairable.replace("}", ",}")
+    itinerary_truncated = itinerary_json[: len(itinerary_json) * 3 // 4]
+    itinerary_model = validate_response_model(itinerary, ItineraryRecommendation, AGENT_NAME)
+
+    return [
+        ("parse.flight.bare_json", lambda: parse_and_validate_response(flight_json, None, AGENT_NAME, FlightRecommendation)),
+        ("parse.flight.fenced", lambda: parse_and_validate_response(flight_fenced, None, AGENT_NAME, FlightRecommendation)),
+        ("parse.flight.repaired", lambda: parse_and_validate_response(flight_repairable, None, AGENT_NAME, FlightRecommendation)),
+        ("parse.itinerary.bare_json", lambda: parse_and_validate_response(itinerary_json, None, AGENT_NAME, ItineraryRecommendation)),
+        ("parse.text.validator_fn", lambda: parse_and_validate_response(json.dumps(text), validate_recommendation_text, AGENT_NAME)),
+        ("extract_json.itinerary.truncated", lambda: extract_json(itinerary_truncated)),
+        ("validate.flight.dict", lambda: validate_response_model(flight, FlightRecommendation, AGENT_NAME)),
+        ("validate.hotel.dict", lambda: validate_response_model(hotel, HotelRecommendation, AGENT_NAME)),
+        ("validate.itinerary.dict", lambda: validate_response_model(itinerary, ItineraryRecommendation, AGENT_NAME)),
+        ("validate.itinerary.json", lambda: validate_response_model(itinerary_json, ItineraryRecommendation, AGENT_NAME)),
+        ("check.itinerary", lambda: check_itinerary_recommendation(itinerary_model)),
+    ]
+
+
+def run_micro(repeat: int = 5, min_time: float = 0.2) -> List[dict]:
+    """
+    Time each case with `timeit`, auto-scaling the loop count to at least `min_time` seconds.
+
+    Args:
+        repeat (int): Number of timed repetitions per case.
+        min_time (float): Minimum duration of one repetition in seconds.
+
+    Returns:
+        List[dict]: Per case: loops, best and median time per call (µs) and calls per second.
+    """
+    results = []
+    for name, case in build_cases():
+        timer = timeit.Timer(case)
+        loops, elapsed = timer.autorange()
+        if elapsed < min_time:
+            loops = max(int(loops * min_time / max(elapsed, 1e-9)), 1)
+
+        per_call = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+        best, median = min(per_call), statistics.median(per_call)
+        results.append({
+            "name": name,
+            "loops": loops,
+            "repeat": repeat,
+            "best_us": round(best * 1e6, 3),
+            "median_us": round(median * 1e6, 3),
+            "ops_per_sec": round(1 / median, 1),
+        })
+        print(f"[micro] {name:<34} {median * 1e6:>10.2f} µs/call", file=sys.stderr)
+
+    return results
@@ -0,0 +1,148 @@
+# benchmarks/run.py
+"""
+Offline benchmark suite: stub Gemini agents and a stub SerpAPI transport serving recorded
+fixtures, so no network access or API keys are needed.
+
+    python -m benchmarks.run --concurrency 1,8,32 --requests 100 --output bench.json
+    python -m benchmarks.compare baseline.json bench.json
+
+Settings can be overridden through the environment as usual (e.g. FLIGHT_SERVICE_MODE=fast).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import List, Optional
+from benchmarks import BENCHMARK_ENVIRONMENT
+from benchmarks.stubs import StubConfig, install_stubs
+from app.core.config import settings
+
+SCHEMA_VERSION = 1
+
+# Settings recorded with the results, since they change what is being measured
+RECORDED_SETTINGS = (
+    "AGENT_RUN_MODE",
+    "AGENT_STRUCTURED_OUTPUT",
+    "FLIGHT_SERVICE_MODE",
+    "HOTEL_SERVICE_MODE",
+    "ITINERARY_GENERATION_MODE",
+    "PLANNER_FAILURE_POLICY",
+    "SERPAPI_PROJECTION_ENABLED",
+    "RETRY_MAX_ATTEMPTS",
+    "RETRY_BASE_DELAY",
+    "METRICS_ENABLED",
+    "TRACING_ENABLED",
+    "LOG_QUEUE_ENABLED",
+)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _str_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline Trekly benchmark suite.")
+    parser.add_argument("--targets", type=_str_list, default=["plan_trip", "flight", "hotel", "itinerary"],
+                        help="Comma-separated end-to-end targets.")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32], help="Comma-separated concurrency levels.")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per target and concurrency level.")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Stub model latency in seconds.")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative spread of the model latency.")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of model calls failing with a 503.")
+    parser.add_argument("--llm-malformed-rate", type=float, default=0.0, help="Share of truncated model answers.")
+    parser.add_argument("--llm-format", choices=["json", "fenced"], default="json", help="Shape of the model answers.")
+    parser.add_argument("--serpapi-latency", type=float, default=0.02, help="Stub SerpAPI latency in seconds.")
+    parser.add_argument("--serpapi-jitter", type=float, default=0.2, help="Relative spread of the SerpAPI latency.")
+    parser.add_argument("--serpapi-error-rate", type=float, default=0.0, help="Share of SerpAPI calls failing.")
+    parser.add_argument("--payload-scale", type=int, default=1, help="Replicate SerpAPI result lists N times.")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for latencies and injected failures.")
+    parser.add_argument("--micro-repeat", type=int, default=5, help="Timed repetitions per microbenchmark.")
+    parser.add_argument("--skip-e2e", action="store_true", help="Only run the microbenchmarks.")
+    parser.add_argument("--skip-micro", action="store_true", help="Only run the end-to-end benchmarks.")
+    parser.add_argument("--no-memory", action="store_true", help="Do not trace memory (tracemalloc adds overhead).")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    args = build_parser().parse_args(argv)
+
+    config = StubConfig(
+        llm_latency=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        llm_error_rate=args.llm_error_rate,
+        llm_malformed_rate=args.llm_malformed_rate,
+        llm_format=args.llm_format,
+        serpapi_latency=args.serpapi_latency,
+        serpapi_jitter=args.serpapi_jitter,
+        serpapi_error_rate=args.serpapi_error_rate,
+        payload_scale=args.payload_scale,
+        seed=args.seed,
+    )
+    transport = install_stubs(config)
+
+    results = {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": _git("rev-parse", "HEAD"),
+            "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "stubs": config.as_dict(),
+            "serpapi_payload_bytes": {
+                engine: transport.payload_size(engine) for engine in ("google_flights", "google_hotels", "google")
+            },
+            "settings": {name: getattr(settings, name) for name in RECORDED_SETTINGS},
+            "environment": {
+                name: os.environ.get(name) for name in BENCHMARK_ENVIRONMENT if not name.endswith("_API_KEY")
+            },
+        },
+        "e2e": [],
+        "micro": [],
+    }
+
+    if not args.skip_e2e:
+        from benchmarks.e2e import run_e2e
+
+        results["e2e"] = asyncio.run(
+            run_e2e(args.targets, args.concurrency, args.requests, track_memory=not args.no_memory)
+        )
+
+    if not args.skip_micro:
+        from benchmarks.micro import run_micro
+
+        results["micro"] = run_micro(repeat=args.micro_repeat)
+
+    output = json.dumps(results, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# benchmarks/stubs.py
+
+import asyncio
+import copy
+import json
+import random
+import re
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from app.agents import agents  # noqa: F401  (registers the agent pools)
+from app.agents.pool import agent_pools
+from app.core.exceptions import SerpApiServiceError
+from app.utils.helpers import load_serpapi_tools
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# SerpAPI engine -> recorded response, and the list that `payload_scale` replicates
+SERPAPI_FIXTURES = {
+    "google_flights": ("serpapi_google_flights.json", "other_flights"),
+    "google_hotels": ("serpapi_google_hotels.json", "properties"),
+    "google": ("serpapi_google.json", "organic_results"),
+}
+
+# Agent pool -> recorded LLM response
+LLM_FIXTURES = {
+    "flight": "llm_flight.json",
+    "flight_ranking": "llm_flight.json",
+    "flight_summary": "llm_recommendation_text.json",
+    "hotel": "llm_hotel.json",
+    "hotel_ranking": "llm_hotel.json",
+    "hotel_summary": "llm_recommendation_text.json",
+    "itinerary": "llm_itinerary.json",
+    "itinerary_brief": "llm_itinerary_brief.json",
+    "itinerary_chunk": "llm_day_plan.json",
+}
+
+# Tool calls made by the agents that have tools, mirroring what the real agents request
+TOOL_CALLS = {
+    "flight": [("search_flights", {"departure_id": "LOS", "arrival_id": "CDG", "outbound_date": "2026-07-01", "return_date": "2026-07-08"})],
+    "hotel": [
+        ("search_google", {"query": "CDG airport city"}),
+        ("search_hotels", {"arrival_id": "Paris", "check_in_date": "2026-07-01", "check_out_date": "2026-07-08"}),
+    ],
+    "itinerary": [("search_google", {"query": "CDG airport city"})],
+    "itinerary_brief": [("search_google", {"query": "CDG airport city"})],
+}
+
+CHUNK_DAYS_PATTERN = re.compile(r"Plan only the following days, in order: ([^\n]*)")
+DAY_NUMBER_PATTERN = re.compile(r"Day (\d+)")
+CHECK_IN_PATTERN = re.compile(r"Check-in Date: `([^`]*)`")
+CHECK_OUT_PATTERN = re.compile(r"Check-out Date: `([^`]*)`")
+
+
+def load_fixture(name: str) -> Any:
+    """Load a recorded fixture from `benchmarks/fixtures`."""
+    with open(FIXTURES_DIR / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubConfig:
+    """
+    Behaviour of the stand-ins.
+
+    Latencies are in seconds; `*_jitter` is the relative spread of a latency (0.2 = ±20%).
+    `payload_scale` replicates the option lists of the SerpAPI fixtures to grow the payloads.
+    """
+
+    def __init__(
+        self,
+        llm_latency: float = 0.05,
+        llm_jitter: float = 0.2,
+        llm_error_rate: float = 0.0,
+        llm_malformed_rate: float = 0.0,
+        llm_format: str = "json",
+        serpapi_latency: float = 0.02,
+        serpapi_jitter: float = 0.2,
+        serpapi_error_rate: float = 0.0,
+        payload_scale: int = 1,
+        seed: int = 1234,
+    ):
+        if llm_format not in ("json", "fenced"):
+            raise ValueError(f"Unknown LLM response format: {llm_format}")
+
+        self.llm_latency = llm_latency
+        self.llm_jitter = llm_jitter
+        self.llm_error_rate = llm_error_rate
+        self.llm_malformed_rate = llm_malformed_rate
+        self.llm_format = llm_format
+        self.serpapi_latency = serpapi_latency
+        self.serpapi_jitter = serpapi_jitter
+        self.serpapi_error_rate = serpapi_error_rate
+        self.payload_scale = max(payload_scale, 1)
+        self.seed = seed
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class _Randomness:
+    """Seeded, thread-safe source for latencies and injected failures."""
+
+    def __init__(self, seed: int):
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def latency(self, base: float, jitter: float) -> float:
+        with self._lock:
+            return max(base * (1 + self._random.uniform(-jitter, jitter)), 0.0)
+
+    def chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+
+
+class InjectedModelError(Exception):
+    """Injected model failure, classified as a retryable upstream error."""
+
+    status_code = 503
+
+
+class StubSerpApiTransport:
+    """
+    Stand-in for `SerpApiHttpTransport` serving the recorded SerpAPI responses.
+
+    Responses are kept serialized and decoded on every call, like a real HTTP response body.
+    """
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self._random = _Randomness(config.seed)
+        self._payloads: Dict[str, str] = {}
+
+        for engine, (name, list_key) in SERPAPI_FIXTURES.items():
+            data = load_fixture(name)
+            items = data.get(list_key) or []
+            data[list_key] = [copy.deepcopy(item) for _ in range(config.payload_scale) for item in items]
+            self._payloads[engine] = json.dumps(data)
+
+    def payload_size(self, engine: str) -> int:
+        return len(self._payloads[engine])
+
+    def _respond(self, params: dict) -> Tuple[dict, int]:
+        if self._random.chance(self.config.serpapi_error_rate):
+            raise SerpApiServiceError(detail="SerpApi service returned HTTP 503 (injected)")
+
+        payload = self._payloads.get(params.get("engine"), self._payloads["google"])
+        return json.loads(payload), len(payload)
+
+    def fetch(self, params: dict) -> Tuple[dict, int]:
+        time.sleep(self._random.latency(self.config.serpapi_latency, self.config.serpapi_jitter))
+        return self._respond(params)
+
+    async def afetch(self, params: dict) -> Tuple[dict, int]:
+        await asyncio.sleep(self._random.latency(self.config.serpapi_latency, self.config.serpapi_jitter))
+        return self._respond(params)
+
+    def get(self, params: dict) -> dict:
+        return self.fetch(params)[0]
+
+    async def aget(self, params: dict) -> dict:
+        return (await self.afetch(params))[0]
+
+    async def awarm(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+class StubRunResponse:
+    """The parts of an agno run response read by `run_agent_with_retries`."""
+
+    def __init__(self, content: str, tools: List[dict], metrics: dict):
+        self.content = content
+        self.tools = tools
+        self.metrics = metrics
+
+
+class StubAgent:
+    """
+    Deterministic stand-in for a Gemini-backed agno agent of one pool.
+
+    It waits for the configured model latency, calls the same SerpAPI tools as the real agent
+    and answers with the recorded response for its role. Like agno, `arun` runs the (sync)
+    tool calls in a worker thread with `asyncio.to_thread`; `run` calls them inline.
+    """
+
+    def __init__(self, role: str, config: StubConfig, randomness: _Randomness):
+        self.role = role
+        self.config = config
+        self._random = randomness
+        self._response = load_fixture(LLM_FIXTURES[role])
+        self._day_plan = load_fixture(LLM_FIXTURES["itinerary_chunk"])
+
+    def _days(self, numbers: List[int]) -> List[dict]:
+        days = []
+        for number in numbers:
+            day = copy.deepcopy(self._day_plan)
+            day["day"] = f"Day {number}"
+            for activity in day["activities"]:
+                activity["activity"] = f"{activity['activity']} (day {number})"
+            days.append(day)
+        return days
+
+    def _answer(self, prompt: str) -> dict:
+        if self.role == "itinerary_chunk":
+            match = CHUNK_DAYS_PATTERN.search(prompt)
+            numbers = [int(n) for n in DAY_NUMBER_PATTERN.findall(match.group(1))] if match else [1]
+            return {"daily_plan": self._days(numbers)}
+
+        if self.role == "itinerary":
+            answer = copy.deepcopy(self._response)
+            details = answer["itinerary_details"]
+            check_in, check_out = CHECK_IN_PATTERN.search(prompt), CHECK_OUT_PATTERN.search(prompt)
+            if check_in and check_out:
+                details["check_in_date"], details["check_out_date"] = check_in.group(1), check_out.group(1)
+                details["num_days"] = max(
+                    (date.fromisoformat(check_out.group(1)) - date.fromisoformat(check_in.group(1))).days, 1
+                )
+            details["daily_plan"] = self._days(range(1, details["num_days"] + 1))
+            return answer
+
+        return self._response
+
+    def _call_tools(self) -> List[dict]:
+        tools = load_serpapi_tools()
+        calls = []
+        for name, arguments in TOOL_CALLS.get(self.role, []):
+            getattr(tools, name)(**arguments)
+            calls.append({"tool_name": name, "tool_args": arguments})
+        return calls
+
+    def _content(self, prompt: str) -> str:
+        content = json.dumps(self._answer(prompt), ensure_ascii=False)
+        if self._random.chance(self.config.llm_malformed_rate):
+            # Truncated mid-answer, as when the model hits its output token limit
+            content = content[: max(len(content) * 2 // 3, 1)]
+        if self.config.llm_format == "fenced":
+            content = f"Here is the recommendation:\n```json\n{content}\n```"
+        return content
+
+    def _check_error(self) -> None:
+        if self._random.chance(self.config.llm_error_rate):
+            raise InjectedModelError("503 UNAVAILABLE: the model is overloaded (injected)")
+
+    def _response_for(self, prompt: str, latency: float, tools: List[dict]) -> StubRunResponse:
+        content = self._content(prompt)
+        metrics = {"input_tokens": [len(prompt) // 4], "output_tokens": [len(content) // 4], "time": [latency]}
+        return StubRunResponse(content=content, tools=tools, metrics=metrics)
+
+    def run(self, message: str) -> StubRunResponse:
+        latency = self._random.latency(self.config.llm_latency, self.config.llm_jitter)
+        time.sleep(latency)
+        self._check_error()
+        return self._response_for(message, latency, self._call_tools())
+
+    async def arun(self, message: str) -> StubRunResponse:
+        latency = self._random.latency(self.config.llm_latency, self.config.llm_jitter)
+        await asyncio.sleep(latency)
+        self._check_error()
+        return self._response_for(message, latency, await asyncio.to_thread(self._call_tools))
+
+
+def install_stubs(config: Optional[StubConfig] = None) -> StubSerpApiTransport:
+    """
+    Replace the Gemini agents of every pool and the SerpAPI transport with stand-ins.
+
+    Must run before the first agent is checked out of a pool.
+
+    Args:
+        config (Optional[StubConfig]): Stand-in behaviour (defaults to `StubConfig()`).
+
+    Returns:
+        StubSerpApiTransport: The installed transport.
+    """
+    config = config or StubConfig()
+    randomness = _Randomness(config.seed)
+
+    transport = StubSerpApiTransport(config)
+    load_serpapi_tools().transport = transport
+
+    for pool in agent_pools:
+        pool.factory = lambda role=pool.name: StubAgent(role, config, randomness)
+
+    return transport
@@ -1,12 +1,79 @@
 # main.py
 
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api.v1.routers import router as api_router
+from app.core.config import settings
+from app.core.startup import startup_report
+from app.services.job_service import get_job_pool
+from app.services.warmup_service import shut_down, warm_up
+from app.utils.metrics import metrics
+from app.utils.tracing import TraceMiddleware
+
+startup_report.record_import(_import_started)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up and start background services on startup and stop them on shutdown."""
+    if settings.WARMUP_ON_STARTUP:
+        await warm_up()
+    else:
+        startup_report.mark_ready(time.perf_counter())
+
+    job_pool = get_job_pool()
+    if job_pool is not None:
+        await job_pool.start()
+
+    yield
+
+    if job_pool is not None:
+        await job_pool.stop()
+
+    await shut_down()
+
 
 app = FastAPI(
     title="Trekly Travel Planner API",
     description="API for generating travel itineraries using multi-agent workflows.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+app.add_middleware(TraceMiddleware)
 app.include_router(api_router)
+
+
+# Readiness Probe
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: passes only once the warm-up has completed successfully.
+
+    Returns:
+        JSONResponse: The startup report, with status 200 when ready and 503 otherwise.
+    """
+    return JSONResponse(
+        content=startup_report.as_dict(),
+        status_code=200 if startup_report.ready else 503,
+    )
+
+
+# Prometheus Metrics
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Stage, agent attempt, token usage and SerpAPI metrics in the Prometheus text format.
+
+    Returns:
+        PlainTextResponse: The exposition, or 404 when `METRICS_ENABLED` is False.
+    """
+    if not metrics.enabled:
+        return PlainTextResponse("Metrics are disabled.\n", status_code=404)
+
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
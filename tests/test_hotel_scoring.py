@@ -0,0 +1,36 @@
+# tests/test_hotel_scoring.py
+
+from app.utils.hotel_scoring import AMENITY_BITS, amenity_mask, has_required_hotel_fields
+
+
+def test_amenity_mask_matches_whole_words():
+    mask = amenity_mask(["Free Wi-Fi", "Bar", "Spa", "Outdoor pools", "Breakfast ($)"])
+
+    for name in ("wifi", "bar", "spa", "pool", "breakfast"):
+        assert mask & AMENITY_BITS[name]
+
+
+def test_amenity_mask_ignores_substrings():
+    mask = amenity_mask(["Barrier-free", "Barbecue grills", "Spacious rooms", "Outdoor space"])
+
+    assert not mask & AMENITY_BITS["bar"]
+    assert not mask & AMENITY_BITS["spa"]
+
+
+def test_amenity_mask_is_case_insensitive():
+    assert amenity_mask(["AIR CONDITIONING"]) == AMENITY_BITS["air_conditioning"]
+    assert amenity_mask(None) == 0
+
+
+def test_has_required_hotel_fields_rejects_incomplete_properties():
+    complete = {
+        "name": "Complete",
+        "image_url": "https://example.com/h.jpg",
+        "rating": 4.2,
+        "amenities": ["Free Wi-Fi"],
+        "price_per_night": "$120",
+    }
+
+    assert has_required_hotel_fields(complete)
+    assert not has_required_hotel_fields({**complete, "price_per_night": None})
+    assert not has_required_hotel_fields({**complete, "image_url": None})
@@ -0,0 +1,18 @@
+# tests/test_parser.py
+
+from app.utils.parser import DROPPED_MEMBER, LEADING_TEXT, TRUNCATED, extract_json
+
+
+def test_extract_json_retries_after_braces_in_leading_prose():
+    parsed, repairs = extract_json('text {not json} then {"a": 1}')
+
+    assert parsed == {"a": 1}
+    assert LEADING_TEXT in repairs
+
+
+def test_extract_json_reports_dropped_truncated_member():
+    parsed, repairs = extract_json('{"a": 1, "b": "x", "c": nul')
+
+    assert parsed == {"a": 1, "b": "x"}
+    assert TRUNCATED in repairs
+    assert f'{DROPPED_MEMBER}="c": nul' in repairs
@@ -0,0 +1,40 @@
+# tests/test_trip_cache.py
+
+import json
+from pathlib import Path
+from app.models.schemas import TripPlanRequest
+from app.utils.trip_cache import InMemoryTripCache, trip_cache_key
+
+TRIP_REQUEST = json.loads(
+    (Path(__file__).parents[1] / "benchmarks" / "fixtures" / "trip_request.json").read_text(encoding="utf-8")
+)
+
+
+def _request(**itineraries) -> TripPlanRequest:
+    payload = json.loads(json.dumps(TRIP_REQUEST))
+    payload["itineraries"].update(itineraries)
+    return TripPlanRequest(**payload)
+
+
+def test_trip_cache_key_ignores_bypass_cache():
+    assert trip_cache_key(_request(bypass_cache=True)) == trip_cache_key(_request())
+
+
+def test_trip_cache_key_changes_with_the_trip():
+    assert trip_cache_key(_request(destination="LHR")) != trip_cache_key(_request())
+
+
+def test_bypass_write_is_hit_by_a_normal_request():
+    cache = InMemoryTripCache(max_entries=8, ttl=60)
+    cache.set(trip_cache_key(_request(bypass_cache=True)), '{"fresh": true}')
+
+    cached = cache.get(trip_cache_key(_request()))
+
+    assert cached is not None
+    assert cached[0] == '{"fresh": true}'
+
+
+def test_trip_cache_key_ignores_top_level_bypass_cache():
+    request = _request()
+
+    assert trip_cache_key(request.model_copy(update={"bypass_cache": True})) == trip_cache_key(request)